@@ -0,0 +1,91 @@
+"""
+Benchmark of the quasi-random sequence generators.
+
+Compares the vectorized radical-inverse engine behind ``generators.halton``
+with the original double loop over points and dimensions, and the
+throughput of ``generators.sobol`` against ``generators.halton``.
+
+Usage:
+    python benchmarks/bench_generators.py [--max-n 10000000] [--dim 8] [--max-loop-n 100000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from qmc_options import generators
+
+
+FIRST_PRIMES = [
+    2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53,
+    59, 61, 67, 71, 73, 79, 83, 89, 97, 101, 103, 107, 109, 113, 127, 131,
+    137, 139, 149, 151, 157, 163, 167, 173, 179, 181, 191, 193, 197, 199, 211, 223,
+    227, 229, 233, 239, 241, 251, 257, 263, 269, 271, 277, 281, 283, 293, 307, 311,
+]
+
+
+def halton_loop(primes: list, N: int) -> np.ndarray:
+    """Reference Halton implementation with one scalar call per cell."""
+    sequence = np.zeros((N, len(primes)))
+
+    for i in range(N):
+        for j, p in enumerate(primes):
+            result, f, k = 0.0, 1.0 / p, i + 1
+            while k > 0:
+                result += f * (k % p)
+                k //= p
+                f /= p
+            sequence[i, j] = result
+
+    return sequence
+
+
+def timed(func, *args) -> float:
+    """Return the wall-clock time of a single call."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-n", type=int, default=10 ** 7)
+    parser.add_argument("--dim", type=int, default=8)
+    parser.add_argument("--max-loop-n", type=int, default=10 ** 5,
+                        help="largest N timed with the scalar loop")
+    args = parser.parse_args()
+
+    primes = FIRST_PRIMES[:args.dim]
+    print(f"Halton sequence, dim = {args.dim}")
+    print(f"{'N':>10} {'loop [s]':>12} {'vectorized [s]':>16} {'speed-up':>10}")
+
+    N = 1000
+    while N <= args.max_n:
+        t_vec = timed(generators.halton, primes, N)
+
+        if N <= args.max_loop_n:
+            t_loop = timed(halton_loop, primes, N)
+            print(f"{N:>10} {t_loop:>12.4f} {t_vec:>16.4f} {t_loop / t_vec:>10.1f}")
+        else:
+            print(f"{N:>10} {'-':>12} {t_vec:>16.4f} {'-':>10}")
+
+        N *= 10
+
+    print()
+    print(f"Throughput in million points per second, dim = {args.dim}")
+    print(f"{'N':>10} {'halton':>12} {'sobol':>12}")
+
+    # Load the direction numbers outside of the timings
+    generators.sobol(args.dim, 1)
+
+    N = 1000
+    while N <= args.max_n:
+        t_halton = timed(generators.halton, primes, N)
+        t_sobol = timed(generators.sobol, args.dim, N)
+        print(f"{N:>10} {N / t_halton / 1e6:>12.2f} {N / t_sobol / 1e6:>12.2f}")
+        N *= 10
+
+
+if __name__ == "__main__":
+    main()
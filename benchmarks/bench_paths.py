@@ -0,0 +1,73 @@
+"""
+Benchmark of the Brownian path constructions.
+
+Compares the forward (standard), Brownian-bridge and PCA constructions
+on an arithmetic Asian call: the randomized-QMC standard error at a fixed
+number of points, and the time to build the paths.
+
+Usage:
+    python benchmarks/bench_paths.py [--m 64] [--n 4096] [--replicates 16]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from qmc_options import generators, pricing, rqmc, simulation
+
+
+CONSTRUCTIONS = ["standard", "bridge", "pca", "pca_fft"]
+
+PARAMS = {'S0': 100.0, 'K': 100.0, 'r': 0.05, 'delta': 0.02, 'sigma': 0.25, 'T': 1.0}
+
+
+def timed(func, *args, **kwargs) -> float:
+    """Return the wall-clock time of a single call."""
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--m", type=int, default=64, help="monitoring dates")
+    parser.add_argument("--n", type=int, default=4096, help="Sobol' points")
+    parser.add_argument("--replicates", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    points = generators.sobol(args.m, args.n, start=0)
+
+    print(f"Asian call, m = {args.m}, N = {args.n}, "
+          f"{args.replicates} nested-scrambled replicates")
+    print(f"{'construction':>14} {'price':>10} {'std error':>12} {'variance ratio':>16}")
+
+    base_variance = None
+    for construction in CONSTRUCTIONS:
+        result = rqmc.rqmc_price(pricing.asian_call, points, args.replicates,
+                                 method="nested", rng=np.random.default_rng(args.seed),
+                                 m=args.m, construction=construction, **PARAMS)
+        variance = result['std_error'] ** 2
+        if base_variance is None:
+            base_variance = variance
+        print(f"{construction:>14} {result['price']:>10.5f} {result['std_error']:>12.2e} "
+              f"{base_variance / variance:>16.1f}")
+
+    print()
+    print(f"Path construction time [s], N = {args.n * 10}")
+    print(f"{'m':>6} " + " ".join(f"{c:>10}" for c in CONSTRUCTIONS))
+
+    rng = np.random.default_rng(args.seed)
+    for m in (16, 64, 252, 1024):
+        Z = rng.standard_normal((args.n * 10, m))
+        times = []
+        for construction in CONSTRUCTIONS:
+            # Build the cached schedules and factors outside of the timings
+            simulation.brownian_motion(Z[:1], construction=construction)
+            times.append(timed(simulation.brownian_motion, Z, construction=construction))
+        print(f"{m:>6} " + " ".join(f"{t:>10.4f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
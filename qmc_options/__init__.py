@@ -8,17 +8,33 @@ for pricing exotic stock options including spread, Asian, and lookback options.
 __version__ = "0.1.0"
 
 from . import generators
+from . import lattice
+from . import rqmc
+from . import cache
+from . import discrepancy
+from . import inverse_normal
 from . import simulation
 from . import analytical
+from . import control_variates
+from . import importance_sampling
 from . import pricing
+from . import pipeline
 from . import greeks
 from . import utils
 
 __all__ = [
     "generators",
+    "lattice",
+    "rqmc",
+    "cache",
+    "discrepancy",
+    "inverse_normal",
     "simulation",
     "analytical",
+    "control_variates",
+    "importance_sampling",
     "pricing",
+    "pipeline",
     "greeks",
     "utils",
 ]
@@ -4,6 +4,9 @@ Analytical formulas for option pricing and Greeks.
 This module implements closed-form solutions including:
 - Black-Scholes formula for European options
 - Margrabe formula for spread options
+- Kirk and Bjerksund-Stensland approximations for spread options with a strike
+- Geometric-average Asian call (discrete monitoring)
+- Continuously monitored down-and-out call and floating-strike lookback call
 - Greeks (Delta, Gamma, Vega, Theta, Rho)
 """
 
@@ -155,6 +158,304 @@ def margrabe_formula(S10: float, S20: float, delta1: float, delta2: float,
     return price
 
 
+def kirk_spread(S10, S20, K, r: float, delta1, delta2, sigma1, sigma2, rho12,
+                T: float, w1=1.0, w2=1.0):
+    """
+    Kirk's approximation of the spread option max(w2*S2 - w1*S1 - K, 0).
+
+    The short leg plus the strike, w1*S1 + K, is treated as a lognormal
+    asset with forward F1 + K and volatility b*sigma1, b = F1/(F1 + K), so
+    the price is Margrabe's formula between it and w2*S2:
+
+        sigma_K^2 = sigma2^2 - 2*rho12*sigma1*sigma2*b + sigma1^2*b^2
+        price = e^(-rT) * (F2 N(d1) - (F1 + K) N(d1 - sigma_K sqrt(T)))
+
+    with the forwards F1 = w1*S10*e^((r - delta1)T), F2 = w2*S20*e^((r - delta2)T)
+    and d1 = (log(F2/(F1 + K)) + sigma_K^2 T/2) / (sigma_K sqrt(T)). It is
+    exact for K = 0 and unit weights (Margrabe). When F1 + K <= 0 the proxy
+    is undefined and the discounted forward spread F2 - F1 - K is returned
+    instead: the intrinsic lower bound of the price, since w1*S1 + K can
+    still end positive and leave the option unexercised.
+
+    All arguments broadcast, so arrays of contracts are priced at once.
+
+    Parameters
+    ----------
+    S10 : float or np.ndarray
+        Initial price of first underlying (short leg)
+    S20 : float or np.ndarray
+        Initial price of second underlying (long leg)
+    K : float or np.ndarray
+        Strike price
+    r : float
+        Risk-free interest rate
+    delta1 : float or np.ndarray
+        Dividend yield of first underlying
+    delta2 : float or np.ndarray
+        Dividend yield of second underlying
+    sigma1 : float or np.ndarray
+        Volatility of first underlying
+    sigma2 : float or np.ndarray
+        Volatility of second underlying
+    rho12 : float or np.ndarray
+        Correlation between underlyings
+    T : float
+        Time to maturity
+    w1 : float or np.ndarray, default=1.0
+        Weight of first underlying
+    w2 : float or np.ndarray, default=1.0
+        Weight of second underlying
+
+    Returns
+    -------
+    float or np.ndarray
+        Approximate spread option price
+    """
+    F1, F2, strike, b, fallback = _spread_forwards(S10, S20, K, r, delta1, delta2, T, w1, w2)
+
+    sigma = np.sqrt(sigma2 ** 2 - 2 * rho12 * sigma1 * sigma2 * b + (sigma1 * b) ** 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1_val = (np.log(F2 / strike) + 0.5 * sigma ** 2 * T) / (sigma * np.sqrt(T))
+        price = F2 * stats.norm.cdf(d1_val) - strike * stats.norm.cdf(d1_val - sigma * np.sqrt(T))
+
+    price = np.where(fallback, F2 - F1 - K, price)
+
+    return np.exp(-r * T) * price[()]
+
+
+def bjerksund_stensland_spread(S10, S20, K, r: float, delta1, delta2, sigma1, sigma2,
+                               rho12, T: float, w1=1.0, w2=1.0):
+    """
+    Bjerksund-Stensland (2011) approximation of max(w2*S2 - w1*S1 - K, 0).
+
+    Refines Kirk's formula by giving the short leg and the strike their
+    own exercise probabilities. With the notation of ``kirk_spread``,
+    a = F1 + K and b = F1/a:
+
+        price = e^(-rT) * (F2 N(d1) - F1 N(d2) - K N(d3))
+
+        d1 = (log(F2/a) + (sigma2^2/2 - b rho12 sigma1 sigma2 + b^2 sigma1^2/2) T) / (sigma sqrt(T))
+        d2 = (log(F2/a) + (-sigma2^2/2 + rho12 sigma1 sigma2 + b^2 sigma1^2/2 - b sigma1^2) T)
+             / (sigma sqrt(T))
+        d3 = (log(F2/a) + (-sigma2^2/2 + b^2 sigma1^2/2) T) / (sigma sqrt(T))
+
+    with sigma the Kirk volatility. It is a lower bound of the exact price
+    and usually more accurate than Kirk's for K > 0. Arguments broadcast
+    as in ``kirk_spread``, and F1 + K <= 0 falls back to the same forward
+    lower bound.
+
+    Parameters
+    ----------
+    S10 : float or np.ndarray
+        Initial price of first underlying (short leg)
+    S20 : float or np.ndarray
+        Initial price of second underlying (long leg)
+    K : float or np.ndarray
+        Strike price
+    r : float
+        Risk-free interest rate
+    delta1 : float or np.ndarray
+        Dividend yield of first underlying
+    delta2 : float or np.ndarray
+        Dividend yield of second underlying
+    sigma1 : float or np.ndarray
+        Volatility of first underlying
+    sigma2 : float or np.ndarray
+        Volatility of second underlying
+    rho12 : float or np.ndarray
+        Correlation between underlyings
+    T : float
+        Time to maturity
+    w1 : float or np.ndarray, default=1.0
+        Weight of first underlying
+    w2 : float or np.ndarray, default=1.0
+        Weight of second underlying
+
+    Returns
+    -------
+    float or np.ndarray
+        Approximate spread option price
+    """
+    F1, F2, strike, b, fallback = _spread_forwards(S10, S20, K, r, delta1, delta2, T, w1, w2)
+
+    sigma = np.sqrt(sigma2 ** 2 - 2 * rho12 * sigma1 * sigma2 * b + (sigma1 * b) ** 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.log(F2 / strike)
+        scale = sigma * np.sqrt(T)
+        d1_val = (x + (0.5 * sigma2 ** 2 - b * rho12 * sigma1 * sigma2 +
+                       0.5 * (b * sigma1) ** 2) * T) / scale
+        d2_val = (x + (-0.5 * sigma2 ** 2 + rho12 * sigma1 * sigma2 +
+                       0.5 * (b * sigma1) ** 2 - b * sigma1 ** 2) * T) / scale
+        d3_val = (x + (-0.5 * sigma2 ** 2 + 0.5 * (b * sigma1) ** 2) * T) / scale
+
+        price = (F2 * stats.norm.cdf(d1_val) - F1 * stats.norm.cdf(d2_val) -
+                 K * stats.norm.cdf(d3_val))
+
+    price = np.where(fallback, F2 - F1 - K, price)
+
+    return np.exp(-r * T) * price[()]
+
+
+def _spread_forwards(S10, S20, K, r, delta1, delta2, T, w1, w2) -> tuple:
+    """Weighted forwards, F1 + K, b = F1/(F1 + K) and the mask of F1 + K <= 0."""
+    F1 = w1 * np.asarray(S10, dtype=float) * np.exp((r - np.asarray(delta1)) * T)
+    F2 = w2 * np.asarray(S20, dtype=float) * np.exp((r - np.asarray(delta2)) * T)
+    K = np.asarray(K, dtype=float)
+
+    strike = F1 + K
+    fallback = strike <= 0
+    # Placeholder values where the formulas do not apply
+    strike = np.where(fallback, 1.0, strike)
+    b = np.where(fallback, 1.0, F1 / strike)
+
+    return F1, F2, strike, b, fallback
+
+
+def geometric_asian_call(S0: float, K: float, r: float, delta: float,
+                         sigma: float, m: int, T: float) -> float:
+    """
+    Closed form of the discretely monitored geometric-average Asian call.
+
+    Payoff: max((S_1 * ... * S_m)^(1/m) - K, 0) with S_i = S(i*T/m). The
+    log of the geometric average is normal with
+
+        mean     = log(S0) + (r - delta - sigma^2/2) * T * (m+1) / (2m)
+        variance = sigma^2 * T * (m+1) * (2m+1) / (6m^2)
+
+    so the price follows from the Black-Scholes argument. It is the usual
+    control variate for the arithmetic Asian call of ``pricing.asian_call``.
+
+    Parameters
+    ----------
+    S0 : float
+        Current stock price
+    K : float
+        Strike price
+    r : float
+        Risk-free interest rate
+    delta : float
+        Dividend yield
+    sigma : float
+        Volatility
+    m : int
+        Number of monitoring points
+    T : float
+        Time to maturity
+
+    Returns
+    -------
+    float
+        Geometric Asian call price
+    """
+    mean = np.log(S0) + (r - delta - 0.5 * sigma ** 2) * T * (m + 1) / (2 * m)
+    variance = sigma ** 2 * T * (m + 1) * (2 * m + 1) / (6 * m ** 2)
+
+    d1_val = (mean - np.log(K) + variance) / np.sqrt(variance)
+    d2_val = d1_val - np.sqrt(variance)
+
+    price = np.exp(-r * T) * (np.exp(mean + 0.5 * variance) * stats.norm.cdf(d1_val) -
+                              K * stats.norm.cdf(d2_val))
+
+    return price
+
+
+def down_and_out_call(S0: float, K: float, H: float, r: float, delta: float,
+                      sigma: float, T: float) -> float:
+    """
+    Continuously monitored down-and-out call with barrier H <= K.
+
+    Priced as the European call minus the down-and-in call of Merton and
+    Reiner-Rubinstein:
+
+        C_di = S0 e^(-delta T) (H/S0)^(2 lam) N(y)
+               - K e^(-r T) (H/S0)^(2 lam - 2) N(y - sigma sqrt(T))
+
+    with lam = (r - delta + sigma^2/2) / sigma^2 and
+    y = log(H^2 / (S0 K)) / (sigma sqrt(T)) + lam sigma sqrt(T).
+
+    Parameters
+    ----------
+    S0 : float
+        Current stock price (above H)
+    K : float
+        Strike price
+    H : float
+        Barrier level, H <= K
+    r : float
+        Risk-free interest rate
+    delta : float
+        Dividend yield
+    sigma : float
+        Volatility
+    T : float
+        Time to maturity
+
+    Returns
+    -------
+    float
+        Down-and-out call price
+    """
+    if H > K:
+        raise ValueError("down_and_out_call requires H <= K")
+
+    lam = (r - delta + 0.5 * sigma ** 2) / sigma ** 2
+    y = np.log(H ** 2 / (S0 * K)) / (sigma * np.sqrt(T)) + lam * sigma * np.sqrt(T)
+
+    down_and_in = (S0 * np.exp(-delta * T) * (H / S0) ** (2 * lam) * stats.norm.cdf(y) -
+                   K * np.exp(-r * T) * (H / S0) ** (2 * lam - 2) *
+                   stats.norm.cdf(y - sigma * np.sqrt(T)))
+
+    return black_scholes_call(S0, K, r, delta, sigma, T) - down_and_in
+
+
+def floating_lookback_call(S0: float, r: float, delta: float, sigma: float,
+                           T: float) -> float:
+    """
+    Continuously monitored floating-strike lookback call, payoff S_T - min S.
+
+    Goldman-Sosin-Gatto formula for a newly issued contract (running
+    minimum S0). The formula divides by b = r - delta; for |b| below
+    1e-9, where it loses its digits to cancellation, the limit b -> 0
+
+        S0 e^(-rT) * (N(s) - N(-s) + 2s phi(s) - 2s^2 N(-s)),    s = sigma sqrt(T) / 2
+
+    is used instead.
+
+    Parameters
+    ----------
+    S0 : float
+        Current stock price
+    r : float
+        Risk-free interest rate
+    delta : float
+        Dividend yield
+    sigma : float
+        Volatility
+    T : float
+        Time to maturity
+
+    Returns
+    -------
+    float
+        Floating-strike lookback call price
+    """
+    b = r - delta
+    if abs(b) < 1e-9:
+        s = 0.5 * sigma * np.sqrt(T)
+        return S0 * np.exp(-r * T) * (stats.norm.cdf(s) - stats.norm.cdf(-s) +
+                                      2 * s * stats.norm.pdf(s) - 2 * s ** 2 * stats.norm.cdf(-s))
+
+    a1 = (b + 0.5 * sigma ** 2) * np.sqrt(T) / sigma
+    a2 = a1 - sigma * np.sqrt(T)
+    a3 = (-b + 0.5 * sigma ** 2) * np.sqrt(T) / sigma
+    ratio = sigma ** 2 / (2 * b)
+
+    price = (S0 * np.exp(-delta * T) * (stats.norm.cdf(a1) - ratio * stats.norm.cdf(-a1)) -
+             S0 * np.exp(-r * T) * (stats.norm.cdf(a2) - ratio * stats.norm.cdf(-a3)))
+
+    return price
+
+
 # Greeks for European Call Options
 
 def call_delta(S0: float, K: float, r: float, delta: float,
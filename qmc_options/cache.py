@@ -0,0 +1,299 @@
+"""
+Cache of generated point sets and their normal transforms.
+
+Pricing many contracts against the same quasi-random point set repeats
+the same work on every call: generating the points and mapping them to
+standard normals with ``simulation.qmc_to_normal``. ``PointSetCache``
+keeps both, keyed by the generator configuration (generator, N, dim,
+seed) and, for the lattice generators, a hash of the generating vector,
+so that a new vector table or a recomputed local vector never reuses
+stale points:
+
+- Small sets are kept in memory in a least-recently-used (LRU) order,
+  within a byte budget.
+- Sets larger than a spill threshold are written once to ``.npy`` files
+  and served as read-only memory maps, so that all the processes on a
+  machine share the same pages.
+
+Cached arrays are read-only; copy them before modifying.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from . import generators
+from . import lattice
+from . import simulation
+
+
+# Version of the on-disk point-set files; bump when a generator changes
+CACHE_VERSION = 1
+
+_GENERATORS = ("halton", "sobol", "lattice", "lattice_sequence")
+
+_default_cache = None
+
+
+class PointSetCache:
+    """
+    LRU cache of point sets with a byte budget and memory-mapped spill files.
+
+    Parameters
+    ----------
+    max_bytes : int, default=256 MiB
+        Budget of the in-memory entries. Least recently used entries are
+        evicted beyond it.
+    spill_bytes : int, default=32 MiB
+        Arrays of at least this size are stored in ``directory`` and
+        returned as read-only memory maps instead of being kept in memory.
+    directory : str, optional
+        Directory of the spill files. Defaults to a ``point_sets``
+        subdirectory of ``lattice.cache_dir()``.
+    """
+
+    def __init__(self, max_bytes: int = 256 << 20, spill_bytes: int = 32 << 20,
+                 directory: str = None):
+        if max_bytes < 0 or spill_bytes < 0:
+            raise ValueError("max_bytes and spill_bytes must be non-negative")
+
+        self.max_bytes = max_bytes
+        self.spill_bytes = spill_bytes
+        self._directory = directory
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def directory(self) -> str:
+        """Directory of the spill files."""
+        if self._directory is not None:
+            return self._directory
+        return os.path.join(lattice.cache_dir(), "point_sets")
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held in memory (memory-mapped entries are not counted)."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def points(self, generator: str, N: int, dim: int, seed: int = None) -> np.ndarray:
+        """
+        Uniform point set for a generator configuration.
+
+        Parameters
+        ----------
+        generator : str
+            One of "halton" (first dim primes), "sobol", "lattice"
+            (``generators.good_lattice_points_nd``) or "lattice_sequence"
+        N : int
+            Number of points
+        dim : int
+            Dimension
+        seed : int, optional
+            If given, the points are randomized by a random shift drawn
+            from ``np.random.default_rng(seed)``
+
+        Returns
+        -------
+        np.ndarray
+            Read-only array of shape (N, dim) with points in [0, 1)^dim
+        """
+        if generator not in _GENERATORS:
+            raise ValueError(f"Unknown generator '{generator}', expected one of {_GENERATORS}")
+
+        z = _generating_vector(generator, N, dim)
+        key = ("points", generator, int(N), int(dim), seed) + _vector_tag(z)
+        return self.get(key, lambda: _generate(generator, N, dim, seed, z))
+
+    def normals(self, generator: str, N: int, dim: int, seed: int = None) -> np.ndarray:
+        """
+        Standard normal images of a point set, ``qmc_to_normal(points(...))``.
+
+        Parameters are those of ``points``. The uniform points are cached
+        as well.
+
+        Returns
+        -------
+        np.ndarray
+            Read-only array of shape (N, dim)
+        """
+        z = _generating_vector(generator, N, dim)
+        key = ("normals", generator, int(N), int(dim), seed) + _vector_tag(z)
+        return self.get(key, lambda: simulation.qmc_to_normal(self.points(generator, N, dim, seed)))
+
+    def get(self, key: tuple, factory) -> np.ndarray:
+        """
+        Cached array for key, computed by ``factory()`` on a miss.
+
+        Parameters
+        ----------
+        key : tuple
+            Hashable key; its string form names the spill file
+        factory : callable
+            Function without arguments returning the array
+
+        Returns
+        -------
+        np.ndarray
+            Read-only array (a memory map for spilled entries)
+        """
+        array = self._entries.get(key)
+        if array is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return array
+
+        path = self._spill_file(key)
+        array = _load_spill_file(path)
+        if array is not None:
+            self.hits += 1
+            self._insert(key, array, in_memory=False)
+            return array
+
+        self.misses += 1
+        array = np.asarray(factory())
+
+        if array.nbytes >= self.spill_bytes:
+            mapped = _store_spill_file(path, array)
+            if mapped is not None:
+                self._insert(key, mapped, in_memory=False)
+                return mapped
+
+        array.setflags(write=False)
+        if array.nbytes <= self.max_bytes:
+            self._insert(key, array, in_memory=True)
+
+        return array
+
+    def clear(self, files: bool = False):
+        """
+        Drop all the in-memory entries.
+
+        Parameters
+        ----------
+        files : bool, default=False
+            Also delete the spill files of this cache version
+        """
+        self._entries.clear()
+        self._nbytes = 0
+
+        if files and os.path.isdir(self.directory):
+            prefix = f"v{CACHE_VERSION}-"
+            for name in os.listdir(self.directory):
+                if name.startswith(prefix) and name.endswith(".npy"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _insert(self, key: tuple, array: np.ndarray, in_memory: bool):
+        self._entries[key] = array
+        if in_memory:
+            self._nbytes += array.nbytes
+
+        # Evict least recently used entries, never the one just inserted
+        while self._nbytes > self.max_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            if not isinstance(old, np.memmap):
+                self._nbytes -= old.nbytes
+
+    def _spill_file(self, key: tuple) -> str:
+        name = "-".join("none" if part is None else str(part) for part in key)
+        return os.path.join(self.directory, f"v{CACHE_VERSION}-{name}.npy")
+
+
+def default_cache() -> PointSetCache:
+    """Process-wide cache used by ``cached_points`` and ``cached_normals``."""
+    global _default_cache
+
+    if _default_cache is None:
+        _default_cache = PointSetCache()
+
+    return _default_cache
+
+
+def cached_points(generator: str, N: int, dim: int, seed: int = None) -> np.ndarray:
+    """Uniform point set from the default cache (see ``PointSetCache.points``)."""
+    return default_cache().points(generator, N, dim, seed)
+
+
+def cached_normals(generator: str, N: int, dim: int, seed: int = None) -> np.ndarray:
+    """Normal transform from the default cache (see ``PointSetCache.normals``)."""
+    return default_cache().normals(generator, N, dim, seed)
+
+
+def _first_primes(n: int) -> list:
+    """The first n prime numbers."""
+    primes = []
+    candidate = 2
+    while len(primes) < n:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def _generating_vector(generator: str, N: int, dim: int) -> np.ndarray:
+    """Generating vector used by the lattice generators, None for the others."""
+    if generator == "lattice":
+        return lattice.generating_vector(N, dim)
+    if generator == "lattice_sequence":
+        return lattice.generating_vector(2 ** 20, dim, embedded=True)
+    return None
+
+
+def _vector_tag(z: np.ndarray) -> tuple:
+    """Key suffix identifying a generating vector (empty without one)."""
+    if z is None:
+        return ()
+    digest = hashlib.sha1(np.asarray(z, dtype=np.int64).tobytes()).hexdigest()
+    return (f"z{digest[:16]}",)
+
+
+def _generate(generator: str, N: int, dim: int, seed: int = None,
+              z: np.ndarray = None) -> np.ndarray:
+    """Point set of a generator configuration."""
+    if generator == "halton":
+        points = generators.halton(_first_primes(dim), N)
+    elif generator == "sobol":
+        points = generators.sobol(dim, N)
+    elif generator == "lattice":
+        points = generators.good_lattice_points_nd(N, dim, z)
+    else:
+        points = generators.lattice_sequence(N, dim, z)
+
+    if seed is not None:
+        points = generators.random_shift(points, np.random.default_rng(seed))
+
+    return points
+
+
+def _load_spill_file(path: str) -> np.ndarray:
+    """Read-only memory map of a spill file, if any."""
+    try:
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+
+def _store_spill_file(path: str, array: np.ndarray) -> np.ndarray:
+    """Atomically write a spill file and map it (None on failure)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "wb") as fh:
+            np.save(fh, array)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return None
+
+    return _load_spill_file(path)
@@ -0,0 +1,236 @@
+"""
+Control variates for the path-dependent pricers.
+
+A control is a function X of the simulated price paths whose
+expectation mu is known in closed form. Given discounted payoffs Y on
+the same paths, the estimator
+
+    Y_cv = mean(Y) - beta' (mean(X) - mu),    beta = Cov(X)^-1 Cov(X, Y)
+
+is unbiased for fixed beta and has variance (1 - R^2) Var(Y) / N, with
+R^2 the squared multiple correlation of Y on the controls. beta is
+estimated from the same paths, in a single streaming pass: the running
+means and co-moments of (Y, X) are merged chunk by chunk exactly like
+``pipeline.RunningStats``, so the paths never have to be kept.
+
+Built-in controls, all discounted and working on price paths of shape
+(N, m+1) with S0 in the first column:
+- ``geometric_asian_control``: geometric-average Asian call, priced by
+  ``analytical.geometric_asian_call``, the classic control for the
+  arithmetic Asian call (correlation above 0.99)
+- ``european_call_control``: European call on the terminal price, priced
+  by ``analytical.black_scholes_call``
+- ``terminal_spot_control``: discounted terminal price, with
+  expectation S0 * exp(-delta*T)
+
+Any pricer in ``pricing`` that simulates GBM paths takes a list of
+controls, and so does ``pipeline.price_paths``.
+"""
+
+import numpy as np
+
+from .analytical import black_scholes_call, geometric_asian_call
+
+
+class Control:
+    """
+    Control variate: a function of the price paths with a known mean.
+
+    Parameters
+    ----------
+    sample : callable
+        Function mapping price paths of shape (n, m+1) to n values
+    mean : float
+        Exact expectation of the values
+    name : str, optional
+        Label used in reports
+    """
+
+    def __init__(self, sample, mean: float, name: str = None):
+        self.sample = sample
+        self.mean = float(mean)
+        self.name = name or getattr(sample, "__name__", "control")
+
+    def __call__(self, paths: np.ndarray) -> np.ndarray:
+        return self.sample(paths)
+
+    def __repr__(self) -> str:
+        return f"Control({self.name!r}, mean={self.mean})"
+
+
+def geometric_asian_control(S0: float, K: float, r: float, delta: float,
+                            sigma: float, m: int, T: float) -> Control:
+    """
+    Discounted geometric-average Asian call over the last m dates.
+
+    Its mean is ``analytical.geometric_asian_call``; use it with
+    ``pricing.asian_call`` on the same m.
+    """
+    discount = np.exp(-r * T)
+
+    def sample(paths):
+        geometric = np.exp(np.mean(np.log(paths[:, -m:]), axis=1))
+        return discount * np.maximum(geometric - K, 0)
+
+    mean = geometric_asian_call(S0, K, r, delta, sigma, m, T)
+
+    return Control(sample, mean, "geometric_asian")
+
+
+def european_call_control(S0: float, K: float, r: float, delta: float,
+                          sigma: float, T: float) -> Control:
+    """Discounted European call on the last column of the paths."""
+    discount = np.exp(-r * T)
+
+    def sample(paths):
+        return discount * np.maximum(paths[:, -1] - K, 0)
+
+    mean = black_scholes_call(S0, K, r, delta, sigma, T)
+
+    return Control(sample, mean, "european_call")
+
+
+def terminal_spot_control(S0: float, r: float, delta: float, T: float) -> Control:
+    """Discounted terminal price exp(-r*T) * S_T, with mean S0 * exp(-delta*T)."""
+    discount = np.exp(-r * T)
+
+    def sample(paths):
+        return discount * paths[:, -1]
+
+    return Control(sample, S0 * np.exp(-delta * T), "terminal_spot")
+
+
+class ControlVariateStats:
+    """
+    Streaming control-variate estimator.
+
+    Keeps the count, the means and the matrix of centered co-moments of
+    (Y, X_1, ..., X_k), merged chunk by chunk with the pairwise update of
+    Chan, Golub and LeVeque. The optimal coefficients and the adjusted
+    estimate follow from these at the end.
+
+    Independent estimates can be tracked at once (e.g. a ladder of
+    strikes): samples then have leading batch axes, and the means,
+    coefficients and errors get the same leading axes.
+
+    Parameters
+    ----------
+    control_means : array_like
+        Exact expectations of the k controls, shape (k,), or (..., k) for
+        control means that differ across the batch
+    """
+
+    def __init__(self, control_means):
+        self.control_means = np.atleast_1d(np.asarray(control_means, dtype=float))
+        k = self.control_means.shape[-1]
+        self.count = 0
+        self.means = np.zeros(k + 1)
+        self._m2 = np.zeros((k + 1, k + 1))
+
+    def update(self, samples: np.ndarray, controls: np.ndarray) -> "ControlVariateStats":
+        """
+        Add a chunk of samples.
+
+        Parameters
+        ----------
+        samples : np.ndarray
+            Values of Y, shape (n,) or (..., n)
+        controls : np.ndarray
+            Values of the controls, shape (n, k) or (..., n, k); (n,) or
+            (..., n) for k = 1
+        """
+        samples = np.asarray(samples, dtype=float)
+        controls = np.asarray(controls, dtype=float)
+        if controls.ndim == samples.ndim:
+            controls = controls[..., None]
+        n = samples.shape[-1]
+        if n == 0:
+            return self
+
+        k = self.control_means.shape[-1]
+        if controls.shape[-1] != k:
+            raise ValueError(f"expected {k} controls, got {controls.shape[-1]}")
+
+        batch = np.broadcast_shapes(samples.shape[:-1], controls.shape[:-2])
+        data = np.concatenate([np.broadcast_to(samples[..., None], batch + (n, 1)),
+                               np.broadcast_to(controls, batch + (n, k))], axis=-1)
+
+        chunk_means = np.mean(data, axis=-2)
+        centered = data - chunk_means[..., None, :]
+        chunk_m2 = np.swapaxes(centered, -1, -2) @ centered
+
+        total = self.count + n
+        diff = chunk_means - self.means
+        self.means = self.means + diff * n / total
+        self._m2 = (self._m2 + chunk_m2 +
+                    diff[..., :, None] * diff[..., None, :] * self.count * n / total)
+        self.count = total
+
+        return self
+
+    @property
+    def beta(self) -> np.ndarray:
+        """Estimated optimal coefficients Cov(X)^-1 Cov(X, Y)."""
+        sxx = self._m2[..., 1:, 1:]
+        sxy = self._m2[..., 1:, 0]
+        # The pseudo-inverse copes with constant or collinear controls
+        return (np.linalg.pinv(sxx) @ sxy[..., None])[..., 0]
+
+    @property
+    def mean(self):
+        """Control-variate estimate of E[Y]."""
+        return self.means[..., 0] - np.sum(self.beta * (self.means[..., 1:] - self.control_means),
+                                           axis=-1)
+
+    @property
+    def variance(self):
+        """Residual variance of Y after regression on the controls."""
+        k = self.control_means.shape[-1]
+        dof = self.count - 1 - k
+        if dof <= 0:
+            return np.zeros_like(self._m2[..., 0, 0])
+        residual = self._m2[..., 0, 0] - np.sum(self.beta * self._m2[..., 1:, 0], axis=-1)
+        return np.maximum(residual, 0.0) / dof
+
+    @property
+    def std_error(self):
+        """Standard error of the control-variate estimate."""
+        if self.count <= 1:
+            return np.zeros_like(self._m2[..., 0, 0])
+        return np.sqrt(self.variance / self.count)
+
+    @property
+    def variance_reduction(self):
+        """Ratio Var(Y) / residual variance, the factor saved in paths."""
+        plain = self._m2[..., 0, 0] / max(self.count - 1, 1)
+        residual = self.variance
+        with np.errstate(divide="ignore"):
+            return np.where(residual > 0, plain / residual, np.inf)
+
+
+def control_variate_estimate(samples: np.ndarray, controls: list,
+                             paths: np.ndarray) -> ControlVariateStats:
+    """
+    Control-variate statistics of samples computed on a set of paths.
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        Discounted payoffs Y, shape (n,)
+    controls : list of Control
+        Controls evaluated on the same paths
+    paths : np.ndarray
+        Price paths of shape (n, m+1)
+
+    Returns
+    -------
+    ControlVariateStats
+        Statistics with the adjusted ``mean``, ``std_error`` and ``beta``
+    """
+    stats = ControlVariateStats([control.mean for control in controls])
+    return stats.update(samples, evaluate(controls, paths))
+
+
+def evaluate(controls: list, paths: np.ndarray) -> np.ndarray:
+    """Values of the controls on the paths, shape (n, k)."""
+    return np.column_stack([control(paths) for control in controls])
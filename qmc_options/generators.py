@@ -5,10 +5,102 @@ This module implements various low-discrepancy sequences:
 - Van der Corput sequence
 - Halton sequence
 - Good Lattice Points (GLP)
+- Sobol' sequence
+- Extensible rank-1 lattice sequences in base 2
+
+Besides the functions returning whole point sets, the stream classes
+``HaltonStream``, ``LatticeStream``, ``SobolStream`` and
+``ExtensibleLatticeStream`` generate the same points block by block, can
+jump to any index and can be pickled to resume a computation.
 """
 
+import os
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
 import numpy as np
 
+from . import lattice
+
+
+# Number of array elements processed per chunk by the vectorized kernels
+_CHUNK_ELEMENTS = 1 << 15
+
+# Number of bits of the Sobol' integer state (points are exact in float64)
+_SOBOL_BITS = 52
+
+# Joe & Kuo (2008) direction numbers, file new-joe-kuo-6.21201 truncated
+_SOBOL_DIRECTIONS_FILE = os.path.join(os.path.dirname(__file__), "data",
+                                      "sobol_joe_kuo_1024.txt")
+
+
+def radical_inverse(indices: np.ndarray, bases: list) -> np.ndarray:
+    """
+    Vectorized radical-inverse function for several indices and bases.
+
+    The digit expansion of a whole chunk of indices is computed at once
+    for each base, one digit position per step. Digits are extracted in
+    floating point (exact for indices below 2^52) and accumulated in the
+    same order as the scalar recurrence, so the values are bitwise
+    identical to repeated calls of the scalar algorithm.
+
+    Parameters
+    ----------
+    indices : np.ndarray
+        1-D array of non-negative integer indices
+    bases : list of int
+        Bases (typically prime numbers), one per output column
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (len(indices), len(bases)) with the radical
+        inverses in [0, 1)
+    """
+    indices = np.asarray(indices, dtype=np.int64).ravel()
+    bases = [int(b) for b in np.atleast_1d(bases)]
+
+    if any(b < 2 for b in bases):
+        raise ValueError("All bases must be integers >= 2")
+    if indices.size and indices.min() < 0:
+        raise ValueError("Indices must be non-negative")
+
+    n, s = len(indices), len(bases)
+    result = np.empty((n, s))
+
+    chunk_size = max(1, min(n, _CHUNK_ELEMENTS))
+    remaining = np.empty(chunk_size)
+    quotient = np.empty(chunk_size)
+    digits = np.empty(chunk_size)
+    values = np.empty(chunk_size)
+
+    for start in range(0, n, chunk_size):
+        chunk = indices[start:start + chunk_size]
+        c = len(chunk)
+        max_index = int(chunk.max())
+
+        for j, base in enumerate(bases):
+            rem, quo, dig, val = remaining[:c], quotient[:c], digits[:c], values[:c]
+            rem[:] = chunk
+            val[:] = 0.0
+            f = 1.0 / base
+            power = 1
+
+            while power <= max_index:
+                np.divide(rem, base, out=quo)
+                np.floor(quo, out=quo)
+                np.multiply(quo, base, out=dig)
+                np.subtract(rem, dig, out=dig)
+                dig *= f
+                val += dig
+                rem, quo = quo, rem
+                f /= base
+                power *= base
+
+            result[start:start + c, j] = val
+
+    return result
+
 
 def van_der_corput(base: int, n: int) -> float:
     """
@@ -18,24 +110,19 @@ def van_der_corput(base: int, n: int) -> float:
     ----------
     base : int
         The base for the sequence (typically a prime number)
-    n : int
-        The index of the element to generate (1-indexed)
+    n : int or np.ndarray
+        The index of the element to generate (1-indexed). An array of
+        indices returns the corresponding array of elements.
 
     Returns
     -------
-    float
+    float or np.ndarray
         The n-th Van der Corput number in [0, 1)
     """
-    result = 0.0
-    f = 1.0 / base
-    i = n
+    if np.ndim(n) == 0:
+        return float(radical_inverse([n], [base])[0, 0])
 
-    while i > 0:
-        result += f * (i % base)
-        i //= base
-        f /= base
-
-    return result
+    return radical_inverse(n, [base])[:, 0]
 
 
 def halton(primes: list, N: int) -> np.ndarray:
@@ -54,14 +141,7 @@ def halton(primes: list, N: int) -> np.ndarray:
     np.ndarray
         Array of shape (N, len(primes)) containing the Halton sequence
     """
-    s = len(primes)
-    sequence = np.zeros((N, s))
-
-    for i in range(N):
-        for j in range(s):
-            sequence[i, j] = van_der_corput(primes[j], i + 1)
-
-    return sequence
+    return radical_inverse(np.arange(1, N + 1), primes)
 
 
 def good_lattice_points(m: int) -> np.ndarray:
@@ -90,16 +170,11 @@ def good_lattice_points(m: int) -> np.ndarray:
         fibo[i] = fibo[i-1] + fibo[i-2]
 
     N = fibo[m-1]
-    glp = np.zeros((N, 2))
 
     # Generating vector
     z = np.array([1, fibo[m-2]])
 
-    for i in range(N):
-        glp[i, 0] = ((i + 1) * z[0] / N) % 1.0
-        glp[i, 1] = ((i + 1) * z[1] / N) % 1.0
-
-    return glp
+    return _lattice_points(np.arange(1, N + 1), z, N)
 
 
 def good_lattice_points_nd(N: int, dim: int, z: np.ndarray = None) -> np.ndarray:
@@ -113,7 +188,9 @@ def good_lattice_points_nd(N: int, dim: int, z: np.ndarray = None) -> np.ndarray
     dim : int
         Dimension of the space
     z : np.ndarray, optional
-        Generating vector of length dim. If None, a default vector is used.
+        Generating vector of length dim. If None, a CBC vector is taken
+        from the table of ``lattice.generating_vector`` (searched once
+        and cached if not yet available).
 
     Returns
     -------
@@ -121,29 +198,170 @@ def good_lattice_points_nd(N: int, dim: int, z: np.ndarray = None) -> np.ndarray
         Array of shape (N, dim) containing GLP in [0, 1)^dim
     """
     if z is None:
-        # Default generating vector (can be optimized)
-        z = np.arange(1, dim + 1)
+        z = lattice.generating_vector(N, dim)
+
+    z = np.asarray(z)
 
-    glp = np.zeros((N, dim))
+    return _lattice_points(np.arange(1, N + 1), z[:dim], N)
 
-    for i in range(N):
-        for j in range(dim):
-            glp[i, j] = ((i + 1) * z[j] / N) % 1.0
 
-    return glp
+def _lattice_points(indices: np.ndarray, z: np.ndarray, N: int) -> np.ndarray:
+    """Rank-1 lattice points frac(i * z / N) for the given indices."""
+    return (np.outer(indices, z) / N) % 1.0
 
 
-def random_shift(points: np.ndarray) -> np.ndarray:
+def lattice_sequence(N: int, dim: int, z: np.ndarray = None,
+                     start: int = 0) -> np.ndarray:
+    """
+    Generate N points of an extensible rank-1 lattice sequence in base 2.
+
+    Point i is frac(phi_2(i) * z), with phi_2 the Van der Corput sequence
+    in base 2. For every m, the first 2^m points are the rank-1 lattice
+    with 2^m points and generating vector z mod 2^m, so a point set can be
+    doubled without discarding the points already used.
+
+    Parameters
+    ----------
+    N : int
+        Number of points to generate
+    dim : int
+        Dimension of the space
+    z : np.ndarray, optional
+        Generating vector of length dim. If None, the bundled embedded CBC
+        vector for lattices of up to 2^20 points is used.
+    start : int, default=0
+        Index of the first point. The sequence starts at the origin so
+        that the first 2^m points form a lattice.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (N, dim) containing the points in [0, 1)^dim
+    """
+    if z is None:
+        z = lattice.generating_vector(2 ** 20, dim, embedded=True)
+
+    z = np.asarray(z)[:dim]
+    phi = radical_inverse(np.arange(start, start + N), [2])
+
+    return (phi * z) % 1.0
+
+
+@lru_cache(maxsize=1)
+def _sobol_direction_numbers() -> np.ndarray:
+    """
+    Load the bundled direction numbers as a (max_dim, _SOBOL_BITS) table.
+
+    Row j holds the direction numbers V[j, k] = m_k * 2^(_SOBOL_BITS - k - 1)
+    of dimension j + 1, extended with the primitive polynomial recurrence.
+    """
+    with open(_SOBOL_DIRECTIONS_FILE) as fh:
+        rows = [line.split() for line in fh.readlines()[1:] if line.strip()]
+
+    L = _SOBOL_BITS
+    V = np.zeros((len(rows) + 1, L), dtype=np.uint64)
+
+    # First dimension: Van der Corput sequence in base 2
+    V[0] = [1 << (L - 1 - k) for k in range(L)]
+
+    for j, row in enumerate(rows, start=1):
+        s, a = int(row[1]), int(row[2])
+        m = [int(v) for v in row[3:3 + s]]
+        v = [m[k] << (L - 1 - k) for k in range(min(s, L))]
+
+        for k in range(s, L):
+            value = v[k - s] ^ (v[k - s] >> s)
+            for i in range(1, s):
+                if (a >> (s - 1 - i)) & 1:
+                    value ^= v[k - i]
+            v.append(value)
+
+        V[j] = v
+
+    return V
+
+
+def sobol(dim: int, N: int, start: int = 1) -> np.ndarray:
+    """
+    Generate N points of the Sobol' sequence in Gray-code order.
+
+    The integer state is updated with the Gray-code construction: point
+    n differs from point n-1 by a single XOR with the direction numbers
+    of the lowest set bit of n, so a whole block is obtained with one
+    cumulative XOR over uint64 arrays.
+
+    Parameters
+    ----------
+    dim : int
+        Dimension of the space (at most 1024 with the bundled direction
+        numbers of Joe and Kuo)
+    N : int
+        Number of points to generate
+    start : int, default=1
+        Index of the first point. The default skips the origin, as
+        ``halton`` does, so that all coordinates are in (0, 1); use
+        ``start=0`` to keep the (t, m, s)-net property of the first
+        2^m points.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (N, dim) containing the Sobol' points in [0, 1)
+    """
+    V = _sobol_direction_numbers()
+
+    if not 1 <= dim <= len(V):
+        raise ValueError(f"dim must be between 1 and {len(V)}")
+    if start < 0 or start + N > 2 ** _SOBOL_BITS:
+        raise ValueError(f"Indices must lie in [0, 2^{_SOBOL_BITS})")
+
+    if N <= 0:
+        return np.zeros((0, dim))
+
+    V = V[:dim]
+
+    # Direct construction of the first point from the Gray code of start
+    gray = start ^ (start >> 1)
+    first = np.zeros(dim, dtype=np.uint64)
+    for k in range(_SOBOL_BITS):
+        if (gray >> k) & 1:
+            first ^= V[:, k]
+
+    # Point n = point n-1 XOR V[:, c] with c the lowest set bit of n,
+    # accumulated in cache-sized chunks of rows
+    n = np.arange(start, start + N, dtype=np.int64)
+    c = np.log2(n & -n, where=n > 0, out=np.zeros(N)).astype(np.intp)
+
+    result = np.empty((N, dim))
+    rows_per_chunk = max(1, _CHUNK_ELEMENTS // dim)
+    state = np.empty((min(N, rows_per_chunk), dim), dtype=np.uint64)
+    last = first
+
+    for i in range(0, N, rows_per_chunk):
+        block = state[:min(rows_per_chunk, N - i)]
+        np.take(V.T, c[i:i + len(block)], axis=0, out=block)
+        block[0] = first if i == 0 else block[0] ^ last
+        np.bitwise_xor.accumulate(block, axis=0, out=block)
+        np.multiply(block, 2.0 ** -_SOBOL_BITS, out=result[i:i + len(block)])
+        last = block[-1].copy()
+
+    return result
+
+
+def random_shift(points: np.ndarray, rng: np.random.Generator = None) -> np.ndarray:
     """
     Apply random shift to a set of quasi-random points.
 
     This technique can improve the variance reduction properties
-    of quasi-Monte Carlo methods.
+    of quasi-Monte Carlo methods. See ``rqmc`` for several independent
+    randomizations computed at once.
 
     Parameters
     ----------
     points : np.ndarray
         Array of shape (N, dim) containing points in [0, 1)^dim
+    rng : np.random.Generator, optional
+        Random generator. If None, the global NumPy random state is used.
 
     Returns
     -------
@@ -151,7 +369,7 @@ def random_shift(points: np.ndarray) -> np.ndarray:
         Randomly shifted points, still in [0, 1)^dim
     """
     dim = points.shape[1]
-    shift = np.random.rand(dim)
+    shift = np.random.rand(dim) if rng is None else rng.random(dim)
     return (points + shift) % 1.0
 
 
@@ -176,3 +394,245 @@ def random_permutation(points: np.ndarray) -> np.ndarray:
         result[:, j] = np.random.permutation(result[:, j])
 
     return result
+
+
+class PointStream(ABC):
+    """
+    Base class for stateful quasi-random point generators.
+
+    A stream keeps the index of the next point to generate, so that a
+    point set can be produced in fixed-size blocks, extended later on
+    without recomputing previous points, and pickled to resume a run.
+    Subclasses implement ``_block(start, n)``, which must be able to
+    compute the n points starting at any index directly.
+
+    Parameters
+    ----------
+    block_size : int
+        Default number of points returned by ``next_block``
+    start : int
+        Index of the first point of the stream
+    """
+
+    def __init__(self, block_size: int = 4096, start: int = 1):
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+
+        self.block_size = block_size
+        self.start = start
+        self.index = start
+
+    @property
+    @abstractmethod
+    def dim(self) -> int:
+        """Dimension of the generated points."""
+
+    @abstractmethod
+    def _block(self, start: int, n: int) -> np.ndarray:
+        """The n points starting at index start, shape (n, dim)."""
+
+    def next_block(self, n: int = None) -> np.ndarray:
+        """
+        Generate the next block of points and advance the stream.
+
+        Parameters
+        ----------
+        n : int, optional
+            Number of points. Defaults to ``block_size``.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (n, dim) with the next points of the stream
+        """
+        if n is None:
+            n = self.block_size
+
+        points = self._block(self.index, n)
+        self.index += n
+
+        return points
+
+    def blocks(self, N: int):
+        """
+        Iterate over the next N points in blocks of at most ``block_size``.
+
+        Parameters
+        ----------
+        N : int
+            Total number of points to generate
+
+        Yields
+        ------
+        np.ndarray
+            Blocks of shape (n, dim) with n <= block_size
+        """
+        remaining = N
+        while remaining > 0:
+            n = min(self.block_size, remaining)
+            remaining -= n
+            yield self.next_block(n)
+
+    def skip(self, n: int) -> "PointStream":
+        """Advance the stream by n points without generating them."""
+        if n < 0:
+            raise ValueError("n must be non-negative")
+
+        self.index += n
+        return self
+
+    def fast_forward(self, index: int) -> "PointStream":
+        """Move the stream so that the next point generated is ``index``."""
+        if index < 0:
+            raise ValueError("index must be non-negative")
+
+        self.index = index
+        return self
+
+    def reset(self) -> "PointStream":
+        """Move the stream back to its first point."""
+        self.index = self.start
+        return self
+
+    def __iter__(self):
+        while True:
+            yield self.next_block()
+
+
+class HaltonStream(PointStream):
+    """
+    Halton sequence generated block by block.
+
+    The first block of a fresh stream equals ``halton(primes, n)``, and
+    any point can be computed directly from its index, so ``skip`` and
+    ``fast_forward`` cost O(1).
+
+    Parameters
+    ----------
+    primes : list of int
+        List of coprime bases (typically prime numbers) for each dimension
+    block_size : int
+        Default number of points returned by ``next_block``
+    start : int
+        Index of the first point (1 matches ``halton``)
+    """
+
+    def __init__(self, primes: list, block_size: int = 4096, start: int = 1):
+        super().__init__(block_size, start)
+        self.primes = [int(p) for p in primes]
+
+    @property
+    def dim(self) -> int:
+        return len(self.primes)
+
+    def _block(self, start: int, n: int) -> np.ndarray:
+        return radical_inverse(np.arange(start, start + n), self.primes)
+
+
+class LatticeStream(PointStream):
+    """
+    Rank-1 lattice point set of N points generated block by block.
+
+    The first N points of a fresh stream equal
+    ``good_lattice_points_nd(N, dim, z)``. Indices beyond N wrap around
+    the lattice.
+
+    Parameters
+    ----------
+    N : int
+        Number of points of the lattice
+    dim : int
+        Dimension of the space
+    z : np.ndarray, optional
+        Generating vector of length dim. If None, the same table vector
+        as ``good_lattice_points_nd`` is used.
+    block_size : int
+        Default number of points returned by ``next_block``
+    start : int
+        Index of the first point (1 matches ``good_lattice_points_nd``)
+    """
+
+    def __init__(self, N: int, dim: int, z: np.ndarray = None,
+                 block_size: int = 4096, start: int = 1):
+        super().__init__(block_size, start)
+
+        if z is None:
+            z = lattice.generating_vector(N, dim)
+
+        self.N = N
+        self.z = np.asarray(z)[:dim]
+
+    @property
+    def dim(self) -> int:
+        return len(self.z)
+
+    def _block(self, start: int, n: int) -> np.ndarray:
+        return _lattice_points(np.arange(start, start + n), self.z, self.N)
+
+
+class SobolStream(PointStream):
+    """
+    Sobol' sequence generated block by block.
+
+    The first block of a fresh stream equals ``sobol(dim, n)``. Each block
+    starts from the state computed directly from its first index, so
+    ``skip`` and ``fast_forward`` cost O(1).
+
+    Parameters
+    ----------
+    dim : int
+        Dimension of the space
+    block_size : int
+        Default number of points returned by ``next_block``
+    start : int
+        Index of the first point (1 matches ``sobol``)
+    """
+
+    def __init__(self, dim: int, block_size: int = 4096, start: int = 1):
+        super().__init__(block_size, start)
+        self._dim = dim
+
+    @property
+    def dim(self) -> int:
+        return self._dim
+
+    def _block(self, start: int, n: int) -> np.ndarray:
+        return sobol(self._dim, n, start=start)
+
+
+class ExtensibleLatticeStream(PointStream):
+    """
+    Extensible rank-1 lattice sequence in base 2 generated block by block.
+
+    The first block of a fresh stream equals ``lattice_sequence(n, dim, z)``.
+    After 2^m points the stream has produced a complete lattice, and the
+    next 2^m points refine it into the lattice with 2^(m+1) points.
+
+    Parameters
+    ----------
+    dim : int
+        Dimension of the space
+    z : np.ndarray, optional
+        Generating vector of length dim (same default as
+        ``lattice_sequence``)
+    block_size : int
+        Default number of points returned by ``next_block``
+    start : int
+        Index of the first point (0 matches ``lattice_sequence``)
+    """
+
+    def __init__(self, dim: int, z: np.ndarray = None,
+                 block_size: int = 4096, start: int = 0):
+        super().__init__(block_size, start)
+
+        if z is None:
+            z = lattice.generating_vector(2 ** 20, dim, embedded=True)
+
+        self.z = np.asarray(z)[:dim]
+
+    @property
+    def dim(self) -> int:
+        return len(self.z)
+
+    def _block(self, start: int, n: int) -> np.ndarray:
+        return lattice_sequence(n, self.dim, self.z, start=start)
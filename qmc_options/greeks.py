@@ -4,10 +4,15 @@ Greeks estimation using pathwise and likelihood ratio methods.
 This module implements Monte Carlo estimators for option sensitivities:
 - Pathwise derivative method
 - Likelihood ratio (score function) method
+
+The estimators are array kernels over the whole point vector: the
+normals, terminal prices and per-point terms are computed at once, and
+points equal to 0 (infinite normals) are masked out.
 """
 
 import numpy as np
-from scipy import stats
+
+from .inverse_normal import norm_ppf
 
 
 def pathwise_delta_european_call(S0: float, K: float, r: float, delta: float,
@@ -39,18 +44,12 @@ def pathwise_delta_european_call(S0: float, K: float, r: float, delta: float,
     float
         Delta estimate
     """
-    N = len(points)
-    delta_sum = 0.0
-
-    for i in range(N):
-        if points[i] > 0:
-            Z = stats.norm.ppf(points[i])
-            ST = S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
+    _, ST, valid = _terminal_prices(S0, r, delta, sigma, T, points)
+    in_the_money = valid & (ST > K)
 
-            if ST > K:  # Option is in the money
-                delta_sum += ST / S0
+    delta_sum = _masked_sum(in_the_money, ST / S0)
 
-    return np.exp(-r * T) * delta_sum / N
+    return np.exp(-r * T) * delta_sum / len(ST)
 
 
 def pathwise_gamma_european_call(S0: float, K: float, r: float, delta: float,
@@ -82,19 +81,13 @@ def pathwise_gamma_european_call(S0: float, K: float, r: float, delta: float,
     float
         Gamma estimate
     """
-    N = len(points)
-    gamma_sum = 0.0
+    Z, ST, valid = _terminal_prices(S0, r, delta, sigma, T, points)
+    in_the_money = valid & (ST > K)
+    x = (r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z
 
-    for i in range(N):
-        if points[i] > 0:
-            Z = stats.norm.ppf(points[i])
-            x = (r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z
-            ST = S0 * np.exp(x)
+    gamma_sum = _masked_sum(in_the_money, (ST / (S0 ** 2)) * (x / S0))
 
-            if ST > K:  # Option is in the money
-                gamma_sum += (ST / (S0 ** 2)) * (x / S0)
-
-    return np.exp(-r * T) * gamma_sum / N
+    return np.exp(-r * T) * gamma_sum / len(ST)
 
 
 def pathwise_vega_european_call(S0: float, K: float, r: float, delta: float,
@@ -126,18 +119,12 @@ def pathwise_vega_european_call(S0: float, K: float, r: float, delta: float,
     float
         Vega estimate
     """
-    N = len(points)
-    vega_sum = 0.0
-
-    for i in range(N):
-        if points[i] > 0:
-            Z = stats.norm.ppf(points[i])
-            ST = S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
+    Z, ST, valid = _terminal_prices(S0, r, delta, sigma, T, points)
+    in_the_money = valid & (ST > K)
 
-            if ST > K:  # Option is in the money
-                vega_sum += ST * (-sigma * T + np.sqrt(T) * Z)
+    vega_sum = _masked_sum(in_the_money, ST * (-sigma * T + np.sqrt(T) * Z))
 
-    return np.exp(-r * T) * vega_sum / N
+    return np.exp(-r * T) * vega_sum / len(ST)
 
 
 def pathwise_rho_european_call(S0: float, K: float, r: float, delta: float,
@@ -169,20 +156,12 @@ def pathwise_rho_european_call(S0: float, K: float, r: float, delta: float,
     float
         Rho estimate
     """
-    N = len(points)
-    rho_sum = 0.0
-    payoff_sum = 0.0
-
-    for i in range(N):
-        if points[i] > 0:
-            Z = stats.norm.ppf(points[i])
-            ST = S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
-            payoff = max(ST - K, 0)
+    _, ST, valid = _terminal_prices(S0, r, delta, sigma, T, points)
+    in_the_money = valid & (ST > K)
+    N = len(ST)
 
-            if ST > K:
-                rho_sum += ST * T
-
-            payoff_sum += payoff
+    rho_sum = _masked_sum(in_the_money, ST * T)
+    payoff_sum = _masked_sum(valid, np.maximum(ST - K, 0))
 
     # Rho includes discounting derivative
     price = np.exp(-r * T) * payoff_sum / N
@@ -222,20 +201,14 @@ def likelihood_delta_european_call(S0: float, K: float, r: float, delta: float,
     float
         Delta estimate
     """
-    N = len(points)
-    delta_sum = 0.0
-
-    for i in range(N):
-        if points[i] > 0:
-            Z = stats.norm.ppf(points[i])
-            ST = S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
-            payoff = max(ST - K, 0)
+    Z, ST, valid = _terminal_prices(S0, r, delta, sigma, T, points)
+    payoff = np.maximum(ST - K, 0)
 
-            # Score function for S0
-            score = Z / (S0 * sigma * np.sqrt(T))
-            delta_sum += payoff * score
+    # Score function for S0
+    score = Z / (S0 * sigma * np.sqrt(T))
+    delta_sum = _masked_sum(valid, payoff * score)
 
-    return np.exp(-r * T) * delta_sum / N
+    return np.exp(-r * T) * delta_sum / len(ST)
 
 
 def likelihood_gamma_european_call(S0: float, K: float, r: float, delta: float,
@@ -265,22 +238,16 @@ def likelihood_gamma_european_call(S0: float, K: float, r: float, delta: float,
     float
         Gamma estimate
     """
-    N = len(points)
-    gamma_sum = 0.0
-
-    for i in range(N):
-        if points[i] > 0:
-            Z = stats.norm.ppf(points[i])
-            ST = S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
-            payoff = max(ST - K, 0)
+    Z, ST, valid = _terminal_prices(S0, r, delta, sigma, T, points)
+    payoff = np.maximum(ST - K, 0)
 
-            # Second derivative of log-likelihood
-            term = (Z ** 2 - 1) / (sigma ** 2 * T) - Z / (S0 * sigma * np.sqrt(T))
-            term /= S0
+    # Second derivative of log-likelihood
+    term = (Z ** 2 - 1) / (sigma ** 2 * T) - Z / (S0 * sigma * np.sqrt(T))
+    term /= S0
 
-            gamma_sum += payoff * term
+    gamma_sum = _masked_sum(valid, payoff * term)
 
-    return np.exp(-r * T) * gamma_sum / N
+    return np.exp(-r * T) * gamma_sum / len(ST)
 
 
 def likelihood_vega_european_call(S0: float, K: float, r: float, delta: float,
@@ -310,21 +277,15 @@ def likelihood_vega_european_call(S0: float, K: float, r: float, delta: float,
     float
         Vega estimate
     """
-    N = len(points)
-    vega_sum = 0.0
+    Z, ST, valid = _terminal_prices(S0, r, delta, sigma, T, points)
+    payoff = np.maximum(ST - K, 0)
 
-    for i in range(N):
-        if points[i] > 0:
-            Z = stats.norm.ppf(points[i])
-            ST = S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
-            payoff = max(ST - K, 0)
+    # Score function for sigma
+    score = (Z ** 2 - 1) / sigma - Z * np.sqrt(T)
 
-            # Score function for sigma
-            score = (Z ** 2 - 1) / sigma - Z * np.sqrt(T)
+    vega_sum = _masked_sum(valid, payoff * score)
 
-            vega_sum += payoff * score
-
-    return np.exp(-r * T) * vega_sum / N
+    return np.exp(-r * T) * vega_sum / len(ST)
 
 
 def likelihood_theta_european_call(S0: float, K: float, r: float, delta: float,
@@ -356,21 +317,15 @@ def likelihood_theta_european_call(S0: float, K: float, r: float, delta: float,
     float
         Theta estimate
     """
-    N = len(points)
-    theta_sum = 0.0
-    payoff_sum = 0.0
-
-    for i in range(N):
-        if points[i] > 0:
-            Z = stats.norm.ppf(points[i])
-            ST = S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
-            payoff = max(ST - K, 0)
+    Z, ST, valid = _terminal_prices(S0, r, delta, sigma, T, points)
+    payoff = np.maximum(ST - K, 0)
+    N = len(ST)
 
-            # Score function for T
-            score = (r - delta - 0.5 * sigma ** 2) + sigma * Z / (2 * np.sqrt(T))
+    # Score function for T
+    score = (r - delta - 0.5 * sigma ** 2) + sigma * Z / (2 * np.sqrt(T))
 
-            theta_sum += payoff * score
-            payoff_sum += payoff
+    theta_sum = _masked_sum(valid, payoff * score)
+    payoff_sum = _masked_sum(valid, payoff)
 
     price = np.exp(-r * T) * payoff_sum / N
     score_term = np.exp(-r * T) * theta_sum / N
@@ -406,22 +361,39 @@ def likelihood_rho_european_call(S0: float, K: float, r: float, delta: float,
     float
         Rho estimate
     """
-    N = len(points)
-    rho_sum = 0.0
-    payoff_sum = 0.0
+    _, ST, valid = _terminal_prices(S0, r, delta, sigma, T, points)
+    payoff = np.maximum(ST - K, 0)
+    N = len(ST)
 
-    for i in range(N):
-        if points[i] > 0:
-            Z = stats.norm.ppf(points[i])
-            ST = S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
-            payoff = max(ST - K, 0)
-
-            # Score function for r (from drift term)
-            rho_sum += payoff * T
-            payoff_sum += payoff
+    # Score function for r (from drift term)
+    rho_sum = _masked_sum(valid, payoff * T)
+    payoff_sum = _masked_sum(valid, payoff)
 
     price = np.exp(-r * T) * payoff_sum / N
     score_term = np.exp(-r * T) * rho_sum / N
 
     # Rho includes discounting derivative
     return score_term - T * price
+
+
+def _terminal_prices(S0: float, r: float, delta: float, sigma: float, T: float,
+                     points: np.ndarray) -> tuple:
+    """
+    Normals, terminal prices and valid mask for a vector of points.
+
+    Points equal to 0 would map to infinite normals; they are flagged as
+    invalid, given a zero normal to keep the arithmetic finite, and must
+    be masked out of the sums.
+    """
+    points = np.asarray(points)
+    valid = points > 0
+
+    Z = np.where(valid, norm_ppf(points), 0.0)
+    ST = S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
+
+    return Z, ST, valid
+
+
+def _masked_sum(valid: np.ndarray, values: np.ndarray) -> float:
+    """Sum of the values where the mask is True."""
+    return np.sum(np.where(valid, values, 0.0))
@@ -0,0 +1,185 @@
+"""
+Vectorized inverse of the standard normal cumulative distribution function.
+
+Mapping uniforms to normals is the hottest operation of the QMC pricers.
+``norm_ppf`` replaces ``scipy.stats.norm.ppf`` with two rational
+approximations evaluated on whole arrays:
+- "as241": Wichura's algorithm AS 241 (PPND16), relative error about
+  1e-16, the accurate default
+- "acklam": Acklam's algorithm (see ``src/stdnormal_inv_acklam.m``),
+  relative error below 1.2e-9 with lower-degree polynomials, the fast
+  choice when that accuracy is enough
+
+Both use a central rational function for most inputs and evaluate the
+tail branch only on the few points that need it. Arrays are processed in
+chunks that fit in cache, float32 inputs are computed in float32, and the
+result can be written into a caller-provided array.
+"""
+
+import numpy as np
+
+
+# Number of elements processed at once
+_CHUNK_ELEMENTS = 1 << 14
+
+_METHODS = ("as241", "acklam")
+
+# AS 241 (PPND16): central region |p - 0.5| <= 0.425, polynomials in
+# r = 0.180625 - q^2; tails in r = sqrt(-log(min(p, 1 - p))) - 1.6 for
+# r <= 5 and r - 5 beyond. Coefficients in increasing degree.
+_AS241_A = (3.3871328727963666080e0, 1.3314166789178437745e+2,
+            1.9715909503065514427e+3, 1.3731693765509461125e+4,
+            4.5921953931549871457e+4, 6.7265770927008700853e+4,
+            3.3430575583588128105e+4, 2.5090809287301226727e+3)
+_AS241_B = (1.0, 4.2313330701600911252e+1, 6.8718700749205790830e+2,
+            5.3941960214247511077e+3, 2.1213794301586595867e+4,
+            3.9307895800092710610e+4, 2.8729085735721942674e+4,
+            5.2264952788528545610e+3)
+_AS241_C = (1.42343711074968357734e0, 4.63033784615654529590e0,
+            5.76949722146069140550e0, 3.64784832476320460504e0,
+            1.27045825245236838258e0, 2.41780725177450611770e-1,
+            2.27238449892691845833e-2, 7.74545014278341407640e-4)
+_AS241_D = (1.0, 2.05319162663775882187e0, 1.67638483018380384940e0,
+            6.89767334985100004550e-1, 1.48103976427480074590e-1,
+            1.51986665636164571966e-2, 5.47593808499534494600e-4,
+            1.05075007164441684324e-9)
+_AS241_E = (6.65790464350110377720e0, 5.46378491116411436990e0,
+            1.78482653991729133580e0, 2.96560571828504891230e-1,
+            2.65321895265761230930e-2, 1.24266094738807843860e-3,
+            2.71155556874348757815e-5, 2.01033439929228813265e-7)
+_AS241_F = (1.0, 5.99832206555887937690e-1, 1.36929880922735805310e-1,
+            1.48753612908506148525e-2, 7.86869131145613259100e-4,
+            1.84631831751005468180e-5, 1.42151175831644588870e-7,
+            2.04426310338993978564e-15)
+
+# Acklam: central region p_low <= p <= 1 - p_low, polynomials in r = q^2
+# (numerator multiplied by q); tails in q = sqrt(-2 log(min(p, 1 - p))).
+# Coefficients in increasing degree.
+_ACKLAM_P_LOW = 0.02425
+_ACKLAM_A = (2.506628277459239e0, -3.066479806614716e1, 1.383577518672690e2,
+             -2.759285104469687e2, 2.209460984245205e2, -3.969683028665376e1)
+_ACKLAM_B = (1.0, -1.328068155288572e1, 6.680131188771972e1,
+             -1.556989798598866e2, 1.615858368580409e2, -5.447609879822406e1)
+_ACKLAM_C = (2.938163982698783e0, 4.374664141464968e0, -2.549732539343734e0,
+             -2.400758277161838e0, -3.223964580411365e-1, -7.784894002430293e-3)
+_ACKLAM_D = (1.0, 3.754408661907416e0, 2.445134137142996e0,
+             3.224671290700398e-1, 7.784695709041462e-3)
+
+
+def norm_ppf(p, method: str = "as241", out: np.ndarray = None, dtype=None):
+    """
+    Inverse of the standard normal CDF, element-wise.
+
+    Parameters
+    ----------
+    p : float or np.ndarray
+        Probabilities. 0 and 1 map to -inf and inf, values outside [0, 1]
+        and NaN to NaN.
+    method : str, default="as241"
+        "as241" (accurate to about 1e-16) or "acklam" (about 1e-9, faster)
+    out : np.ndarray, optional
+        Array of the same shape as p to write the result into; may be p
+        itself
+    dtype : np.dtype, optional
+        Precision of the computation, float32 or float64. Defaults to the
+        dtype of out if given, else float32 for float32 input and float64
+        otherwise.
+
+    Returns
+    -------
+    float or np.ndarray
+        Normal quantiles, a float for scalar input
+    """
+    if method not in _METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {_METHODS}")
+
+    scalar = np.ndim(p) == 0
+    p = np.asarray(p)
+
+    if dtype is None:
+        if out is not None:
+            dtype = out.dtype
+        else:
+            dtype = np.float32 if p.dtype == np.float32 else np.float64
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("dtype must be float32 or float64")
+
+    if out is None:
+        out = np.empty(p.shape, dtype=dtype)
+    elif out.shape != p.shape:
+        raise ValueError(f"out must have shape {p.shape}")
+
+    kernel = _as241 if method == "as241" else _acklam
+
+    flat_p = p.reshape(-1)
+    # Work on a contiguous buffer when out cannot be viewed as one
+    flat_out = out.reshape(-1) if out.flags.c_contiguous and out.dtype == dtype \
+        else np.empty(p.size, dtype=dtype)
+
+    # Chunks of p are copied when the result overwrites them
+    in_place = np.may_share_memory(flat_p, flat_out)
+
+    # 0, 1 and invalid inputs go through the formulas and are fixed after
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, p.size, _CHUNK_ELEMENTS):
+            stop = min(start + _CHUNK_ELEMENTS, p.size)
+            x = flat_p[start:stop].astype(dtype, copy=in_place)
+            kernel(x, flat_out[start:stop])
+
+    if not np.shares_memory(flat_out, out):
+        out[...] = flat_out.reshape(p.shape)
+
+    return out[()] if scalar else out
+
+
+def _polyval(coefficients: tuple, x: np.ndarray) -> np.ndarray:
+    """Horner evaluation of a polynomial with coefficients in increasing degree."""
+    result = np.full_like(x, coefficients[-1])
+    for c in coefficients[-2::-1]:
+        result *= x
+        result += c
+    return result
+
+
+def _as241(p: np.ndarray, out: np.ndarray):
+    """AS 241 on one chunk of probabilities, written into out."""
+    q = p - 0.5
+    r = 0.180625 - q * q
+    np.divide(q * _polyval(_AS241_A, r), _polyval(_AS241_B, r), out=out)
+
+    tail = np.flatnonzero(~(np.abs(q) <= 0.425))
+    if len(tail):
+        pt, qt = p[tail], q[tail]
+        rt = np.sqrt(-np.log(np.minimum(pt, 1 - pt)))
+        near = rt <= 5.0
+        values = np.where(near,
+                          _polyval(_AS241_C, rt - 1.6) / _polyval(_AS241_D, rt - 1.6),
+                          _polyval(_AS241_E, rt - 5.0) / _polyval(_AS241_F, rt - 5.0))
+        out[tail] = np.where(qt < 0, -values, values)
+
+    _edges(p, out)
+
+
+def _acklam(p: np.ndarray, out: np.ndarray):
+    """Acklam's approximation on one chunk of probabilities, written into out."""
+    q = p - 0.5
+    r = q * q
+    np.divide(q * _polyval(_ACKLAM_A, r), _polyval(_ACKLAM_B, r), out=out)
+
+    tail = np.flatnonzero(~(np.abs(q) <= 0.5 - _ACKLAM_P_LOW))
+    if len(tail):
+        pt, qt = p[tail], q[tail]
+        s = np.sqrt(-2 * np.log(np.minimum(pt, 1 - pt)))
+        values = _polyval(_ACKLAM_C, s) / _polyval(_ACKLAM_D, s)
+        out[tail] = np.where(qt < 0, values, -values)
+
+    _edges(p, out)
+
+
+def _edges(p: np.ndarray, out: np.ndarray):
+    """Exact values at 0 and 1 and NaN outside [0, 1]."""
+    if not np.all((p > 0) & (p < 1)):
+        out[p == 0] = -np.inf
+        out[p == 1] = np.inf
+        out[(p < 0) | (p > 1) | np.isnan(p)] = np.nan
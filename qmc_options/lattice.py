@@ -0,0 +1,565 @@
+"""
+Construction of generating vectors for rank-1 lattice rules.
+
+This module implements the component-by-component (CBC) construction of
+generating vectors z for lattice points frac(k * z / N) that minimize the
+worst-case error in a weighted Korobov space with smoothness alpha = 2
+and product weights gamma_j:
+
+    e^2(z) = -1 + 1/N * sum_k prod_j (1 + gamma_j * omega({k * z_j / N}))
+
+with omega(x) = 2 * pi^2 * (x^2 - x + 1/6).
+
+For N prime or a power of two the search uses the fast CBC algorithm of
+Nuyens and Cools, which reorders the candidates and the points by powers
+of a generator of the multiplicative group so that every step is a
+circular convolution evaluated with the FFT, O(dim * N * log N) overall.
+Other values of N fall back to a direct O(dim * N^2) search.
+
+For extensible lattice sequences, ``embedded_generating_vector`` searches
+a single vector that is good for all the lattices with 2^m points.
+
+Searched vectors are kept in a versioned table (see ``generating_vector``)
+so that each (N, weights) search runs once per machine: a bundled set
+covers powers of two and Fibonacci sizes, and new entries are stored in a
+local file cache shared by all processes.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from scipy import fft
+
+
+# Version of the generating-vector table; bump when the search changes
+TABLE_VERSION = 1
+
+# Bundled vectors for powers of two (default weights) and Fibonacci sizes
+_BUNDLED_TABLE_FILE = os.path.join(os.path.dirname(__file__), "data",
+                                   f"lattice_vectors_v{TABLE_VERSION}.json")
+
+# Largest N, neither prime nor a power of two, searched by default
+_MAX_DIRECT_SEARCH_N = 20000
+
+# In-memory table {(weight profile, N): longest known generating vector}
+_memory_table = {}
+_bundled_table = None
+
+
+def omega(x: np.ndarray) -> np.ndarray:
+    """
+    Kernel of the Korobov space with smoothness alpha = 2.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Values in [0, 1]
+
+    Returns
+    -------
+    np.ndarray
+        2 * pi^2 * B2(x), with B2 the Bernoulli polynomial of degree 2
+    """
+    return 2 * np.pi ** 2 * (x * x - x + 1.0 / 6.0)
+
+
+def product_weights(dim: int, weights=None) -> np.ndarray:
+    """
+    Expand a weight specification into one product weight per dimension.
+
+    Parameters
+    ----------
+    dim : int
+        Dimension
+    weights : float or array-like, optional
+        A scalar (same weight for every dimension), a sequence of length
+        at least dim, or None for the default gamma_j = 1 / j^2.
+
+    Returns
+    -------
+    np.ndarray
+        Array of dim positive weights
+    """
+    if weights is None:
+        return 1.0 / np.arange(1, dim + 1) ** 2
+
+    weights = np.asarray(weights, dtype=float)
+
+    if weights.ndim == 0:
+        return np.full(dim, float(weights))
+    if len(weights) < dim:
+        raise ValueError(f"Expected at least {dim} weights, got {len(weights)}")
+
+    return weights[:dim]
+
+
+def worst_case_error(N: int, z: np.ndarray, weights=None) -> float:
+    """
+    Worst-case error of a rank-1 lattice rule in the weighted Korobov space.
+
+    Parameters
+    ----------
+    N : int
+        Number of points
+    z : np.ndarray
+        Generating vector
+    weights : float or array-like, optional
+        Product weights (see ``product_weights``)
+
+    Returns
+    -------
+    float
+        Worst-case error e(z) (the square root of e^2)
+    """
+    z = np.asarray(z, dtype=np.int64)
+    gamma = product_weights(len(z), weights)
+    k = np.arange(N, dtype=np.int64)
+
+    prod = np.ones(N)
+    for zj, gj in zip(z, gamma):
+        prod *= 1 + gj * omega((k * zj % N) / N)
+
+    return np.sqrt(max(np.mean(prod) - 1, 0.0))
+
+
+def cbc_generating_vector(N: int, dim: int, weights=None) -> np.ndarray:
+    """
+    Component-by-component construction of a lattice generating vector.
+
+    Parameters
+    ----------
+    N : int
+        Number of points of the lattice. The fast algorithm is used when
+        N is prime or a power of two; other values of N use a direct
+        search with cost O(dim * N^2).
+    dim : int
+        Dimension of the lattice
+    weights : float or array-like, optional
+        Product weights gamma_j (see ``product_weights``)
+
+    Returns
+    -------
+    np.ndarray
+        Generating vector z of length dim, usable by
+        ``generators.good_lattice_points_nd(N, dim, z)``
+    """
+    if N < 2:
+        raise ValueError("N must be at least 2")
+    if dim < 1:
+        raise ValueError("dim must be positive")
+
+    gamma = product_weights(dim, weights)
+
+    if _is_prime(N) or N & (N - 1) == 0:
+        return _fast_cbc(N, gamma)
+
+    return _naive_cbc(N, gamma)
+
+
+def _is_prime(n: int) -> bool:
+    """Primality test by trial division."""
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+
+    f = 3
+    while f * f <= n:
+        if n % f == 0:
+            return False
+        f += 2
+
+    return True
+
+
+def _prime_factors(n: int) -> list:
+    """Distinct prime factors of n."""
+    factors = []
+    f = 2
+    while f * f <= n:
+        if n % f == 0:
+            factors.append(f)
+            while n % f == 0:
+                n //= f
+        f += 1
+    if n > 1:
+        factors.append(n)
+
+    return factors
+
+
+def _primitive_root(p: int) -> int:
+    """Smallest primitive root of the odd prime p."""
+    factors = _prime_factors(p - 1)
+
+    for g in range(2, p):
+        if all(pow(g, (p - 1) // q, p) != 1 for q in factors):
+            return g
+
+    raise ValueError(f"No primitive root found for {p}")
+
+
+def _cyclic_half_group(M: int) -> tuple:
+    """
+    Generator g and order L of the unit group modulo M divided by {1, -1}.
+
+    The classes of units modulo M up to sign are g^0, ..., g^(L-1), which
+    holds for M prime and for M a power of two (g = 5).
+    """
+    if M <= 4:
+        return 1, 1
+    if M & (M - 1) == 0:
+        return 5, M // 4
+
+    return _primitive_root(M), (M - 1) // 2
+
+
+def _powers(g: int, L: int, M: int) -> np.ndarray:
+    """Array of g^i mod M for i = 0, ..., L-1."""
+    powers = np.empty(L, dtype=np.int64)
+    value = 1
+    for i in range(L):
+        powers[i] = value
+        value = value * g % M
+
+    return powers
+
+
+def _fast_cbc_setup(N: int) -> tuple:
+    """
+    Precompute the reordering and the omega transforms of the fast CBC.
+
+    Returns the candidates (units modulo N up to sign, as powers of a
+    generator) and one block per divisor d of N: points k with
+    gcd(k, N) = d are d * k' with k' a unit modulo M = N / d, and the sum
+    over k' is a circular correlation of length L_M in the powers of the
+    generator modulo M.
+    """
+    g, L = _cyclic_half_group(N)
+    candidates = _powers(g, L, N)
+
+    blocks = []
+    divisors = [1] if _is_prime(N) else [1 << a for a in range(N.bit_length() - 1)]
+
+    for d in divisors:
+        M = N // d
+        gM, LM = _cyclic_half_group(M)
+        reps = _powers(gM, LM, M)
+
+        plus = d * reps
+        minus = d * ((M - reps) % M)
+        minus = np.where(minus == plus, -1, minus)
+
+        # The circular correlation of length L_M is computed as a linear one
+        # against two periods of omega, padded to a fast FFT size
+        n_fft = fft.next_fast_len(2 * LM, real=True)
+        w = omega(reps / M)
+        fft_omega = fft.rfft(np.concatenate([w, w]), n_fft)
+        blocks.append((LM, n_fft, plus, minus, fft_omega))
+
+    return candidates, blocks
+
+
+def _fast_cbc_scores(setup: tuple, p: np.ndarray) -> np.ndarray:
+    """Sum over k of p[k] * omega({k * c / N}) for every candidate c."""
+    candidates, blocks = setup
+    index = np.arange(len(candidates))
+    scores = np.full(len(candidates), p[0] * omega(0.0))
+
+    for LM, n_fft, plus, minus, fft_omega in blocks:
+        q = p[plus] + np.where(minus >= 0, p[minus], 0.0)
+        corr = fft.irfft(np.conj(fft.rfft(q, n_fft)) * fft_omega, n_fft)
+        scores += corr[index % LM]
+
+    return scores
+
+
+def _fast_cbc(N: int, gamma: np.ndarray) -> np.ndarray:
+    """Fast CBC construction for N prime or a power of two."""
+    setup = _fast_cbc_setup(N)
+    candidates = setup[0]
+
+    k = np.arange(N, dtype=np.int64)
+    p = np.ones(N)
+    z = np.empty(len(gamma), dtype=np.int64)
+
+    for j, gj in enumerate(gamma):
+        if j == 0:
+            best = 1
+        else:
+            best = int(candidates[np.argmin(_fast_cbc_scores(setup, p))])
+
+        z[j] = best
+        p *= 1 + gj * omega((k * best % N) / N)
+
+    return z
+
+
+def embedded_generating_vector(m_max: int, dim: int, weights=None,
+                               m_min: int = 0) -> np.ndarray:
+    """
+    CBC generating vector for an embedded sequence of lattices in base 2.
+
+    The vector z is searched for N = 2^m_max, but every component is
+    chosen to minimize the worst, over m_min <= m <= m_max, of the squared
+    worst-case error of the lattice with 2^m points (generating vector
+    z mod 2^m) relative to the best candidate for that size alone. The
+    lattices with 2^m points are then all good and nested, which is what
+    ``generators.lattice_sequence`` relies on.
+
+    Parameters
+    ----------
+    m_max : int
+        Base-2 logarithm of the largest lattice size
+    dim : int
+        Dimension of the lattice
+    weights : float or array-like, optional
+        Product weights gamma_j (see ``product_weights``)
+    m_min : int, default=0
+        Base-2 logarithm of the smallest lattice size taken into account
+
+    Returns
+    -------
+    np.ndarray
+        Generating vector z of length dim
+    """
+    if not 0 <= m_min <= m_max:
+        raise ValueError("Expected 0 <= m_min <= m_max")
+
+    gamma = product_weights(dim, weights)
+    N = 2 ** m_max
+    candidates = _fast_cbc_setup(N)[0]
+    index = np.arange(len(candidates))
+
+    # Levels with at least 4 points (smaller lattices have a single candidate)
+    levels = []
+    for m in range(max(m_min, 2), m_max + 1):
+        Nm = 2 ** m
+        levels.append((Nm, _fast_cbc_setup(Nm), np.arange(Nm, dtype=np.int64), np.ones(Nm)))
+
+    z = np.empty(dim, dtype=np.int64)
+
+    for j, gj in enumerate(gamma):
+        if j == 0:
+            best = 1
+        else:
+            criterion = np.zeros(len(candidates))
+            for Nm, setup, k, p in levels:
+                scores = _fast_cbc_scores(setup, p)
+                errors = (np.sum(p) + gj * scores) / Nm - 1
+                errors = errors[index % len(scores)]
+                criterion = np.maximum(criterion, errors / errors.min())
+            best = int(candidates[np.argmin(criterion)])
+
+        z[j] = best
+        for Nm, setup, k, p in levels:
+            p *= 1 + gj * omega((k * best % Nm) / Nm)
+
+    return z
+
+
+def _naive_cbc(N: int, gamma: np.ndarray, chunk_size: int = 1 << 20) -> np.ndarray:
+    """Direct CBC search over all units modulo N."""
+    k = np.arange(N, dtype=np.int64)
+    units = np.array([c for c in range(1, N // 2 + 1) if np.gcd(c, N) == 1],
+                     dtype=np.int64)
+
+    p = np.ones(N)
+    z = np.empty(len(gamma), dtype=np.int64)
+    rows = max(1, chunk_size // N)
+
+    for j, gj in enumerate(gamma):
+        if j == 0:
+            best = 1
+        else:
+            scores = np.empty(len(units))
+            for i in range(0, len(units), rows):
+                c = units[i:i + rows]
+                scores[i:i + rows] = omega((np.outer(c, k) % N) / N) @ p
+            best = int(units[np.argmin(scores)])
+
+        z[j] = best
+        p *= 1 + gj * omega((k * best % N) / N)
+
+    return z
+
+
+# Table of generating vectors
+
+def weight_profile(weights=None) -> str:
+    """
+    Name of a weight specification, used as key of the vector table.
+
+    Parameters
+    ----------
+    weights : float or array-like, optional
+        Product weights (see ``product_weights``)
+
+    Returns
+    -------
+    str
+        "inv-square" for the default weights, "const-<value>" for a scalar
+        weight and "custom-<hash>" for an explicit sequence of weights
+    """
+    if weights is None:
+        return "inv-square"
+
+    weights = np.asarray(weights, dtype=float)
+
+    if weights.ndim == 0:
+        return f"const-{float(weights)!r}"
+
+    digest = hashlib.sha1(np.ascontiguousarray(weights).tobytes()).hexdigest()
+    return f"custom-{digest[:16]}"
+
+
+def cache_dir() -> str:
+    """
+    Directory of the local generating-vector cache.
+
+    Set by the environment variable ``QMC_OPTIONS_CACHE_DIR``, by default
+    ``~/.cache/qmc_options``.
+    """
+    return os.environ.get("QMC_OPTIONS_CACHE_DIR",
+                          os.path.join(os.path.expanduser("~"), ".cache", "qmc_options"))
+
+
+def generating_vector(N: int, dim: int, weights=None,
+                      embedded: bool = False) -> np.ndarray:
+    """
+    Look up (or search once and store) a CBC generating vector.
+
+    For dim <= 2 and N a Fibonacci number the Fibonacci lattice of
+    ``generators.good_lattice_points`` is returned. Otherwise the table is
+    keyed by (weight profile, N) and stores the longest vector known for
+    each key: since the CBC construction is greedy, the vector for a lower
+    dimension is a prefix of it. Lookups go through an in-memory
+    dictionary, then the bundled table, then the local file cache, and
+    only search with ``cbc_generating_vector`` on a miss. Cache files are
+    written atomically, so concurrent readers never see a partial entry.
+
+    Parameters
+    ----------
+    N : int
+        Number of points of the lattice
+    dim : int
+        Dimension of the lattice
+    weights : float or array-like, optional
+        Product weights (see ``product_weights``)
+    embedded : bool, default=False
+        Return a vector of ``embedded_generating_vector``, good for all
+        the lattices with 2^m <= N points. N must be a power of two.
+
+    Returns
+    -------
+    np.ndarray
+        Generating vector z of length dim
+
+    Raises
+    ------
+    ValueError
+        If no vector is stored and N is neither prime nor a power of two
+        above a few tens of thousands, where the direct search is too
+        expensive to run implicitly; call ``cbc_generating_vector``
+        explicitly for such N.
+    """
+    if embedded and N & (N - 1) != 0:
+        raise ValueError("Embedded lattices require N to be a power of two")
+
+    if dim <= 2 and not embedded:
+        fibonacci = _load_bundled_table()["fibonacci"].get(str(N))
+        if fibonacci is not None:
+            return np.array(fibonacci[:dim], dtype=np.int64)
+
+    profile = weight_profile(weights) + ("-embedded" if embedded else "")
+    key = (profile, N)
+
+    z = _memory_table.get(key)
+
+    if z is None or len(z) < dim:
+        z = _lookup_bundled(profile, N)
+
+    if z is None or len(z) < dim:
+        z = _lookup_cache_file(profile, N)
+
+    if z is None or len(z) < dim:
+        if N > _MAX_DIRECT_SEARCH_N and not (_is_prime(N) or N & (N - 1) == 0):
+            raise ValueError(f"No generating vector available for N={N}; use N prime "
+                             f"or a power of two, or run cbc_generating_vector(N, dim)")
+
+        if embedded:
+            z = embedded_generating_vector(N.bit_length() - 1, dim, weights)
+        else:
+            z = cbc_generating_vector(N, dim, weights)
+        _store_cache_file(profile, N, z)
+
+    _memory_table[key] = z
+
+    return z[:dim]
+
+
+def _load_bundled_table() -> dict:
+    """Table shipped with the package, loaded on first use."""
+    global _bundled_table
+
+    if _bundled_table is None:
+        with open(_BUNDLED_TABLE_FILE) as fh:
+            _bundled_table = json.load(fh)
+
+    return _bundled_table
+
+
+def _lookup_bundled(profile: str, N: int) -> np.ndarray:
+    """Vector from the bundled table, if any."""
+    z = _load_bundled_table()["vectors"].get(profile, {}).get(str(N))
+
+    return None if z is None else np.array(z, dtype=np.int64)
+
+
+def _cache_file(profile: str, N: int) -> str:
+    return os.path.join(cache_dir(), f"lattice-v{TABLE_VERSION}-{profile}-N{N}.npy")
+
+
+def _lookup_cache_file(profile: str, N: int) -> np.ndarray:
+    """Vector from the local file cache, if any."""
+    try:
+        return np.load(_cache_file(profile, N))
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cache_file(profile: str, N: int, z: np.ndarray):
+    """Atomically write a vector to the local file cache (best effort)."""
+    path = _cache_file(profile, N)
+    tmp = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "wb") as fh:
+            np.save(fh, z)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _build_bundled_table(path: str = _BUNDLED_TABLE_FILE, max_m: int = 20,
+                         max_dim: int = 256, max_fibonacci: int = 2 ** 31):
+    """Regenerate the bundled table of generating vectors."""
+    vectors = {str(2 ** m): cbc_generating_vector(2 ** m, max_dim).tolist()
+               for m in range(4, max_m + 1)}
+    embedded = {str(2 ** max_m): embedded_generating_vector(max_m, max_dim).tolist()}
+
+    fibonacci = {}
+    a, b = 1, 2
+    while b <= max_fibonacci:
+        fibonacci[str(b)] = [1, a]
+        a, b = b, a + b
+
+    with open(path, "w") as fh:
+        json.dump({"version": TABLE_VERSION,
+                   "vectors": {weight_profile(): vectors,
+                               weight_profile() + "-embedded": embedded},
+                   "fibonacci": fibonacci}, fh)
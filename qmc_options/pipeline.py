@@ -0,0 +1,312 @@
+"""
+Chunked streaming pipeline for path-dependent pricing at large N.
+
+Pricing N = 10^7 paths of m = 252 dates in one go needs the full N x m
+matrices of points, normals and prices. The pipeline here chains the
+stages with generators over fixed-size chunks instead:
+
+    points -> normals -> paths -> payoffs -> running statistics
+
+Only one chunk of each stage is alive at any time, and the normal and
+path matrices are written into buffers allocated once and reused for
+every chunk, so memory is set by the chunk size, not by N. Any
+``generators.PointStream`` (or a point array) can feed the pipeline, and
+any payoff function of the price paths can close it. Control variates
+(``control_variates.Control``) are evaluated on every chunk of paths and
+their coefficients estimated in the same pass.
+
+``optimal_chunk_size`` times the pipeline for candidate chunk sizes that
+fit a memory budget and reports the fastest one.
+"""
+
+import time
+
+import numpy as np
+
+from .control_variates import ControlVariateStats, evaluate
+from .inverse_normal import norm_ppf
+from .simulation import gbm_paths
+
+
+# Default memory budget of the chunk buffers (bytes)
+DEFAULT_MEMORY_BUDGET = 256 << 20
+
+
+class RunningStats:
+    """
+    Running mean and variance of a sample seen in chunks.
+
+    Chunks are merged with the pairwise update of Chan, Golub and LeVeque,
+    which is numerically stable and exact up to rounding. The mean and
+    variance are arrays when the chunks are reduced along an axis.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, samples: np.ndarray, axis: int = None) -> "RunningStats":
+        """
+        Add a chunk of samples.
+
+        With an axis, the samples of each slice along it form a separate
+        statistic, so that several estimates (e.g. a ladder of strikes)
+        are tracked at once.
+        """
+        samples = np.asarray(samples, dtype=float)
+        if axis is None:
+            samples, axis = samples.ravel(), 0
+        n = samples.shape[axis]
+        if n == 0:
+            return self
+
+        chunk_mean = np.mean(samples, axis=axis)
+        chunk_m2 = np.sum((samples - np.expand_dims(chunk_mean, axis)) ** 2, axis=axis)
+
+        total = self.count + n
+        diff = chunk_mean - self.mean
+        self.mean = self.mean + diff * n / total
+        self._m2 = self._m2 + chunk_m2 + diff ** 2 * self.count * n / total
+        self.count = total
+
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std_error(self) -> float:
+        """Standard error of the mean, std / sqrt(count)."""
+        return np.sqrt(self.variance / self.count) if self.count > 1 else 0.0
+
+
+def point_chunks(source, N: int, chunk_size: int):
+    """
+    Yield the next N points of a source in chunks of at most chunk_size.
+
+    Parameters
+    ----------
+    source : generators.PointStream or np.ndarray
+        Point stream (advanced by N points) or array of shape (>= N, dim)
+    N : int
+        Number of points
+    chunk_size : int
+        Maximum number of points per chunk
+
+    Yields
+    ------
+    np.ndarray
+        Chunks of shape (n, dim)
+    """
+    if isinstance(source, np.ndarray):
+        if len(source) < N:
+            raise ValueError(f"source has {len(source)} points, {N} requested")
+        for start in range(0, N, chunk_size):
+            yield source[start:min(start + chunk_size, N)]
+        return
+
+    remaining = N
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        remaining -= n
+        yield source.next_block(n)
+
+
+def normal_chunks(chunks, buffer: np.ndarray):
+    """
+    Map chunks of uniforms to standard normals inside a reusable buffer.
+
+    As in ``pricing``, rows with a zero coordinate are flagged so that
+    their payoff can be set to zero.
+
+    Yields
+    ------
+    tuple
+        (normals, valid) with normals a view of buffer of shape (n, dim)
+        and valid the boolean mask of rows without zero coordinates
+    """
+    for points in chunks:
+        normals = buffer[:len(points)]
+        np.clip(points, 1e-10, 1 - 1e-10, out=normals)
+        norm_ppf(normals, out=normals)
+        yield normals, np.all(points > 0, axis=1)
+
+
+def path_chunks(chunks, buffer: np.ndarray, S0: float, r: float, delta: float,
+                sigma: float, T: float, construction: str = "standard"):
+    """
+    Build GBM price paths for chunks of normals inside a reusable buffer.
+
+    Yields
+    ------
+    tuple
+        (paths, valid) with paths a view of buffer of shape (n, m+1)
+    """
+    for normals, valid in chunks:
+        paths = buffer[:len(normals)]
+        gbm_paths(S0, r, delta, sigma, T, normals, out=paths, construction=construction)
+        yield paths, valid
+
+
+def price_paths(payoff, source, N: int, S0: float, r: float, delta: float,
+                sigma: float, T: float, m: int = None, chunk_size: int = None,
+                memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                construction: str = "standard", controls: list = None) -> dict:
+    """
+    Price a path-dependent payoff with N paths, one chunk at a time.
+
+    Parameters
+    ----------
+    payoff : callable
+        Function mapping a (n, m+1) array of price paths (S0 in the first
+        column) to the n undiscounted payoffs, e.g. for an Asian call
+        ``lambda S: np.maximum(S[:, 1:].mean(axis=1) - K, 0)``
+    source : generators.PointStream or np.ndarray
+        Points in [0, 1)^m, one dimension per date
+    N : int
+        Number of paths
+    S0 : float
+        Initial stock price
+    r : float
+        Risk-free interest rate
+    delta : float
+        Dividend yield
+    sigma : float
+        Volatility
+    T : float
+        Time to maturity
+    m : int, optional
+        Number of dates; defaults to the dimension of the source
+    chunk_size : int, optional
+        Paths per chunk. Defaults to the largest that fits memory_budget.
+    memory_budget : int, default=256 MiB
+        Bytes available for the chunk buffers
+    construction : str, default="standard"
+        Path construction (see ``simulation.brownian_motion``)
+    controls : list of control_variates.Control, optional
+        Control variates evaluated on the same paths
+
+    Returns
+    -------
+    dict
+        'price' (discounted mean payoff), 'std_error' (of the discounted
+        payoffs, meaningful for random points only), 'paths' (N) and
+        'chunk_size'; with controls, the price and standard error are
+        those of the control-variate estimate, and 'beta' holds the
+        estimated coefficients
+    """
+    if N < 1:
+        raise ValueError("N must be positive")
+
+    if m is None:
+        m = source.shape[1] if isinstance(source, np.ndarray) else source.dim
+
+    if chunk_size is None:
+        chunk_size = max_chunk_size(m, memory_budget)
+    chunk_size = min(chunk_size, N)
+
+    normal_buffer = np.empty((chunk_size, m))
+    path_buffer = np.empty((chunk_size, m + 1))
+
+    chunks = point_chunks(source, N, chunk_size)
+    chunks = normal_chunks(chunks, normal_buffer)
+    chunks = path_chunks(chunks, path_buffer, S0, r, delta, sigma, T, construction)
+
+    if controls:
+        stats = ControlVariateStats([control.mean for control in controls])
+    else:
+        stats = RunningStats()
+
+    for paths, valid in chunks:
+        samples = np.where(valid, payoff(paths), 0.0)
+        if controls:
+            stats.update(samples, evaluate(controls, paths))
+        else:
+            stats.update(samples)
+
+    discount = np.exp(-r * T)
+
+    result = {
+        'price': discount * stats.mean,
+        'std_error': discount * stats.std_error,
+        'paths': stats.count,
+        'chunk_size': chunk_size,
+    }
+    if controls:
+        # The controls are discounted and the payoffs are not
+        result['beta'] = discount * stats.beta
+
+    return result
+
+
+def max_chunk_size(m: int, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> int:
+    """
+    Largest chunk whose buffers fit in memory_budget bytes.
+
+    Each path needs its points, normals and prices (3m + 1 floats) plus
+    about as much again for the temporaries of the path construction
+    and the payoff.
+    """
+    bytes_per_path = 2 * 8 * (3 * m + 1)
+    return max(1, memory_budget // bytes_per_path)
+
+
+def optimal_chunk_size(m: int, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                       payoff=None, construction: str = "standard",
+                       trial_paths: int = None, rng: np.random.Generator = None) -> tuple:
+    """
+    Chunk size that maximizes pipeline throughput within a memory budget.
+
+    Powers of two from 256 paths up to ``max_chunk_size(m, memory_budget)``
+    are timed on the same random points; small chunks pay Python overhead
+    per chunk, large ones fall out of the CPU caches.
+
+    Parameters
+    ----------
+    m : int
+        Number of dates
+    memory_budget : int, default=256 MiB
+        Bytes available for the chunk buffers
+    payoff : callable, optional
+        Payoff to time; defaults to an at-the-money Asian call
+    construction : str, default="standard"
+        Path construction
+    trial_paths : int, optional
+        Paths simulated per candidate; defaults to twice the largest
+        candidate
+    rng : np.random.Generator, optional
+        Random generator for the trial points
+
+    Returns
+    -------
+    tuple
+        (best chunk size, dict mapping every candidate to its throughput
+        in paths per second)
+    """
+    largest = max_chunk_size(m, memory_budget)
+    candidates = [1 << k for k in range(8, largest.bit_length()) if 1 << k <= largest]
+    if not candidates:
+        candidates = [largest]
+
+    if payoff is None:
+        def payoff(S):
+            return np.maximum(np.mean(S[:, 1:], axis=1) - 100.0, 0)
+
+    if trial_paths is None:
+        trial_paths = 2 * candidates[-1]
+
+    points = np.random.default_rng(rng).random((trial_paths, m))
+    throughput = {}
+
+    for chunk_size in candidates:
+        start = time.perf_counter()
+        price_paths(payoff, points, trial_paths, 100.0, 0.05, 0.0, 0.2, 1.0,
+                    chunk_size=chunk_size, construction=construction)
+        throughput[chunk_size] = trial_paths / (time.perf_counter() - start)
+
+    best = max(throughput, key=throughput.get)
+
+    return best, throughput
@@ -5,16 +5,45 @@ This module implements pricing for:
 - European options (vanilla calls and puts)
 - Spread options
 - Asian options
-- Lookback options
+- Lookback options (fixed and floating strike)
+- Single and double barrier options
+- Basket options on correlated assets
 """
 
+from functools import lru_cache
+
 import numpy as np
-from scipy import stats
-from .simulation import qmc_to_normal, gbm_explicit
+from scipy import special
+from .analytical import kirk_spread
+from .control_variates import ControlVariateStats, evaluate
+from .importance_sampling import likelihood_ratio, optimal_drift, shift
+from .inverse_normal import norm_ppf
+from .pipeline import RunningStats, point_chunks
+from .simulation import qmc_to_normal, gbm_paths, multi_asset_paths
+
+
+# Number of path values simulated at once by the chunked pricers
+_CHUNK_ELEMENTS = 1 << 22
+
+_LOOKBACK_OPTIONS = ("fixed_call", "fixed_put", "floating_call", "floating_put")
+
+# Truncation of the normal integral of spread_option_quadrature, and the
+# grid and bisection steps locating the bends of its integrand
+_QUADRATURE_TAIL = 9.0
+_KINK_GRID = 257
+_KINK_BISECTIONS = 50
+
+# Broadie-Glasserman-Kou constant -zeta(1/2) / sqrt(2 pi)
+_BGK_BETA = 0.5825971579390106
+
+# Terms n = -_BRIDGE_TERMS..._BRIDGE_TERMS of the double-barrier bridge series
+_BRIDGE_TERMS = 3
 
 
 def european_call_mc(S0: float, K: float, r: float, delta: float,
-                     sigma: float, T: float, points: np.ndarray) -> float:
+                     sigma: float, T: float, points: np.ndarray,
+                     antithetic: bool = False, return_se: bool = False,
+                     controls: list = None, drift=None):
     """
     Price European call option using Monte Carlo/QMC.
 
@@ -34,43 +63,89 @@ def european_call_mc(S0: float, K: float, r: float, delta: float,
         Time to maturity
     points : np.ndarray
         Array of points in [0,1) for MC/QMC integration
+    antithetic : bool, default=False
+        Also price the mirrored sample (normals -Z, i.e. points 1-u) in the
+        same pass and average each pair
+    return_se : bool, default=False
+        Also return the standard error, computed from the pair averages
+        when antithetic is True
+    controls : list of control_variates.Control, optional
+        Control variates evaluated on the same paths. The price is then the
+        control-variate estimate with coefficients estimated from the paths.
+    drift : "optimal" or np.ndarray, optional
+        Importance sampling: mean shift of the driving normals, one value
+        per dimension of the points, or "optimal" to compute it once per
+        contract (``importance_sampling.optimal_drift``). The payoffs are
+        weighted by the likelihood ratio.
 
     Returns
     -------
-    float
-        Call option price
+    float or tuple
+        Call option price, or (price, standard error) if return_se is True
     """
-    N = len(points)
-    payoffs = np.zeros(N)
+    points = np.asarray(points)
+    valid = points > 0
 
-    for i in range(N):
-        if points[i] > 0:
-            Z = stats.norm.ppf(points[i])
-            ST = S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
-            payoffs[i] = max(ST - K, 0)
+    Z = _antithetic_normals(qmc_to_normal(points), antithetic)
 
-    return np.exp(-r * T) * np.mean(payoffs)
+    drift = _resolve_drift(drift, "european", S0, K, r, delta, sigma, T, 1)
+    weights = None
+    if drift is not None:
+        Z = shift(Z, drift[0])
+        weights = likelihood_ratio(Z, drift)
 
+    ST = _terminal_price(S0, r, delta, sigma, T, Z)
 
-def spread_option(points: np.ndarray, w1: float, w2: float, r: float, K: float,
+    valid = _tile(valid, antithetic)
+    payoffs = np.where(valid, np.maximum(ST - K, 0), 0.0)
+
+    # Two-date paths (S0, S_T) for the controls
+    paths = np.column_stack([np.full(len(ST), float(S0)), ST]) if controls else None
+
+    return _estimate(payoffs, np.exp(-r * T), antithetic, return_se, controls, paths,
+                     weights, valid)
+
+
+def spread_option(points: np.ndarray, w1, w2, r: float, K,
                   S10: float, S20: float, delta1: float, delta2: float,
-                  sigma1: float, sigma2: float, rho12: float, T: float) -> float:
+                  sigma1: float, sigma2: float, rho12, T: float,
+                  antithetic: bool = False, return_se: bool = False,
+                  control: str = None):
     """
-    Price spread option using QMC: max(w1*S1 - w2*S2 - K, 0).
+    Price spread option using QMC: max(w2*S2 - w1*S1 - K, 0).
+
+    Uses importance sampling with conditional distribution. See
+    ``spread_option_quadrature`` for the deterministic evaluation of the
+    same conditional integral.
 
-    Uses importance sampling with conditional distribution.
+    The strike, the weights and the correlation may be arrays: they are
+    broadcast against each other and a whole ladder of contracts is priced
+    in one pass over the points, sharing the inverse normal CDF of u1.
+    The points are processed in chunks so that the work arrays stay
+    bounded for large ladders.
+
+    With control="kirk", Kirk's approximation serves as a control variate.
+    Kirk's price is exactly the value of the exchange option between w2*S2
+    and the lognormal proxy Y = (F1 + K) * exp(b*c11*z1 - b^2*c11^2/2) of
+    the short leg plus the strike, F1 being the forward of w1*S1 and
+    b = F1/(F1 + K). That option is sampled on every point with the same
+    conditional scheme and the same uniforms as the spread, Y taking the
+    place of w1*S1 + K, so the two samples are highly correlated, and its
+    mean is ``analytical.kirk_spread``. The coefficient is estimated per
+    contract from the same points; contracts with F1 + K <= 0 get no
+    control.
 
     Parameters
     ----------
     points : np.ndarray
         Array of shape (N, 2) with QMC points in [0,1)^2
-    w1 : float
+    w1 : float or np.ndarray
         Weight of first underlying
-    w2 : float
+    w2 : float or np.ndarray
         Weight of second underlying
     r : float
         Risk-free interest rate
-    K : float
+    K : float or np.ndarray
         Strike price
     S10 : float
         Initial price of first underlying
@@ -84,18 +159,37 @@ def spread_option(points: np.ndarray, w1: float, w2: float, r: float, K: float,
         Volatility of first underlying
     sigma2 : float
         Volatility of second underlying
-    rho12 : float
+    rho12 : float or np.ndarray
         Correlation between underlyings
     T : float
         Time to maturity
+    antithetic : bool, default=False
+        Also price the mirrored sample (normals -Z, i.e. points 1-u) in the
+        same pass and average each pair
+    return_se : bool, default=False
+        Also return the standard error, computed from the pair averages
+        when antithetic is True
+    control : str, optional
+        None for the plain estimate, or "kirk" to use Kirk's approximation
+        as a control variate
 
     Returns
     -------
-    float
-        Spread option price
+    float, np.ndarray or tuple
+        Spread option price, an array of the broadcast shape of K, w1, w2
+        and rho12 if any is an array, or (price, standard error) if
+        return_se is True
     """
-    N = len(points)
-    value = 0.0
+    if control not in (None, "kirk"):
+        raise ValueError(f"Unknown control '{control}', expected None or 'kirk'")
+
+    points = np.asarray(points)
+    u1, u2 = points[:, 0], points[:, 1]
+
+    params = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (w1, w2, K, rho12)))
+    shape = params[0].shape
+    # Contracts along the leading axes, points along the last one
+    w1, w2, K, rho12 = (x[..., None] for x in params)
 
     # Drift-adjusted means
     mu1T = np.log(S10) + (r - delta1 - 0.5 * sigma1 ** 2) * T
@@ -106,29 +200,253 @@ def spread_option(points: np.ndarray, w1: float, w2: float, r: float, K: float,
     c21 = rho12 * sigma2 * np.sqrt(T)
     c22 = np.sqrt(1 - rho12 ** 2) * sigma2 * np.sqrt(T)
 
-    for i in range(N):
-        u1, u2 = points[i, 0], points[i, 1]
+    # Shared by every contract of the batch
+    inv_u1 = norm_ppf(u1)
+
+    def values(z1, u2, valid, strike=None):
+        # Rows failing the safety criteria produce infinities, masked below
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            if strike is None:
+                strike = w1 * np.exp(c11 * z1 + mu1T) + K
+
+            # Probability that the second asset ends in the money, given the
+            # first; a nonpositive strike is always exercised
+            g = (np.log(strike) - np.log(w2) - mu2T - c21 * z1) / c22
+            d2 = np.where(strike > 0, special.ndtr(g), 0.0)
+
+            # Safety criteria
+            v = d2 + u2 * (1 - d2)
+            valid = valid & (v < 1)
+
+            h5 = norm_ppf(np.where(valid, v, 0.5))
+            h4 = c21 * z1 + c22 * h5 + mu2T
+            h2 = w2 * np.exp(h4)
+            h = h2 - strike
+
+        return np.where(valid, (1 - d2) * h, 0.0)
+
+    discount = np.exp(-r * T)
+
+    if control == "kirk":
+        forward1 = w1 * np.exp(mu1T + 0.5 * c11 ** 2)
+        proxy = forward1 + K
+        usable = proxy > 0
+        proxy = np.where(usable, proxy, 1.0)
+        b = forward1 / proxy
+
+        def control_values(z1, u2, valid):
+            strike = proxy * np.exp(b * c11 * z1 - 0.5 * (b * c11) ** 2)
+            return np.where(usable, values(z1, u2, valid, strike), 0.0)
+
+        kirk = kirk_spread(S10, S20, params[2], r, delta1, delta2, sigma1, sigma2,
+                           params[3], T, params[0], params[1])
+        means = np.where(usable[..., 0], kirk / discount, 0.0)
+        running = ControlVariateStats(means[..., None])
+    else:
+        running = RunningStats()
+
+    rows = max(1, _CHUNK_ELEMENTS // max(1, int(np.prod(shape))))
+
+    for start in range(0, len(points), rows):
+        chunk = slice(start, start + rows)
+        valid = u1[chunk] > 0
+        sample = values(inv_u1[chunk], u2[chunk], valid)
+        if antithetic:
+            # The mirrored sample uses -Z1 and 1 - u2
+            mirrored = values(-inv_u1[chunk], 1 - u2[chunk], valid)
+            sample = 0.5 * (sample + mirrored)
+
+        if control == "kirk":
+            controls = control_values(inv_u1[chunk], u2[chunk], valid)
+            if antithetic:
+                mirrored = control_values(-inv_u1[chunk], 1 - u2[chunk], valid)
+                controls = 0.5 * (controls + mirrored)
+            running.update(sample, controls)
+        else:
+            running.update(sample, axis=-1)
+
+    price = discount * running.mean
+    std_error = discount * running.std_error
+
+    if shape == ():
+        price, std_error = float(price), float(std_error)
+
+    return (price, std_error) if return_se else price
+
+
+def spread_option_quadrature(w1, w2, r: float, K, S10: float, S20: float,
+                             delta1: float, delta2: float, sigma1: float, sigma2: float,
+                             rho12, T: float, tol: float = 1e-10,
+                             max_order: int = 256) -> tuple:
+    """
+    Price spread option max(w2*S2 - w1*S1 - K, 0) by Gauss-Legendre quadrature.
+
+    As in ``spread_option``, the second asset is integrated out
+    analytically given the first one: conditionally on the normal z1 of
+    S1, log S2 is normal with mean mu = mu2T + c21*z1 and deviation c22,
+    so the payoff has the Black-Scholes expectation
+
+        w2 * exp(mu + c22^2/2) * N(c22 - g) - (h1 + K) * N(-g),
+        g = (log((h1 + K)/w2) - mu) / c22,    h1 = w1 * S1.
+
+    What remains is a one-dimensional integral over z1 ~ N(0, 1). Its
+    integrand is smooth but bends sharply where g changes sign when the
+    correlation is close to +/-1, so the integration interval (truncated
+    where the Gaussian tail is negligible) is split at the at most two
+    roots of g, located by bisection. Each piece gets a Gauss-Legendre rule
+    of order 8, 16, ... until two successive orders agree within tol. The
+    node and weight tables are cached by order. K, the weights and the
+    correlation broadcast as in ``spread_option``.
+
+    Parameters
+    ----------
+    w1 : float or np.ndarray
+        Weight of first underlying
+    w2 : float or np.ndarray
+        Weight of second underlying
+    r : float
+        Risk-free interest rate
+    K : float or np.ndarray
+        Strike price
+    S10 : float
+        Initial price of first underlying
+    S20 : float
+        Initial price of second underlying
+    delta1 : float
+        Dividend yield of first underlying
+    delta2 : float
+        Dividend yield of second underlying
+    sigma1 : float
+        Volatility of first underlying
+    sigma2 : float
+        Volatility of second underlying
+    rho12 : float or np.ndarray
+        Correlation between underlyings
+    T : float
+        Time to maturity
+    tol : float, default=1e-10
+        Absolute accuracy target of the price
+    max_order : int, default=256
+        Largest quadrature order per piece
+
+    Returns
+    -------
+    tuple
+        (price, error estimate), the difference between the last two
+        orders; floats, or arrays of the broadcast shape of K, w1, w2 and
+        rho12
+    """
+    params = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (w1, w2, K, rho12)))
+    shape = params[0].shape
+    w1, w2, K, rho12 = (x[..., None] for x in params)
+
+    mu1T = np.log(S10) + (r - delta1 - 0.5 * sigma1 ** 2) * T
+    mu2T = np.log(S20) + (r - delta2 - 0.5 * sigma2 ** 2) * T
+
+    c11 = sigma1 * np.sqrt(T)
+    c21 = rho12 * sigma2 * np.sqrt(T)
+    c22 = np.sqrt(1 - rho12 ** 2) * sigma2 * np.sqrt(T)
+
+    def moneyness(z1):
+        # g * c22: negative where the conditional option is in the money
+        strike = w1 * np.exp(c11 * z1 + mu1T) + K
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(strike > 0, np.log(strike / w2), -np.inf) - mu2T - c21 * z1
+
+    def integrand(z1):
+        strike = w1 * np.exp(c11 * z1 + mu1T) + K
+        mean = mu2T + c21 * z1
+        forward = w2 * np.exp(mean + 0.5 * c22 ** 2)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            g = (np.log(strike / w2) - mean) / c22
+            black = forward * special.ndtr(c22 - g) - strike * special.ndtr(-g)
+
+        # Perfect correlation leaves no conditional randomness, and a
+        # negative strike is always exercised
+        degenerate = np.maximum(w2 * np.exp(mean) - strike, 0)
+        value = np.where(c22 > 0, black, degenerate)
+        value = np.where(strike > 0, value, forward - strike)
+
+        return value * np.exp(-0.5 * z1 ** 2) / np.sqrt(2 * np.pi)
+
+    # Beyond +/-(9 + slope) the Gaussian tail is below 1e-17 of the price
+    bound = _QUADRATURE_TAIL + max(c11, np.max(np.abs(c21)))
+    edges = np.broadcast_to(
+        np.concatenate([np.full(shape + (1,), -bound),
+                        _kinks(moneyness, shape, bound),
+                        np.full(shape + (1,), bound)], axis=-1),
+        shape + (4,))
+    lower, upper = edges[..., :-1, None], edges[..., 1:, None]
+
+    order = 8
+    previous = None
+    while True:
+        nodes, weights = _legendre_rule(order)
+        half = 0.5 * (upper - lower)
+        z1 = (0.5 * (upper + lower) + half * nodes).reshape(shape + (-1,))
+        values = integrand(z1).reshape(shape + (3, order))
+        price = np.sum(half[..., 0] * (values @ weights), axis=-1)
+        if previous is not None:
+            error = np.abs(price - previous)
+            if np.all(error <= tol) or 2 * order > max_order:
+                break
+        previous = price
+        order *= 2
+
+    discount = np.exp(-r * T)
+    price, error = discount * price, discount * error
+
+    if shape == ():
+        price, error = float(price), float(error)
+
+    return price, error
+
+
+def _kinks(moneyness, shape: tuple, bound: float) -> np.ndarray:
+    """
+    The at most two roots of the convex moneyness function in [-bound, bound].
+
+    Sign changes are bracketed on a grid and refined by bisection, all
+    contracts at once. Missing roots repeat the other root (or 0), which
+    gives empty pieces.
+    """
+    grid = np.linspace(-bound, bound, _KINK_GRID)
+    signs = moneyness(grid) > 0
+    signs = np.broadcast_to(signs, shape + (_KINK_GRID,))
+    change = signs[..., 1:] != signs[..., :-1]
+
+    has_root = np.any(change, axis=-1)
+    first = np.argmax(change, axis=-1)
+    last = _KINK_GRID - 2 - np.argmax(change[..., ::-1], axis=-1)
 
-        if u1 > 0:  # Safety criterion
-            inv_u1 = stats.norm.ppf(u1)
-            h3 = c11 * inv_u1 + mu1T
-            h1 = w1 * np.exp(h3)
+    roots = []
+    for index in (first, last):
+        a, b = grid[index], grid[index + 1]
+        sign_a = np.take_along_axis(signs, index[..., None], axis=-1)[..., 0]
+        for _ in range(_KINK_BISECTIONS):
+            middle = 0.5 * (a + b)
+            same = (moneyness(middle[..., None])[..., 0] > 0) == sign_a
+            a, b = np.where(same, middle, a), np.where(same, b, middle)
+        roots.append(np.where(has_root, 0.5 * (a + b), 0.0))
 
-            g = (np.log(h1 + K) - np.log(w2) - mu2T - c21 * inv_u1) / c22
-            d2 = stats.norm.cdf(g)
+    return np.stack(roots, axis=-1)
 
-            if (d2 + u2 * (1 - d2)) < 1:  # Safety criterion
-                h5 = stats.norm.ppf(d2 + u2 * (1 - d2))
-                h4 = c21 * inv_u1 + c22 * h5 + mu2T
-                h2 = w2 * np.exp(h4)
-                h = h2 - h1 - K
-                value += (1 - d2) * h
 
-    return np.exp(-r * T) * value / N
+@lru_cache(maxsize=None)
+def _legendre_rule(order: int) -> tuple:
+    """Gauss-Legendre nodes and weights on [-1, 1], read-only."""
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    nodes.flags.writeable = False
+    weights.flags.writeable = False
+    return nodes, weights
 
 
 def asian_call(S0: float, K: float, r: float, delta: float, sigma: float,
-               m: int, T: float, points: np.ndarray) -> float:
+               m: int, T: float, points: np.ndarray,
+               construction: str = "standard", antithetic: bool = False,
+               return_se: bool = False, controls: list = None,
+               drift=None):
     """
     Price arithmetic average Asian call option.
 
@@ -152,33 +470,45 @@ def asian_call(S0: float, K: float, r: float, delta: float, sigma: float,
         Time to maturity
     points : np.ndarray
         Array of shape (N, m) with QMC points in [0,1)^m
+    construction : str, default="standard"
+        Path construction from the points: "standard", "bridge"
+        (Brownian bridge), "pca" or "pca_fft" (principal components),
+        see ``simulation.brownian_motion``
+    antithetic : bool, default=False
+        Also price the mirrored sample (normals -Z, i.e. points 1-u) in the
+        same pass and average each pair
+    return_se : bool, default=False
+        Also return the standard error, computed from the pair averages
+        when antithetic is True
+    controls : list of control_variates.Control, optional
+        Control variates evaluated on the same paths. The price is then the
+        control-variate estimate with coefficients estimated from the paths.
+    drift : "optimal" or np.ndarray, optional
+        Importance sampling: mean shift of the driving normals, one value
+        per dimension of the points, or "optimal" to compute it once per
+        contract (``importance_sampling.optimal_drift``). The payoffs are
+        weighted by the likelihood ratio.
 
     Returns
     -------
-    float
-        Asian call option price
+    float or tuple
+        Asian call option price, or (price, standard error) if return_se is True
     """
-    N = len(points)
-    payoffs = np.zeros(N)
-
-    for i in range(N):
-        # Check if all points are positive (safety)
-        if np.all(points[i, :] > 0):
-            Z = qmc_to_normal(points[i, :])
+    drift = _resolve_drift(drift, "asian", S0, K, r, delta, sigma, T, m, construction)
+    prices, valid, weights = _price_paths(S0, r, delta, sigma, T, points, construction,
+                                          antithetic, drift)
 
-            # Generate price path
-            prices = np.zeros(m)
-            for j in range(m):
-                prices[j] = gbm_explicit(S0, r, sigma, delta, j + 1, T, Z)
+    payoffs = np.where(valid, np.maximum(_intrinsic("asian", prices, K, m), 0), 0.0)
 
-            avg_price = np.mean(prices)
-            payoffs[i] = max(avg_price - K, 0)
-
-    return np.exp(-r * T) * np.mean(payoffs)
+    return _estimate(payoffs, np.exp(-r * T), antithetic, return_se, controls, prices,
+                     weights, valid)
 
 
 def lookback_call(S0: float, K: float, r: float, delta: float, sigma: float,
-                  T: float, points: np.ndarray) -> float:
+                  T: float, points: np.ndarray,
+                  construction: str = "standard", antithetic: bool = False,
+                  return_se: bool = False, controls: list = None,
+                  drift=None, correction: str = None):
     """
     Price discrete lookback call option.
 
@@ -200,37 +530,55 @@ def lookback_call(S0: float, K: float, r: float, delta: float, sigma: float,
         Time to maturity
     points : np.ndarray
         Array of shape (N, m) with QMC points in [0,1)^m
+    construction : str, default="standard"
+        Path construction from the points: "standard", "bridge"
+        (Brownian bridge), "pca" or "pca_fft" (principal components),
+        see ``simulation.brownian_motion``
+    antithetic : bool, default=False
+        Also price the mirrored sample (normals -Z, i.e. points 1-u) in the
+        same pass and average each pair
+    return_se : bool, default=False
+        Also return the standard error, computed from the pair averages
+        when antithetic is True
+    controls : list of control_variates.Control, optional
+        Control variates evaluated on the same paths. The price is then the
+        control-variate estimate with coefficients estimated from the paths.
+    drift : "optimal" or np.ndarray, optional
+        Importance sampling: mean shift of the driving normals, one value
+        per dimension of the points, or "optimal" to compute it once per
+        contract (``importance_sampling.optimal_drift``). The payoffs are
+        weighted by the likelihood ratio.
+    correction : str, optional
+        None prices the contract monitored at the m dates. "bgk" prices the
+        continuously monitored contract with the Broadie-Glasserman-Kou
+        shift of the extremum by exp(+/-0.5826 * sigma * sqrt(T/m)).
 
     Returns
     -------
-    float
-        Lookback call option price
+    float or tuple
+        Lookback call option price, or (price, standard error) if return_se is True
     """
-    N, m = points.shape
-    payoffs = np.zeros(N)
-    dt = T / m
+    drift = _resolve_drift(drift, "lookback_call", S0, K, r, delta, sigma, T,
+                           np.shape(points)[1], construction)
+    log_prices, valid, weights = _price_paths(S0, r, delta, sigma, T, points, construction,
+                                              antithetic, drift, log=True)
 
-    for i in range(N):
-        if np.all(points[i, :] > 0):
-            Z = qmc_to_normal(points[i, :])
+    # Extremum in log space, only its value is exponentiated
+    shift = _bgk_shift(correction, sigma, T, log_prices.shape[1] - 1)
+    max_price = np.exp(np.max(log_prices, axis=1) + shift)
+    payoffs = np.where(valid, np.maximum(max_price - K, 0), 0.0)
 
-            # Generate price path
-            prices = np.zeros(m + 1)
-            prices[0] = S0
+    prices = np.exp(log_prices) if controls else None
 
-            for j in range(m):
-                aux1 = np.exp((r - delta - 0.5 * sigma ** 2) * dt)
-                aux2 = np.exp(sigma * np.sqrt(dt) * Z[j])
-                prices[j + 1] = prices[j] * aux1 * aux2
-
-            max_price = np.max(prices)
-            payoffs[i] = max(max_price - K, 0)
-
-    return np.exp(-r * T) * np.mean(payoffs)
+    return _estimate(payoffs, np.exp(-r * T), antithetic, return_se, controls, prices,
+                     weights, valid)
 
 
 def lookback_put(S0: float, K: float, r: float, delta: float, sigma: float,
-                 T: float, points: np.ndarray) -> float:
+                 T: float, points: np.ndarray,
+                 construction: str = "standard", antithetic: bool = False,
+                 return_se: bool = False, controls: list = None,
+                 drift=None, correction: str = None):
     """
     Price discrete lookback put option.
 
@@ -252,35 +600,516 @@ def lookback_put(S0: float, K: float, r: float, delta: float, sigma: float,
         Time to maturity
     points : np.ndarray
         Array of shape (N, m) with QMC points in [0,1)^m
+    construction : str, default="standard"
+        Path construction from the points: "standard", "bridge"
+        (Brownian bridge), "pca" or "pca_fft" (principal components),
+        see ``simulation.brownian_motion``
+    antithetic : bool, default=False
+        Also price the mirrored sample (normals -Z, i.e. points 1-u) in the
+        same pass and average each pair
+    return_se : bool, default=False
+        Also return the standard error, computed from the pair averages
+        when antithetic is True
+    controls : list of control_variates.Control, optional
+        Control variates evaluated on the same paths. The price is then the
+        control-variate estimate with coefficients estimated from the paths.
+    drift : "optimal" or np.ndarray, optional
+        Importance sampling: mean shift of the driving normals, one value
+        per dimension of the points, or "optimal" to compute it once per
+        contract (``importance_sampling.optimal_drift``). The payoffs are
+        weighted by the likelihood ratio.
+    correction : str, optional
+        None prices the contract monitored at the m dates. "bgk" prices the
+        continuously monitored contract with the Broadie-Glasserman-Kou
+        shift of the extremum by exp(+/-0.5826 * sigma * sqrt(T/m)).
 
     Returns
     -------
-    float
-        Lookback put option price
+    float or tuple
+        Lookback put option price, or (price, standard error) if return_se is True
+    """
+    drift = _resolve_drift(drift, "lookback_put", S0, K, r, delta, sigma, T,
+                           np.shape(points)[1], construction)
+    log_prices, valid, weights = _price_paths(S0, r, delta, sigma, T, points, construction,
+                                              antithetic, drift, log=True)
+
+    # Extremum in log space, only its value is exponentiated
+    shift = _bgk_shift(correction, sigma, T, log_prices.shape[1] - 1)
+    min_price = np.exp(np.min(log_prices, axis=1) - shift)
+    payoffs = np.where(valid, np.maximum(K - min_price, 0), 0.0)
+
+    prices = np.exp(log_prices) if controls else None
+
+    return _estimate(payoffs, np.exp(-r * T), antithetic, return_se, controls, prices,
+                     weights, valid)
+
+
+def lookback_options(S0: float, K: float, r: float, delta: float, sigma: float,
+                     T: float, points, N: int = None, construction: str = "standard",
+                     chunk_size: int = None, return_se: bool = False,
+                     correction: str = None) -> dict:
+    """
+    Price fixed- and floating-strike lookback calls and puts in one pass.
+
+    Payoffs, with max and min over S_0, S_1, ..., S_m:
+    - fixed_call: max(max S - K, 0)
+    - fixed_put: max(K - min S, 0)
+    - floating_call: S_m - min S
+    - floating_put: max S - S_m
+
+    The paths are simulated chunk by chunk in log space, into buffers
+    reused for every chunk. The row-wise maximum, minimum and last value
+    of the log-paths are taken directly, and only these three numbers per
+    path are exponentiated. Memory is set by the chunk size, not by N.
+
+    Parameters
+    ----------
+    S0 : float
+        Initial stock price
+    K : float
+        Strike price of the fixed-strike options
+    r : float
+        Risk-free interest rate
+    delta : float
+        Dividend yield
+    sigma : float
+        Volatility
+    T : float
+        Time to maturity
+    points : np.ndarray or generators.PointStream
+        Array of shape (N, m) with QMC points in [0,1)^m, or a stream of
+        m-dimensional points
+    N : int, optional
+        Number of paths; defaults to len(points), required for a stream
+    construction : str, default="standard"
+        Path construction (see ``simulation.brownian_motion``)
+    chunk_size : int, optional
+        Paths per chunk; by default about 2^22 path values per chunk
+    return_se : bool, default=False
+        Return (price, standard error) pairs instead of prices
+    correction : str, optional
+        None prices the contract monitored at the m dates. "bgk" prices the
+        continuously monitored contract with the Broadie-Glasserman-Kou
+        shift of the extrema by exp(+/-0.5826 * sigma * sqrt(T/m)).
+
+    Returns
+    -------
+    dict
+        Prices (or pairs) keyed by 'fixed_call', 'fixed_put',
+        'floating_call' and 'floating_put'
+    """
+    if isinstance(points, np.ndarray):
+        N = len(points) if N is None else N
+        m = points.shape[1]
+    else:
+        if N is None:
+            raise ValueError("N is required when points is a stream")
+        m = points.dim
+
+    if chunk_size is None:
+        chunk_size = max(1, _CHUNK_ELEMENTS // (m + 1))
+    chunk_size = min(chunk_size, N)
+
+    shift = _bgk_shift(correction, sigma, T, m)
+
+    normals = np.empty((chunk_size, m))
+    log_paths = np.empty((chunk_size, m + 1))
+    results = {name: RunningStats() for name in _LOOKBACK_OPTIONS}
+
+    for chunk in point_chunks(points, N, chunk_size):
+        n = len(chunk)
+        Z, paths = normals[:n], log_paths[:n]
+
+        np.clip(chunk, 1e-10, 1 - 1e-10, out=Z)
+        norm_ppf(Z, out=Z)
+        gbm_paths(S0, r, delta, sigma, T, Z, log=True, out=paths, construction=construction)
+
+        valid = np.all(chunk > 0, axis=1)
+        max_price = np.exp(np.max(paths, axis=1) + shift)
+        min_price = np.exp(np.min(paths, axis=1) - shift)
+        last_price = np.exp(paths[:, -1])
+
+        payoffs = {
+            'fixed_call': np.maximum(max_price - K, 0),
+            'fixed_put': np.maximum(K - min_price, 0),
+            'floating_call': last_price - min_price,
+            'floating_put': max_price - last_price,
+        }
+        for name, values in payoffs.items():
+            results[name].update(np.where(valid, values, 0.0))
+
+    discount = np.exp(-r * T)
+    if return_se:
+        return {name: (discount * running.mean, discount * running.std_error)
+                for name, running in results.items()}
+
+    return {name: discount * running.mean for name, running in results.items()}
+
+
+def barrier_call(S0: float, K: float, r: float, delta: float, sigma: float,
+                 T: float, points: np.ndarray, lower: float = None,
+                 upper: float = None, knock: str = "out", correction: str = None,
+                 construction: str = "standard", return_se: bool = False):
+    """
+    Price a single or double barrier call option.
+
+    Payoff: max(S_T - K, 0) if the price stays strictly between the
+    barriers (knock-out), or if it reaches one of them (knock-in).
+
+    Parameters
+    ----------
+    S0 : float
+        Initial stock price
+    K : float
+        Strike price
+    r : float
+        Risk-free interest rate
+    delta : float
+        Dividend yield
+    sigma : float
+        Volatility
+    T : float
+        Time to maturity
+    points : np.ndarray
+        Array of shape (N, m) with QMC points in [0,1)^m, one dimension
+        per monitoring date
+    lower : float, optional
+        Lower barrier (down-and-out/in); None for no lower barrier
+    upper : float, optional
+        Upper barrier (up-and-out/in); None for no upper barrier
+    knock : str, default="out"
+        "out" or "in"
+    correction : str, optional
+        None monitors the barriers at the m dates only. For continuously
+        monitored barriers, "bgk" shifts them towards the spot by
+        exp(0.5826 * sigma * sqrt(T/m)) (Broadie-Glasserman-Kou) and
+        "bridge" weights each path by the Brownian-bridge probability of
+        not crossing them between consecutive dates.
+    construction : str, default="standard"
+        Path construction (see ``simulation.brownian_motion``)
+    return_se : bool, default=False
+        Also return the standard error
+
+    Returns
+    -------
+    float or tuple
+        Barrier option price, or (price, standard error) if return_se is True
+    """
+    if knock not in ("out", "in"):
+        raise ValueError(f"Unknown knock '{knock}', expected 'out' or 'in'")
+
+    log_prices, valid, _ = _price_paths(S0, r, delta, sigma, T, points, construction,
+                                        log=True)
+    survival = _barrier_survival(log_prices, lower, upper, sigma, T, correction)
+    weights = survival if knock == "out" else 1 - survival
+
+    ST = np.exp(log_prices[:, -1])
+    payoffs = np.where(valid, np.maximum(ST - K, 0) * weights, 0.0)
+
+    return _estimate(payoffs, np.exp(-r * T), False, return_se)
+
+
+def barrier_put(S0: float, K: float, r: float, delta: float, sigma: float,
+                T: float, points: np.ndarray, lower: float = None,
+                upper: float = None, knock: str = "out", correction: str = None,
+                construction: str = "standard", return_se: bool = False):
+    """
+    Price a single or double barrier put option.
+
+    Payoff: max(K - S_T, 0) if the price stays strictly between the
+    barriers (knock-out), or if it reaches one of them (knock-in).
+
+    Parameters
+    ----------
+    S0 : float
+        Initial stock price
+    K : float
+        Strike price
+    r : float
+        Risk-free interest rate
+    delta : float
+        Dividend yield
+    sigma : float
+        Volatility
+    T : float
+        Time to maturity
+    points : np.ndarray
+        Array of shape (N, m) with QMC points in [0,1)^m, one dimension
+        per monitoring date
+    lower : float, optional
+        Lower barrier (down-and-out/in); None for no lower barrier
+    upper : float, optional
+        Upper barrier (up-and-out/in); None for no upper barrier
+    knock : str, default="out"
+        "out" or "in"
+    correction : str, optional
+        None monitors the barriers at the m dates only. For continuously
+        monitored barriers, "bgk" shifts them towards the spot by
+        exp(0.5826 * sigma * sqrt(T/m)) (Broadie-Glasserman-Kou) and
+        "bridge" weights each path by the Brownian-bridge probability of
+        not crossing them between consecutive dates.
+    construction : str, default="standard"
+        Path construction (see ``simulation.brownian_motion``)
+    return_se : bool, default=False
+        Also return the standard error
+
+    Returns
+    -------
+    float or tuple
+        Barrier option price, or (price, standard error) if return_se is True
+    """
+    if knock not in ("out", "in"):
+        raise ValueError(f"Unknown knock '{knock}', expected 'out' or 'in'")
+
+    log_prices, valid, _ = _price_paths(S0, r, delta, sigma, T, points, construction,
+                                        log=True)
+    survival = _barrier_survival(log_prices, lower, upper, sigma, T, correction)
+    weights = survival if knock == "out" else 1 - survival
+
+    ST = np.exp(log_prices[:, -1])
+    payoffs = np.where(valid, np.maximum(K - ST, 0) * weights, 0.0)
+
+    return _estimate(payoffs, np.exp(-r * T), False, return_se)
+
+
+def basket_call(S0, K: float, r: float, delta, sigma, corr: np.ndarray,
+                weights, T: float, points: np.ndarray, m: int = 1,
+                construction: str = "standard",
+                factorization: str = "cholesky") -> float:
     """
-    N, m = points.shape
-    payoffs = np.zeros(N)
-    dt = T / m
+    Price arithmetic basket call option on d correlated assets.
+
+    Payoff: max(sum_j w_j * A_j - K, 0), where A_j is the average price of
+    asset j over the m monitoring dates (its terminal price for m=1)
 
-    for i in range(N):
-        if np.all(points[i, :] > 0):
-            Z = qmc_to_normal(points[i, :])
+    Parameters
+    ----------
+    S0 : float or np.ndarray
+        Initial prices, scalar or of length d
+    K : float
+        Strike price
+    r : float
+        Risk-free interest rate
+    delta : float or np.ndarray
+        Dividend yields, scalar or of length d
+    sigma : float or np.ndarray
+        Volatilities, scalar or of length d
+    corr : np.ndarray
+        (d, d) correlation matrix
+    weights : np.ndarray
+        Basket weights of length d
+    T : float
+        Time to maturity
+    points : np.ndarray
+        Array of shape (N, m*d) with QMC points in [0,1)^(m*d); column
+        k*d + j drives asset j at step k
+    m : int, default=1
+        Number of monitoring dates
+    construction : str, default="standard"
+        Path construction in time (see ``simulation.brownian_motion``)
+    factorization : str, default="cholesky"
+        Factor of corr, "cholesky" or "eigen"
+        (see ``simulation.correlation_factor``)
 
-            # Generate price path
-            prices = np.zeros(m + 1)
-            prices[0] = S0
+    Returns
+    -------
+    float
+        Basket call option price
+    """
+    points = np.asarray(points)
+    valid = np.all(points > 0, axis=1)
 
-            for j in range(m):
-                aux1 = np.exp((r - delta - 0.5 * sigma ** 2) * dt)
-                aux2 = np.exp(sigma * np.sqrt(dt) * Z[j])
-                prices[j + 1] = prices[j] * aux1 * aux2
+    prices = multi_asset_paths(S0, r, delta, sigma, corr, T, qmc_to_normal(points), m=m,
+                               construction=construction, factorization=factorization)
 
-            min_price = np.min(prices)
-            payoffs[i] = max(K - min_price, 0)
+    basket = np.mean(prices, axis=2) @ np.asarray(weights, dtype=float)
+    payoffs = np.where(valid, np.maximum(basket - K, 0), 0.0)
 
     return np.exp(-r * T) * np.mean(payoffs)
 
 
+def _price_paths(S0: float, r: float, delta: float, sigma: float, T: float,
+                 points: np.ndarray, construction: str = "standard",
+                 antithetic: bool = False, drift: np.ndarray = None,
+                 log: bool = False) -> tuple:
+    """
+    GBM price matrix of shape (N, m+1) driven by QMC points of shape (N, m).
+
+    Also returns the mask of the rows without zero coordinates; the other
+    rows get a zero payoff, as a safety against infinite normals. With
+    antithetic, the N mirrored paths (normals -Z) follow the N original
+    ones. With a drift, the normals are shifted by it and the likelihood
+    ratios are returned as the third element (None otherwise). With log,
+    the matrix holds log-prices.
+    """
+    points = np.asarray(points)
+    valid = np.all(points > 0, axis=1)
+
+    Z = _antithetic_normals(qmc_to_normal(points), antithetic)
+
+    weights = None
+    if drift is not None:
+        Z = shift(Z, drift)
+        weights = likelihood_ratio(Z, drift)
+
+    prices = gbm_paths(S0, r, delta, sigma, T, Z, log=log, construction=construction)
+
+    return prices, _tile(valid, antithetic), weights
+
+
+def _terminal_price(S0: float, r: float, delta: float, sigma: float, T: float,
+                    Z: np.ndarray) -> np.ndarray:
+    return S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
+
+
+def _intrinsic(kind: str, prices: np.ndarray, K: float, m: int = None) -> np.ndarray:
+    """Payoff before the floor at zero, for price paths of shape (N, m+1)."""
+    if kind == "european":
+        return prices[:, -1] - K
+    if kind == "asian":
+        return np.mean(prices[:, 1:m + 1], axis=1) - K
+    if kind == "lookback_call":
+        return np.max(prices, axis=1) - K
+    if kind == "lookback_put":
+        return K - np.min(prices, axis=1)
+    raise ValueError(f"Unknown contract '{kind}'")
+
+
+def _bgk_shift(correction: str, sigma: float, T: float, m: int) -> float:
+    """Log-space shift of the extrema for the continuity correction."""
+    if correction is None:
+        return 0.0
+    if correction != "bgk":
+        raise ValueError(f"Unknown correction '{correction}', expected None or 'bgk'")
+    return _BGK_BETA * sigma * np.sqrt(T / m)
+
+
+def _barrier_survival(log_prices: np.ndarray, lower: float, upper: float,
+                      sigma: float, T: float, correction: str = None) -> np.ndarray:
+    """
+    Probability of each path of staying strictly between the barriers.
+
+    0 or 1 for monitoring at the dates of the paths (shifted barriers
+    with "bgk"). With "bridge", the product over the intervals of the
+    probability that a Brownian bridge between consecutive log-prices does
+    not cross the barriers, for paths whose dates are all inside.
+    """
+    if lower is None and upper is None:
+        raise ValueError("at least one of lower and upper is required")
+    if correction not in (None, "bgk", "bridge"):
+        raise ValueError(f"Unknown correction '{correction}', "
+                         f"expected None, 'bgk' or 'bridge'")
+
+    m = log_prices.shape[1] - 1
+    lo = -np.inf if lower is None else np.log(lower)
+    hi = np.inf if upper is None else np.log(upper)
+
+    if correction == "bgk":
+        shift = _bgk_shift("bgk", sigma, T, m)
+        lo, hi = lo + shift, hi - shift
+
+    inside = np.all((log_prices > lo) & (log_prices < hi), axis=1)
+    if correction != "bridge":
+        return inside.astype(float)
+
+    # Bridge endpoints, clipped inside the barriers (paths outside get 0)
+    a = np.clip(log_prices[:, :-1], lo, hi)
+    b = np.clip(log_prices[:, 1:], lo, hi)
+    variance = sigma ** 2 * T / m
+
+    if lower is None:
+        stay = 1 - np.exp(-2 * (hi - a) * (hi - b) / variance)
+    elif upper is None:
+        stay = 1 - np.exp(-2 * (a - lo) * (b - lo) / variance)
+    else:
+        width = hi - lo
+        stay = np.zeros_like(a)
+        for n in range(-_BRIDGE_TERMS, _BRIDGE_TERMS + 1):
+            stay += np.exp(-2 * n * width * (n * width + b - a) / variance)
+            stay -= np.exp(-2 * (n * width + hi - a) * (n * width + hi - b) / variance)
+
+    survival = np.prod(np.clip(stay, 0.0, 1.0), axis=1)
+
+    return np.where(inside, survival, 0.0)
+
+
+def _resolve_drift(drift, kind: str, S0: float, K: float, r: float, delta: float,
+                   sigma: float, T: float, m: int, construction: str = "standard"):
+    """Importance-sampling drift as an array, None when not sampling."""
+    if drift is None:
+        return None
+    if isinstance(drift, str):
+        if drift != "optimal":
+            raise ValueError(f"Unknown drift '{drift}', expected 'optimal' or an array")
+        return np.array(_optimal_drift(kind, float(S0), float(K), float(r), float(delta),
+                                       float(sigma), float(T), int(m), construction))
+    return np.atleast_1d(np.asarray(drift, dtype=float))
+
+
+@lru_cache(maxsize=128)
+def _optimal_drift(kind: str, S0: float, K: float, r: float, delta: float,
+                   sigma: float, T: float, m: int, construction: str) -> tuple:
+    """Optimal drift of one contract, cached as a tuple."""
+    def intrinsic(Z):
+        if kind == "european":
+            return _terminal_price(S0, r, delta, sigma, T, Z[:, 0]) - K
+        prices = gbm_paths(S0, r, delta, sigma, T, Z, construction=construction)
+        return _intrinsic(kind, prices, K, m)
+
+    return tuple(optimal_drift(intrinsic, m, scale=K))
+
+
+def _antithetic_normals(Z: np.ndarray, antithetic: bool) -> np.ndarray:
+    """Stack the mirrored normals -Z after Z when antithetic is True."""
+    return np.concatenate([Z, -Z]) if antithetic else Z
+
+
+def _tile(mask: np.ndarray, antithetic: bool) -> np.ndarray:
+    return np.concatenate([mask, mask]) if antithetic else mask
+
+
+def _estimate(payoffs: np.ndarray, discount: float, antithetic: bool,
+              return_se: bool, controls: list = None, paths: np.ndarray = None,
+              weights: np.ndarray = None, valid: np.ndarray = None):
+    """
+    Discounted mean of the payoffs, and its standard error if requested.
+
+    Antithetic samples are averaged in pairs first, so the standard error
+    accounts for the correlation between a path and its mirror. With
+    controls, the pair averages of the payoffs are regressed on the pair
+    averages of the controls evaluated on paths. Importance-sampling
+    weights multiply the payoffs and the controls alike. Control rows
+    outside the valid mask are zeroed like the payoffs, so that paths
+    driven by infinite normals cannot break the regression.
+    """
+    samples = discount * payoffs
+    values = evaluate(controls, paths) if controls else None
+    if values is not None and valid is not None:
+        values = np.where(valid[:, None], values, 0.0)
+
+    if weights is not None:
+        samples = samples * weights
+        if values is not None:
+            values = values * weights[:, None]
+
+    if antithetic:
+        half = len(samples) // 2
+        samples = 0.5 * (samples[:half] + samples[half:])
+        if values is not None:
+            values = 0.5 * (values[:half] + values[half:])
+
+    if values is not None:
+        cv = ControlVariateStats([control.mean for control in controls])
+        cv.update(samples, values)
+        price, std_error = cv.mean, cv.std_error
+    else:
+        n = len(samples)
+        price = np.mean(samples)
+        std_error = np.std(samples, ddof=1) / np.sqrt(n) if n > 1 else 0.0
+
+    return (price, std_error) if return_se else price
+
+
 def monte_carlo_convergence(pricer_func, points_list: list, *args, **kwargs) -> np.ndarray:
     """
     Test convergence of MC/QMC pricing with different sample sizes.
@@ -305,3 +1134,89 @@ def monte_carlo_convergence(pricer_func, points_list: list, *args, **kwargs) ->
         prices[i] = pricer_func(points, *args, **kwargs)
 
     return prices
+
+
+def price_stream(pricer_func, stream, N: int, *args, **kwargs) -> float:
+    """
+    Price with the next N points of a point stream, block by block.
+
+    Every pricer in this module is an average over the points, so the
+    estimate is accumulated as the size-weighted mean of the block
+    estimates. Memory is bounded by the block size of the stream rather
+    than by N, and the stream can be used again afterwards to extend the
+    point set without recomputing the points already consumed.
+
+    Parameters
+    ----------
+    pricer_func : callable
+        Pricing function taking the points as keyword argument ``points``
+    stream : generators.PointStream
+        Stream providing the points (advanced by N points)
+    N : int
+        Number of points to use
+    *args, **kwargs
+        Additional arguments to pass to pricer_func
+
+    Returns
+    -------
+    float
+        Option price estimated with N points
+
+    Notes
+    -----
+    Blocks of one-dimensional streams are passed as 1-D arrays, as
+    expected by ``european_call_mc`` and the estimators in ``greeks``.
+    """
+    if N < 1:
+        raise ValueError("N must be positive")
+
+    total = 0.0
+
+    for block in stream.blocks(N):
+        if block.shape[1] == 1:
+            block = block[:, 0]
+        total += len(block) * pricer_func(*args, points=block, **kwargs)
+
+    return total / N
+
+
+def sequential_convergence(pricer_func, stream, sample_sizes: list,
+                           *args, **kwargs) -> np.ndarray:
+    """
+    Test convergence of MC/QMC pricing by extending a single point set.
+
+    Unlike ``monte_carlo_convergence``, which prices independently
+    generated point sets, the estimate for each sample size reuses the
+    points (and payoff evaluations) of the previous one and only prices
+    the new points of the stream. With an ``ExtensibleLatticeStream`` and
+    powers of two as sample sizes every estimate is a full lattice rule.
+
+    Parameters
+    ----------
+    pricer_func : callable
+        Pricing function taking the points as keyword argument ``points``
+    stream : generators.PointStream
+        Stream providing the points
+    sample_sizes : list of int
+        Increasing sample sizes
+    *args, **kwargs
+        Additional arguments to pass to pricer_func
+
+    Returns
+    -------
+    np.ndarray
+        Array of prices for each sample size
+    """
+    prices = np.zeros(len(sample_sizes))
+    total, N_prev = 0.0, 0
+
+    for i, N in enumerate(sample_sizes):
+        if N <= N_prev:
+            raise ValueError("sample_sizes must be increasing")
+
+        total += (N - N_prev) * price_stream(pricer_func, stream, N - N_prev,
+                                             *args, **kwargs)
+        prices[i] = total / N
+        N_prev = N
+
+    return prices
@@ -0,0 +1,323 @@
+"""
+Randomized quasi-Monte Carlo (RQMC).
+
+This module turns one base point set into R independently randomized
+copies, computed at once as an array of shape (R, N, dim):
+- Cranley-Patterson random shifts (modulo 1)
+- Digital shifts in base b
+- Random linear (Matousek) scrambling in base b
+- Nested (Owen) scrambling in base b
+
+The digital randomizations work on the base-b digits of the points, with
+one base per dimension, so they apply to Halton points (bases = primes)
+as well as to base-2 constructions such as Sobol' points and extensible
+lattice sequences. For rank-1 lattice rules the random shift is the
+randomization that preserves the lattice structure.
+
+All the randomness comes from a ``numpy.random.Generator``; the global
+NumPy random state is never used.
+"""
+
+import math
+
+import numpy as np
+from scipy import stats
+
+
+# Number of bits of the digit expansions used by the digital randomizations
+_DIGIT_BITS = 32
+
+_METHODS = ("shift", "digital_shift", "linear", "nested")
+
+
+def cranley_patterson(points: np.ndarray, R: int,
+                      rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Apply R independent random shifts modulo 1 to a point set.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Array of shape (N, dim) with points in [0, 1)^dim
+    R : int
+        Number of replicates
+    rng : np.random.Generator, optional
+        Random generator. A fresh unseeded generator if None.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (R, N, dim) with the shifted copies
+    """
+    rng = np.random.default_rng(rng)
+    points = np.asarray(points, dtype=float)
+    shifts = rng.random((R, 1, points.shape[1]))
+
+    return (points[None, :, :] + shifts) % 1.0
+
+
+def digital_shift(points: np.ndarray, R: int, rng: np.random.Generator = None,
+                  bases=2) -> np.ndarray:
+    """
+    Apply R independent digital shifts to a point set.
+
+    Each digit d_k of a coordinate in base b is replaced by
+    (d_k + e_k) mod b, with random e_k common to all the points of a
+    replicate and dimension.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Array of shape (N, dim) with points in [0, 1)^dim
+    R : int
+        Number of replicates
+    rng : np.random.Generator, optional
+        Random generator. A fresh unseeded generator if None.
+    bases : int or list of int, default=2
+        Base of the digit expansion, common or one per dimension
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (R, N, dim) with the randomized copies
+    """
+    return _digital_randomization(points, R, rng, bases, "digital_shift")
+
+
+def linear_scramble(points: np.ndarray, R: int, rng: np.random.Generator = None,
+                    bases=2) -> np.ndarray:
+    """
+    Apply R independent random linear scramblings (Matousek) to a point set.
+
+    The digit vector d of a coordinate in base b is mapped to
+    (L d + e) mod b, with L a random lower-triangular matrix whose
+    diagonal entries are units mod b (coprime to b, so the map is a
+    bijection also for composite bases) and e a random digital shift,
+    drawn per replicate and dimension.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Array of shape (N, dim) with points in [0, 1)^dim
+    R : int
+        Number of replicates
+    rng : np.random.Generator, optional
+        Random generator. A fresh unseeded generator if None.
+    bases : int or list of int, default=2
+        Base of the digit expansion, common or one per dimension
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (R, N, dim) with the randomized copies
+    """
+    return _digital_randomization(points, R, rng, bases, "linear")
+
+
+def nested_scramble(points: np.ndarray, R: int, rng: np.random.Generator = None,
+                    bases=2) -> np.ndarray:
+    """
+    Apply R independent nested (Owen) scramblings to a point set.
+
+    The k-th digit of a coordinate is permuted by a random permutation
+    that depends on the k-1 preceding digits. The permutations are drawn
+    by hashing a random seed of the replicate and dimension together with
+    the digit position and the preceding digits, so no permutation tree is
+    stored. In base 2 every permutation is a uniform random bit flip,
+    which is Owen's scrambling; for larger bases the permutations are
+    random affine maps d -> (a d + c) mod b, with a a unit mod b.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Array of shape (N, dim) with points in [0, 1)^dim
+    R : int
+        Number of replicates
+    rng : np.random.Generator, optional
+        Random generator. A fresh unseeded generator if None.
+    bases : int or list of int, default=2
+        Base of the digit expansion, common or one per dimension
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (R, N, dim) with the randomized copies
+    """
+    return _digital_randomization(points, R, rng, bases, "nested")
+
+
+def randomize(points: np.ndarray, R: int, method: str = "shift",
+              rng: np.random.Generator = None, bases=2) -> np.ndarray:
+    """
+    Produce R randomized copies of a point set.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Array of shape (N, dim) with points in [0, 1)^dim
+    R : int
+        Number of replicates
+    method : str, default="shift"
+        One of "shift" (Cranley-Patterson), "digital_shift", "linear"
+        (Matousek scrambling) or "nested" (Owen scrambling)
+    rng : np.random.Generator, optional
+        Random generator. A fresh unseeded generator if None.
+    bases : int or list of int, default=2
+        Base of the digit expansion for the digital methods
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (R, N, dim) with the randomized copies
+    """
+    if method not in _METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {_METHODS}")
+
+    if method == "shift":
+        return cranley_patterson(points, R, rng)
+
+    return _digital_randomization(points, R, rng, bases, method)
+
+
+def rqmc_price(pricer_func, points: np.ndarray, R: int, *args,
+               method: str = "shift", rng: np.random.Generator = None,
+               bases=2, confidence: float = 0.95, **kwargs) -> dict:
+    """
+    Price with R randomized copies of a point set and report an error bar.
+
+    Parameters
+    ----------
+    pricer_func : callable
+        Pricing function taking the points as keyword argument ``points``
+    points : np.ndarray
+        Base point set of shape (N, dim), or (N,) for one-dimensional
+        pricers such as ``pricing.european_call_mc``
+    R : int
+        Number of replicates (at least 2)
+    *args, **kwargs
+        Additional arguments to pass to pricer_func
+    method : str, default="shift"
+        Randomization (see ``randomize``)
+    rng : np.random.Generator, optional
+        Random generator. A fresh unseeded generator if None.
+    bases : int or list of int, default=2
+        Base of the digit expansion for the digital methods
+    confidence : float, default=0.95
+        Confidence level of the interval
+
+    Returns
+    -------
+    dict
+        'price' (mean of the replicates), 'std_error', 'ci' (tuple with
+        the Student-t confidence interval) and 'replicates' (array of the
+        R estimates)
+    """
+    if R < 2:
+        raise ValueError("At least two replicates are needed for an error estimate")
+
+    points = np.asarray(points, dtype=float)
+    one_dimensional = points.ndim == 1
+    if one_dimensional:
+        points = points[:, None]
+
+    copies = randomize(points, R, method, rng, bases)
+    if one_dimensional:
+        copies = copies[:, :, 0]
+
+    replicates = np.array([pricer_func(*args, points=copy, **kwargs) for copy in copies])
+
+    price = np.mean(replicates)
+    std_error = np.std(replicates, ddof=1) / np.sqrt(R)
+    half_width = stats.t.ppf(0.5 + confidence / 2, R - 1) * std_error
+
+    return {
+        'price': price,
+        'std_error': std_error,
+        'ci': (price - half_width, price + half_width),
+        'replicates': replicates,
+    }
+
+
+def _digits_per_base(bases: np.ndarray) -> np.ndarray:
+    """Number of base-b digits that fit in _DIGIT_BITS bits."""
+    return np.array([int(_DIGIT_BITS // np.log2(b)) for b in bases])
+
+
+def _digital_randomization(points: np.ndarray, R: int, rng: np.random.Generator,
+                           bases, method: str) -> np.ndarray:
+    """Digit-wise randomization shared by the digital methods."""
+    rng = np.random.default_rng(rng)
+    points = np.asarray(points, dtype=float)
+    N, dim = points.shape
+
+    bases = np.broadcast_to(np.asarray(bases, dtype=np.int64), (dim,))
+    if np.any(bases < 2):
+        raise ValueError("All bases must be integers >= 2")
+
+    result = np.empty((R, N, dim))
+
+    # Dimensions sharing a base are randomized together
+    for b in np.unique(bases):
+        b = int(b)
+        cols = np.flatnonzero(bases == b)
+        K = int(_digits_per_base([b])[0])
+        scale = b ** K
+
+        # Digits of the base points, most significant first, shared by
+        # all the replicates: shape (K, N, len(cols))
+        x = np.clip(np.rint(points[:, cols] * scale), 0, scale - 1).astype(np.int64)
+        digits = np.empty((K, N, len(cols)), dtype=np.int64)
+        for k in range(K - 1, -1, -1):
+            x, digits[k] = np.divmod(x, b)
+
+        shift = rng.integers(0, b, size=(K, R, 1, len(cols)))
+        # Multipliers coprime to b keep the digit maps bijective
+        units = _units(b)
+
+        if method == "linear":
+            L = rng.integers(0, b, size=(R, len(cols), K, K))
+            diagonal = units[rng.integers(0, len(units), size=(R, len(cols), 1, K))]
+            L = np.tril(L, -1) + np.eye(K, dtype=np.int64) * diagonal
+        elif method == "nested":
+            seeds = rng.integers(0, 2 ** 63, size=(R, 1, len(cols)), dtype=np.int64).view(np.uint64)
+            prefix = np.zeros((N, len(cols)), dtype=np.uint64)
+
+        values = np.zeros((R, N, len(cols)))
+        weight = 1.0
+
+        for k in range(K):
+            weight /= b
+
+            if method == "digital_shift":
+                y = digits[k][None] + shift[k]
+            elif method == "linear":
+                y = np.einsum("rji,inj->rnj", L[:, :, k, :k + 1], digits[:k + 1]) + shift[k]
+            else:
+                salt = np.uint64(((k + 1) * 0x9E3779B97F4A7C15) % 2 ** 64)
+                h = _hash(seeds ^ _hash(prefix[None] + salt))
+                a = units[(h % np.uint64(len(units))).astype(np.int64)]
+                c = ((h >> np.uint64(32)) % np.uint64(b)).astype(np.int64)
+                y = a * digits[k][None] + c
+                prefix = prefix * np.uint64(b) + digits[k].astype(np.uint64)
+
+            values += weight * (y % b)
+
+        # Random tail below the last digit, so that no two copies coincide
+        values += weight * rng.random(values.shape)
+        result[:, :, cols] = values
+
+    return result
+
+
+def _units(b: int) -> np.ndarray:
+    """The digits 1..b-1 coprime to b, the invertible multipliers mod b."""
+    return np.array([a for a in range(1, b) if math.gcd(a, b) == 1], dtype=np.int64)
+
+
+def _hash(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer applied element-wise to uint64 arrays."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
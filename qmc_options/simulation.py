@@ -3,10 +3,37 @@ Geometric Brownian Motion simulation and Monte Carlo utilities.
 
 This module provides functions for simulating stock price paths
 and performing Monte Carlo integration.
+
+Batched paths can be built from the normals with different constructions
+of the Brownian motion (see ``brownian_motion``):
+- "standard": forward cumulative sum of the increments
+- "bridge": Brownian bridge, which puts the terminal value and the
+  coarse shape of the path on the first coordinates, where quasi-random
+  points are most uniform
+- "pca": principal components of the covariance of the path, which
+  put as much variance as possible on the first coordinates
+- "pca_fft": the same paths from the closed-form eigenvectors of the
+  uniform grid, applied with a fast sine transform in O(m log m) per path
 """
 
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+
 import numpy as np
-from scipy import stats
+from scipy import fft
+
+from .inverse_normal import norm_ppf
+
+
+_CONSTRUCTIONS = ("standard", "bridge", "pca", "pca_fft")
+
+# Dates stepped at once by the SDE schemes in a time-major buffer
+_SCHEME_BLOCK = 64
+
+# Factors of correlation matrices, keyed by method and matrix contents
+_FACTOR_CACHE_SIZE = 64
+_factor_cache = OrderedDict()
 
 
 def box_muller(mu: float = 0.0, sigma: float = 1.0, size: int = 1) -> np.ndarray:
@@ -84,7 +111,8 @@ def gbm_explicit(S0: float, r: float, sigma: float, delta: float,
 
 
 def gbm_euler(S0: float, T: float, n: int, r: float,
-              delta: float, sigma: float, seed: int = None) -> np.ndarray:
+              delta: float, sigma: float, seed: int = None,
+              rng: np.random.Generator = None) -> np.ndarray:
     """
     Generate GBM path using Euler-Maruyama discretization.
 
@@ -106,25 +134,169 @@ def gbm_euler(S0: float, T: float, n: int, r: float,
     sigma : float
         Volatility
     seed : int, optional
-        Random seed for reproducibility
+        Random seed for reproducibility (used when rng is None)
+    rng : np.random.Generator, optional
+        Random generator. The global NumPy random state is never used.
 
     Returns
     -------
     np.ndarray
         Array of length n containing the simulated path
     """
-    if seed is not None:
-        np.random.seed(seed)
+    if rng is None:
+        rng = np.random.default_rng(seed)
 
     dt = T / n
-    path = np.zeros(n)
-    path[0] = S0
 
-    for i in range(1, n):
-        Z = np.random.randn()
-        path[i] = path[i-1] * (1 + (r - delta) * dt + sigma * np.sqrt(dt) * Z)
+    # n points: S0 followed by n - 1 steps of size dt
+    path = euler_maruyama(S0, lambda t, x: (r - delta) * x, lambda t, x: sigma * x,
+                          dt * (n - 1), n - 1, N=1, rng=rng)
 
-    return path
+    return path[0]
+
+
+def euler_maruyama(x0, drift, diffusion, T: float, m: int, N: int = None,
+                   Z: np.ndarray = None, rng: np.random.Generator = None,
+                   out: np.ndarray = None) -> np.ndarray:
+    """
+    Simulate N paths of dX = a(t, X) dt + b(t, X) dW with the Euler-Maruyama scheme.
+
+    X(t_{k+1}) = X(t_k) + a(t_k, X) * dt + b(t_k, X) * sqrt(dt) * Z_k
+
+    All the paths advance together, one vectorized step per date.
+
+    Parameters
+    ----------
+    x0 : float or np.ndarray
+        Initial value, scalar or of length N
+    drift : callable
+        a(t, x) evaluated on the array x of the current values
+    diffusion : callable
+        b(t, x) evaluated on the array x of the current values
+    T : float
+        Time horizon
+    m : int
+        Number of steps, dt = T/m
+    N : int, optional
+        Number of paths; defaults to the length of x0 or the rows of Z
+    Z : np.ndarray, optional
+        Array of shape (N, m) with standard normals, e.g. from
+        ``qmc_to_normal`` to drive the scheme with QMC points
+    rng : np.random.Generator, optional
+        Random generator used when Z is None
+    out : np.ndarray, optional
+        Float array of shape (N, m+1) to write the paths into; the steps
+        are then taken without any other array of that size
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (N, m+1) with the paths, including x0
+    """
+    return _scheme(x0, drift, diffusion, None, T, m, N, Z, rng, out)
+
+
+def milstein(x0, drift, diffusion, diffusion_derivative, T: float, m: int,
+             N: int = None, Z: np.ndarray = None, rng: np.random.Generator = None,
+             out: np.ndarray = None) -> np.ndarray:
+    """
+    Simulate N paths of dX = a(t, X) dt + b(t, X) dW with the Milstein scheme.
+
+    X(t_{k+1}) = X(t_k) + a*dt + b*sqrt(dt)*Z_k + 0.5*b*b'*dt*(Z_k^2 - 1)
+
+    with b' the derivative of b with respect to x. The scheme has strong
+    order 1, against 1/2 for Euler-Maruyama.
+
+    Parameters
+    ----------
+    x0 : float or np.ndarray
+        Initial value, scalar or of length N
+    drift : callable
+        a(t, x) evaluated on the array x of the current values
+    diffusion : callable
+        b(t, x) evaluated on the array x of the current values
+    diffusion_derivative : callable
+        db/dx(t, x) evaluated on the array x of the current values
+    T : float
+        Time horizon
+    m : int
+        Number of steps, dt = T/m
+    N : int, optional
+        Number of paths; defaults to the length of x0 or the rows of Z
+    Z : np.ndarray, optional
+        Array of shape (N, m) with standard normals
+    rng : np.random.Generator, optional
+        Random generator used when Z is None
+    out : np.ndarray, optional
+        Float array of shape (N, m+1) to write the paths into; the steps
+        are then taken without any other array of that size
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (N, m+1) with the paths, including x0
+    """
+    return _scheme(x0, drift, diffusion, diffusion_derivative, T, m, N, Z, rng, out)
+
+
+def _scheme(x0, drift, diffusion, diffusion_derivative, T: float, m: int,
+            N: int, Z: np.ndarray, rng: np.random.Generator,
+            out: np.ndarray) -> np.ndarray:
+    """Euler-Maruyama (diffusion_derivative None) or Milstein time stepping."""
+    if N is None and np.ndim(x0) == 1:
+        N = len(x0)
+
+    if Z is None:
+        if N is None:
+            raise ValueError("Either N or Z must be given")
+        # Drawn time-major, so that every step reads a contiguous row
+        Z = np.random.default_rng(rng).standard_normal((m, N))
+        time_major = True
+    else:
+        Z = np.asarray(Z, dtype=float)
+        if Z.ndim != 2 or Z.shape[1] != m or (N is not None and Z.shape[0] != N):
+            raise ValueError(f"Z must have shape (N, {m})")
+        N = Z.shape[0]
+        time_major = False
+
+    if out is None:
+        out = np.empty((N, m + 1))
+    elif out.shape != (N, m + 1):
+        raise ValueError(f"out must have shape {(N, m + 1)}")
+
+    dt = T / m if m > 0 else 0.0
+    sqrt_dt = np.sqrt(dt)
+
+    # Steps are taken in contiguous rows of small time-major buffers, and
+    # each block of _SCHEME_BLOCK dates is transposed into out in one copy,
+    # so no temporary of the size of the paths is allocated
+    block = np.empty((min(m, _SCHEME_BLOCK) + 1, N))
+    block[0] = x0
+    out[:, 0] = block[0]
+
+    for first in range(0, m, _SCHEME_BLOCK):
+        steps = min(_SCHEME_BLOCK, m - first)
+        if time_major:
+            normals = Z[first:first + steps]
+        else:
+            normals = np.ascontiguousarray(Z[:, first:first + steps].T)
+
+        for j in range(steps):
+            t = (first + j) * dt
+            x = block[j]
+            b = diffusion(t, x)
+
+            step = block[j + 1]
+            np.multiply(b, sqrt_dt * normals[j], out=step)
+            step += drift(t, x) * dt
+            if diffusion_derivative is not None:
+                step += 0.5 * dt * b * diffusion_derivative(t, x) * (normals[j] ** 2 - 1)
+            step += x
+
+        out[:, first + 1:first + steps + 1] = block[1:steps + 1].T
+        block[0] = block[steps]
+
+    return out
 
 
 def gbm_exact(S0: float, T: float, n: int, r: float,
@@ -177,6 +349,251 @@ def gbm_exact(S0: float, T: float, n: int, r: float,
     return path
 
 
+def gbm_paths(S0: float, r: float, delta: float, sigma: float, T: float,
+              Z: np.ndarray, log: bool = False, out: np.ndarray = None,
+              construction: str = "standard") -> np.ndarray:
+    """
+    Generate GBM paths for a matrix of normals in one vectorized pass.
+
+    Row i of Z drives path i on the uniform grid t_j = j*T/m:
+    log S(t_j) = log S0 + (r - delta - 0.5*sigma^2)*t_j + sigma*W_i(t_j)
+
+    With the standard construction the Brownian motion W_i is the
+    cumulative sum of sqrt(dt)*Z[i, k], computed with a single cumsum.
+
+    Parameters
+    ----------
+    S0 : float
+        Initial stock price
+    r : float
+        Risk-free interest rate
+    delta : float
+        Dividend yield
+    sigma : float
+        Volatility
+    T : float
+        Time to maturity
+    Z : np.ndarray
+        Array of shape (N, m) with standard normals, or (m,) for one path
+    log : bool, default=False
+        Return log-prices instead of prices (saves the exponentiation)
+    out : np.ndarray, optional
+        Float array of shape (N, m+1) to write the paths into
+    construction : str, default="standard"
+        Construction of the Brownian motion (see ``brownian_motion``)
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (N, m+1) (or (m+1,)) with the paths, including S0
+        in the first column
+    """
+    Z = np.asarray(Z, dtype=float)
+    single = Z.ndim == 1
+    Z2 = Z[None, :] if single else Z
+    N, m = Z2.shape
+
+    shape = (m + 1,) if single else (N, m + 1)
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError(f"out must have shape {shape}")
+    paths = out[None, :] if single else out
+
+    dt = T / m
+    drift = (r - delta - 0.5 * sigma ** 2) * dt
+
+    if construction == "standard":
+        paths[:, 0] = np.log(S0)
+        np.multiply(Z2, sigma * np.sqrt(dt), out=paths[:, 1:])
+        paths[:, 1:] += drift
+        np.cumsum(paths, axis=1, out=paths)
+    else:
+        brownian_motion(Z2, T, construction, out=paths)
+        paths *= sigma
+        paths += np.log(S0) + drift * np.arange(m + 1)
+
+    if not log:
+        np.exp(paths, out=paths)
+
+    return out
+
+
+def brownian_motion(Z: np.ndarray, T: float = 1.0, construction: str = "standard",
+                    out: np.ndarray = None) -> np.ndarray:
+    """
+    Brownian motion on the uniform grid t_j = j*T/m from a matrix of normals.
+
+    Every construction gives exact Brownian paths for independent normals;
+    they differ in which coordinate of Z drives which part of the path,
+    which matters for quasi-Monte Carlo points:
+    - "standard": W(t_j) = sqrt(dt) * (Z[:, 0] + ... + Z[:, j-1])
+    - "bridge": Z[:, 0] gives W(T), Z[:, 1] the midpoint given W(T), and
+      each further coordinate the midpoint of a remaining interval given
+      its end points, in breadth-first order
+    - "pca": W = Z @ (V * sqrt(lambda)).T with the eigenpairs of the
+      covariance min(t_i, t_j), largest eigenvalue first; O(m^2) per path
+    - "pca_fft": the same as "pca" (up to rounding), computed with a
+      discrete sine transform of length 2m+1 from the closed-form
+      eigenpairs of the grid; O(m log m) per path
+
+    Parameters
+    ----------
+    Z : np.ndarray
+        Array of shape (N, m) with standard normals
+    T : float, default=1.0
+        Time horizon
+    construction : str, default="standard"
+        "standard", "bridge", "pca" or "pca_fft"
+    out : np.ndarray, optional
+        Float array of shape (N, m+1) to write the paths into
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (N, m+1) with W(t_0) = 0 in the first column
+    """
+    if construction not in _CONSTRUCTIONS:
+        raise ValueError(f"Unknown construction '{construction}', "
+                         f"expected one of {_CONSTRUCTIONS}")
+
+    Z = np.asarray(Z, dtype=float)
+    N, m = Z.shape
+
+    if out is None:
+        out = np.empty((N, m + 1))
+    elif out.shape != (N, m + 1):
+        raise ValueError(f"out must have shape {(N, m + 1)}")
+
+    out[:, 0] = 0.0
+
+    if construction == "standard":
+        np.cumsum(Z, axis=1, out=out[:, 1:])
+        out[:, 1:] *= np.sqrt(T / m)
+        return out
+
+    if construction == "pca":
+        np.matmul(Z, _pca_factor(m).T, out=out[:, 1:])
+        out[:, 1:] *= np.sqrt(T)
+        return out
+
+    if construction == "pca_fft":
+        # W_i = sum_k c_k Z_k sin((2k-1) i pi / (2m+1)) is half the entry
+        # 2i-1 of the DST-II of length 2m+1 of (c_1 Z_1, ..., c_m Z_m, 0, ...)
+        coefficients = np.zeros((N, 2 * m + 1))
+        np.multiply(Z, _pca_fft_weights(m), out=coefficients[:, :m])
+        transform = fft.dst(coefficients, type=2, axis=1, overwrite_x=True)
+        np.multiply(transform[:, 1::2], 0.5 * np.sqrt(T), out=out[:, 1:])
+        return out
+
+    index, left, right, left_weight, right_weight, scale = _bridge_schedule(m)
+
+    # Fill the grid point by point on a time-major copy, so that every
+    # step works on contiguous rows of N values
+    Zt = np.ascontiguousarray(Z.T)
+    W = np.zeros((m + 1, N))
+
+    for k in range(m):
+        row = W[index[k]]
+        np.multiply(Zt[k], scale[k], out=row)
+        if left_weight[k]:
+            row += left_weight[k] * W[left[k]]
+        if right_weight[k]:
+            row += right_weight[k] * W[right[k]]
+
+    out[:] = W.T
+    out *= np.sqrt(T)
+
+    return out
+
+
+@lru_cache(maxsize=32)
+def _pca_factor(m: int) -> np.ndarray:
+    """
+    Matrix V * sqrt(lambda) of the covariance min(t_i, t_j) on the grid j/m.
+
+    Eigenpairs come from the eigendecomposition of the covariance, are
+    sorted by decreasing eigenvalue and signed so that the first
+    component of every eigenvector is positive, which makes them match
+    the closed form used by ``_pca_fft_weights``. Computed once per number
+    of steps; other horizons follow by Brownian scaling.
+    """
+    t = np.arange(1, m + 1) / m
+    eigenvalues, eigenvectors = np.linalg.eigh(np.minimum.outer(t, t))
+
+    order = np.argsort(eigenvalues)[::-1]
+    eigenvalues = np.maximum(eigenvalues[order], 0.0)
+    eigenvectors = eigenvectors[:, order] * np.sign(eigenvectors[0, order])
+
+    factor = eigenvectors * np.sqrt(eigenvalues)
+    factor.setflags(write=False)
+
+    return factor
+
+
+@lru_cache(maxsize=32)
+def _pca_fft_weights(m: int) -> np.ndarray:
+    """
+    Scale of the k-th principal component on the grid j/m, for the FFT.
+
+    With dt = 1/m the eigenpairs of min(t_i, t_j) are
+    lambda_k = dt / (4 sin^2((2k-1) pi / (2(2m+1))))
+    v_k(i) = 2/sqrt(2m+1) * sin((2k-1) i pi / (2m+1)),
+    so component k enters with weight 2/sqrt(2m+1) * sqrt(lambda_k).
+    """
+    k = np.arange(1, m + 1)
+    eigenvalues = (1 / m) / (4 * np.sin((2 * k - 1) * np.pi / (2 * (2 * m + 1))) ** 2)
+
+    weights = 2 / np.sqrt(2 * m + 1) * np.sqrt(eigenvalues)
+    weights.setflags(write=False)
+
+    return weights
+
+
+@lru_cache(maxsize=32)
+def _bridge_schedule(m: int) -> tuple:
+    """
+    Brownian-bridge order and weights on the grid j/m, j = 0..m.
+
+    Step k sets W[index[k]] = left_weight[k] * W[left[k]]
+    + right_weight[k] * W[right[k]] + scale[k] * Z[k]. The schedule is
+    computed once per number of steps; other horizons T follow by the
+    scaling W(T*t) = sqrt(T) * W(t).
+    """
+    index = np.zeros(m, dtype=np.int64)
+    left = np.zeros(m, dtype=np.int64)
+    right = np.zeros(m, dtype=np.int64)
+    left_weight = np.zeros(m)
+    right_weight = np.zeros(m)
+    scale = np.zeros(m)
+
+    # Terminal value first, from W(0) = 0
+    index[0], right[0] = m, m
+    scale[0] = 1.0
+
+    k = 1
+    intervals = [(0, m)]
+    while intervals:
+        next_intervals = []
+        for lo, hi in intervals:
+            if hi - lo < 2:
+                continue
+            mid = (lo + hi) // 2
+            index[k], left[k], right[k] = mid, lo, hi
+            left_weight[k] = (hi - mid) / (hi - lo)
+            right_weight[k] = (mid - lo) / (hi - lo)
+            scale[k] = np.sqrt((mid - lo) * (hi - mid) / ((hi - lo) * m))
+            k += 1
+            next_intervals += [(lo, mid), (mid, hi)]
+        intervals = next_intervals
+
+    schedule = (index, left, right, left_weight, right_weight, scale)
+    for array in schedule:
+        array.setflags(write=False)
+
+    return schedule
+
+
 def generate_correlated_normals(N: int, rho: float, Z1: np.ndarray = None) -> tuple:
     """
     Generate two correlated standard normal random variables.
@@ -207,11 +624,137 @@ def generate_correlated_normals(N: int, rho: float, Z1: np.ndarray = None) -> tu
     return Z1, Z2
 
 
+def correlation_factor(corr: np.ndarray, method: str = "cholesky") -> np.ndarray:
+    """
+    Factor L of a correlation matrix with L @ L.T = corr, cached by contents.
+
+    Parameters
+    ----------
+    corr : np.ndarray
+        Symmetric (d, d) correlation matrix
+    method : str, default="cholesky"
+        "cholesky" (lower-triangular, needs a positive definite matrix) or
+        "eigen" (V * sqrt(lambda) with eigenvalues in decreasing order;
+        accepts semi-definite matrices and puts most of the variance on
+        the first factors)
+
+    Returns
+    -------
+    np.ndarray
+        Read-only (d, d) factor
+    """
+    if method not in ("cholesky", "eigen"):
+        raise ValueError(f"Unknown method '{method}', expected 'cholesky' or 'eigen'")
+
+    corr = np.ascontiguousarray(corr, dtype=float)
+    if corr.ndim != 2 or corr.shape[0] != corr.shape[1] or not np.allclose(corr, corr.T):
+        raise ValueError("corr must be a symmetric square matrix")
+
+    key = (method, corr.shape[0], hashlib.sha1(corr.tobytes()).hexdigest())
+    factor = _factor_cache.get(key)
+    if factor is not None:
+        _factor_cache.move_to_end(key)
+        return factor
+
+    if method == "cholesky":
+        try:
+            factor = np.linalg.cholesky(corr)
+        except np.linalg.LinAlgError:
+            raise ValueError("corr is not positive definite; use method='eigen'") from None
+    else:
+        eigenvalues, eigenvectors = np.linalg.eigh(corr)
+        if eigenvalues[0] < -1e-10 * max(1.0, eigenvalues[-1]):
+            raise ValueError("corr is not positive semi-definite")
+        order = np.argsort(eigenvalues)[::-1]
+        factor = eigenvectors[:, order] * np.sqrt(np.maximum(eigenvalues[order], 0.0))
+
+    factor.setflags(write=False)
+    _factor_cache[key] = factor
+    if len(_factor_cache) > _FACTOR_CACHE_SIZE:
+        _factor_cache.popitem(last=False)
+
+    return factor
+
+
+def multi_asset_paths(S0, r: float, delta, sigma, corr: np.ndarray, T: float,
+                      Z: np.ndarray, m: int = 1, log: bool = False,
+                      construction: str = "standard",
+                      factorization: str = "cholesky") -> np.ndarray:
+    """
+    Generate correlated GBM paths of d assets for a matrix of normals.
+
+    Asset j follows
+    log S_j(t_k) = log S0_j + (r - delta_j - 0.5*sigma_j^2)*t_k + sigma_j*W_j(t_k)
+    on the grid t_k = k*T/m, with Brownian motions of correlation corr.
+    The normals are correlated across assets with one batched matrix
+    product by the cached factor of corr, and each asset's path is then
+    built with the requested construction.
+
+    Parameters
+    ----------
+    S0 : float or np.ndarray
+        Initial prices, scalar or of length d
+    r : float
+        Risk-free interest rate
+    delta : float or np.ndarray
+        Dividend yields, scalar or of length d
+    sigma : float or np.ndarray
+        Volatilities, scalar or of length d
+    corr : np.ndarray
+        (d, d) correlation matrix of the Brownian motions
+    T : float
+        Time to maturity
+    Z : np.ndarray
+        Array of shape (N, m*d) with standard normals. Column k*d + j
+        drives asset j at step k, so the first d columns carry the first
+        (most important, with "bridge" or "pca") step of every asset.
+    m : int, default=1
+        Number of time steps
+    log : bool, default=False
+        Return log-prices instead of prices
+    construction : str, default="standard"
+        Path construction in time (see ``brownian_motion``)
+    factorization : str, default="cholesky"
+        Factor of corr (see ``correlation_factor``)
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (N, d, m) with the (log-)prices at t_1, ..., t_m
+    """
+    factor = correlation_factor(corr, factorization)
+    d = factor.shape[0]
+
+    Z = np.asarray(Z, dtype=float)
+    N = Z.shape[0]
+    if Z.ndim != 2 or Z.shape[1] != m * d:
+        raise ValueError(f"Z must have shape (N, {m * d}) for d={d} assets and m={m} steps")
+
+    # Correlate across assets: (N, m, d) @ (d, d)
+    correlated = Z.reshape(N, m, d) @ factor.T
+
+    # Brownian paths in time for every (path, asset) pair
+    increments = np.ascontiguousarray(correlated.transpose(0, 2, 1)).reshape(N * d, m)
+    paths = brownian_motion(increments, T, construction)[:, 1:].reshape(N, d, m)
+
+    S0, delta, sigma = (np.broadcast_to(np.asarray(x, dtype=float), (d,)) for x in (S0, delta, sigma))
+    t = np.arange(1, m + 1) * (T / m)
+
+    paths *= sigma[:, None]
+    paths += np.log(S0)[:, None] + np.outer(r - delta - 0.5 * sigma ** 2, t)
+
+    if not log:
+        np.exp(paths, out=paths)
+
+    return paths
+
+
 def qmc_to_normal(points: np.ndarray) -> np.ndarray:
     """
     Transform quasi-random points from [0,1]^d to standard normal.
 
-    Uses inverse CDF (probit) transformation.
+    Uses inverse CDF (probit) transformation, computed with
+    ``inverse_normal.norm_ppf``.
 
     Parameters
     ----------
@@ -225,7 +768,7 @@ def qmc_to_normal(points: np.ndarray) -> np.ndarray:
     """
     # Avoid exactly 0 or 1 which give infinite values
     points_clipped = np.clip(points, 1e-10, 1 - 1e-10)
-    return stats.norm.ppf(points_clipped)
+    return norm_ppf(points_clipped, out=points_clipped)
 
 
 def periodize(x: float) -> float:
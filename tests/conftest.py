@@ -0,0 +1,11 @@
+"""Shared pytest configuration."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def lattice_cache_dir(tmp_path, monkeypatch):
+    """Keep the generating-vector file cache inside a temporary directory."""
+    cache = tmp_path / "qmc_options_cache"
+    monkeypatch.setenv("QMC_OPTIONS_CACHE_DIR", str(cache))
+    return cache
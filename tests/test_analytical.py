@@ -141,3 +141,77 @@ def test_otm_call_delta():
 
     # Deep OTM call delta should be close to 0
     assert delta < 0.1
+
+
+def test_geometric_asian_call(option_params):
+    """Test the geometric Asian call against its limits and simulation."""
+    # One monitoring date is a European call
+    assert np.isclose(analytical.geometric_asian_call(m=1, **option_params),
+                      analytical.black_scholes_call(**option_params))
+
+    # Averaging lowers the volatility, and the price below the arithmetic one
+    price = analytical.geometric_asian_call(m=12, **option_params)
+    assert 0 < price < analytical.black_scholes_call(**option_params)
+
+    Z = np.random.default_rng(0).standard_normal((200000, 12))
+    T, sigma, r = option_params['T'], option_params['sigma'], option_params['r']
+    drift = (r - option_params['delta'] - 0.5 * sigma ** 2) * T / 12
+    log_paths = np.log(option_params['S0']) + np.cumsum(drift + sigma * np.sqrt(T / 12) * Z, axis=1)
+    payoffs = np.exp(-r * T) * np.maximum(np.exp(log_paths.mean(axis=1)) - option_params['K'], 0)
+
+    assert abs(payoffs.mean() - price) < 4 * payoffs.std() / np.sqrt(len(payoffs))
+
+
+def test_down_and_out_call(option_params):
+    """Test the down-and-out call between zero and the European call."""
+    call = analytical.black_scholes_call(**option_params)
+
+    price = analytical.down_and_out_call(H=90.0, **option_params)
+    assert 0 < price < call
+
+    # A remote barrier never knocks out
+    assert np.isclose(analytical.down_and_out_call(H=1e-3, **option_params), call)
+
+    with pytest.raises(ValueError):
+        analytical.down_and_out_call(H=110.0, **option_params)
+
+
+def test_floating_lookback_call(option_params):
+    """Test the floating lookback call is worth more than the ATM call."""
+    params = {key: value for key, value in option_params.items() if key != 'K'}
+    price = analytical.floating_lookback_call(**params)
+
+    assert price > analytical.black_scholes_call(**option_params)
+
+    # r == delta uses the limit of the formula, continuous in r - delta
+    flat = dict(params, delta=params['r'])
+    at_limit = analytical.floating_lookback_call(**flat)
+    below = analytical.floating_lookback_call(**dict(flat, delta=params['r'] - 1e-5))
+    above = analytical.floating_lookback_call(**dict(flat, delta=params['r'] + 1e-5))
+    assert below > at_limit > above
+    assert np.isclose(at_limit, 0.5 * (below + above), rtol=1e-8)
+
+
+@pytest.mark.parametrize("formula", [analytical.kirk_spread,
+                                     analytical.bjerksund_stensland_spread])
+def test_spread_approximations(formula):
+    """Test Kirk and Bjerksund-Stensland reduce to Margrabe and broadcast."""
+    params = dict(S10=100, S20=110, r=0.05, delta1=0.05, delta2=0.05,
+                  sigma1=0.3, sigma2=0.2, rho12=0.8, T=1.0)
+    margrabe_price = analytical.margrabe_formula(
+        S10=100, S20=110, delta1=0.05, delta2=0.05,
+        sigma1=0.3, sigma2=0.2, rho12=0.8, T=1.0
+    )
+
+    assert np.isclose(formula(K=0.0, **params), margrabe_price)
+
+    strikes = np.array([-10.0, 0.0, 10.0, 30.0])
+    prices = formula(K=strikes, w2=np.array([[1.0], [2.0]]), **params)
+    assert prices.shape == (2, 4)
+    assert np.all(np.diff(prices, axis=1) < 0)
+    assert np.all(prices[1] > prices[0])
+    assert np.isclose(prices[0, 2], formula(K=10.0, **params))
+
+    # A strike below -F1 falls back to the forward spread, a lower bound
+    forward = 110 * np.exp(-0.05) - 100 * np.exp(-0.05) + 200 * np.exp(-0.05)
+    assert np.isclose(formula(K=-200.0, **params), forward)
@@ -0,0 +1,101 @@
+"""
+Tests for the point-set cache.
+"""
+
+import pytest
+import numpy as np
+from qmc_options import cache, generators, simulation
+
+
+def test_points_match_generators(tmp_path):
+    """Test cached points are the generator output."""
+    store = cache.PointSetCache(directory=str(tmp_path))
+
+    assert np.array_equal(store.points("halton", 100, 3), generators.halton([2, 3, 5], 100))
+    assert np.array_equal(store.points("sobol", 64, 4), generators.sobol(4, 64))
+    assert np.array_equal(store.points("lattice", 101, 2),
+                          generators.good_lattice_points_nd(101, 2))
+
+
+def test_hits_and_read_only(tmp_path):
+    """Test a second request is served from memory without a copy."""
+    store = cache.PointSetCache(directory=str(tmp_path))
+
+    first = store.points("sobol", 128, 2, seed=1)
+    second = store.points("sobol", 128, 2, seed=1)
+
+    assert first is second
+    assert store.hits == 1 and store.misses == 1
+    assert not first.flags.writeable
+
+    # A different seed is a different point set
+    assert not np.array_equal(first, store.points("sobol", 128, 2, seed=2))
+
+
+def test_normals(tmp_path):
+    """Test the normal transform is cached along with the points."""
+    store = cache.PointSetCache(directory=str(tmp_path))
+
+    Z = store.normals("halton", 200, 2)
+
+    assert np.allclose(Z, simulation.qmc_to_normal(generators.halton([2, 3], 200)))
+    assert ("points", "halton", 200, 2, None) in store
+    assert store.normals("halton", 200, 2) is Z
+
+
+def test_lru_eviction(tmp_path):
+    """Test the byte budget evicts the least recently used entry."""
+    nbytes = 100 * 2 * 8
+    store = cache.PointSetCache(max_bytes=2 * nbytes, directory=str(tmp_path))
+
+    store.points("halton", 100, 2, seed=1)
+    store.points("halton", 100, 2, seed=2)
+    store.points("halton", 100, 2, seed=1)
+    store.points("halton", 100, 2, seed=3)
+
+    assert ("points", "halton", 100, 2, 1) in store
+    assert ("points", "halton", 100, 2, 2) not in store
+    assert store.nbytes <= 2 * nbytes
+
+
+def test_spill_to_memory_map(tmp_path):
+    """Test large sets are memory-mapped and shared between caches."""
+    store = cache.PointSetCache(spill_bytes=1024, directory=str(tmp_path))
+
+    points = store.points("sobol", 512, 2)
+
+    assert isinstance(points, np.memmap)
+    assert not points.flags.writeable
+    assert store.nbytes == 0
+
+    # Another cache (e.g. another process) maps the same file
+    other = cache.PointSetCache(spill_bytes=1024, directory=str(tmp_path))
+    assert np.array_equal(other.points("sobol", 512, 2), generators.sobol(2, 512))
+    assert other.misses == 0
+
+    store.clear(files=True)
+    assert len(store) == 0
+    assert not list(tmp_path.glob("*.npy"))
+
+
+def test_lattice_key_follows_generating_vector(tmp_path, monkeypatch):
+    """Test spilled lattice points are not reused after the vector changes."""
+    store = cache.PointSetCache(spill_bytes=1024, directory=str(tmp_path))
+    assert isinstance(store.points("lattice", 101, 2), np.memmap)
+
+    # E.g. a new table version
+    replacement = np.arange(1, 3)
+    monkeypatch.setattr(cache.lattice, "generating_vector",
+                        lambda N, dim, weights=None, embedded=False: replacement)
+    other = cache.PointSetCache(spill_bytes=1024, directory=str(tmp_path))
+
+    assert np.array_equal(other.points("lattice", 101, 2),
+                          generators.good_lattice_points_nd(101, 2, replacement))
+    assert other.misses == 1
+    assert len(list(tmp_path.glob("*.npy"))) == 2
+
+
+def test_unknown_generator(tmp_path):
+    """Test an unknown generator is rejected."""
+    with pytest.raises(ValueError):
+        cache.PointSetCache(directory=str(tmp_path)).points("faure", 10, 2)
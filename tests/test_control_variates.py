@@ -0,0 +1,113 @@
+"""
+Tests for control variates.
+"""
+
+import pytest
+import numpy as np
+from qmc_options import control_variates, pricing, pipeline, analytical, simulation
+
+
+PARAMS = {'S0': 100.0, 'K': 100.0, 'r': 0.05, 'delta': 0.02, 'sigma': 0.25, 'T': 1.0}
+
+
+def test_streaming_stats_match_regression():
+    """Test chunked coefficients and estimate equal a full least-squares fit."""
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((2000, 2))
+    Y = 1.0 + X @ [2.0, -0.5] + 0.1 * rng.standard_normal(2000)
+
+    stats = control_variates.ControlVariateStats([0.0, 0.0])
+    for start in range(0, 2000, 300):
+        stats.update(Y[start:start + 300], X[start:start + 300])
+
+    design = np.column_stack([np.ones(2000), X - X.mean(axis=0)])
+    coefficients, residuals = np.linalg.lstsq(design, Y, rcond=None)[:2]
+
+    assert stats.count == 2000
+    assert np.allclose(stats.beta, coefficients[1:])
+    assert np.isclose(stats.mean, Y.mean() - coefficients[1:] @ X.mean(axis=0))
+    assert np.isclose(stats.variance, residuals[0] / (2000 - 3))
+    assert stats.variance_reduction > 100
+
+
+def test_control_means():
+    """Test the built-in controls have the stated expectations."""
+    m = 8
+    Z = np.random.default_rng(1).standard_normal((200000, m))
+    paths = simulation.gbm_paths(100.0, 0.05, 0.02, 0.25, 1.0, Z)
+
+    controls = [
+        control_variates.geometric_asian_control(m=m, **PARAMS),
+        control_variates.european_call_control(**PARAMS),
+        control_variates.terminal_spot_control(100.0, 0.05, 0.02, 1.0),
+    ]
+    for control in controls:
+        values = control(paths)
+        se = np.std(values) / np.sqrt(len(values))
+        assert abs(np.mean(values) - control.mean) < 4 * se
+
+
+def test_asian_call_geometric_control():
+    """Test the geometric control keeps the price and cuts the error."""
+    m = 12
+    points = np.random.default_rng(2).random((20000, m))
+    controls = [control_variates.geometric_asian_control(m=m, **PARAMS)]
+
+    price, se = pricing.asian_call(m=m, points=points, return_se=True, **PARAMS)
+    cv_price, cv_se = pricing.asian_call(m=m, points=points, return_se=True,
+                                         controls=controls, **PARAMS)
+
+    assert cv_se < se / 10
+    assert abs(cv_price - price) < 3 * se
+
+    # Combined with antithetic pairs
+    anti_price, anti_se = pricing.asian_call(m=m, points=points[:10000], antithetic=True,
+                                             return_se=True, controls=controls, **PARAMS)
+    assert abs(anti_price - cv_price) < 4 * cv_se
+
+
+def test_european_call_control_is_exact():
+    """Test a European call controlled by itself returns Black-Scholes."""
+    points = np.random.default_rng(3).random(5000)
+    controls = [control_variates.european_call_control(**PARAMS)]
+
+    price, se = pricing.european_call_mc(points=points, return_se=True,
+                                         controls=controls, **PARAMS)
+
+    assert np.isclose(price, analytical.black_scholes_call(**PARAMS))
+    assert se == pytest.approx(0.0, abs=1e-10)
+
+
+def test_controls_with_zero_points():
+    """Test points with a zero coordinate do not break the antithetic regression."""
+    points = np.random.default_rng(4).random(4096)
+    points[::512] = 0.0
+    controls = [control_variates.terminal_spot_control(PARAMS['S0'], PARAMS['r'],
+                                                       PARAMS['delta'], PARAMS['T'])]
+
+    price, se = pricing.european_call_mc(points=points, antithetic=True, return_se=True,
+                                         controls=controls, **PARAMS)
+
+    assert np.isfinite(price) and np.isfinite(se)
+    assert abs(price - analytical.black_scholes_call(**PARAMS)) < 4 * se
+
+
+def test_pipeline_controls_match_pricer():
+    """Test the streaming estimate equals the one-shot pricer."""
+    m = 12
+    points = np.random.default_rng(4).random((5000, m))
+    controls = [control_variates.geometric_asian_control(m=m, **PARAMS),
+                control_variates.terminal_spot_control(100.0, 0.05, 0.02, 1.0)]
+
+    def payoff(S):
+        return np.maximum(np.mean(S[:, 1:], axis=1) - 100.0, 0)
+
+    params = {key: value for key, value in PARAMS.items() if key != 'K'}
+    result = pipeline.price_paths(payoff, points, 5000, chunk_size=700,
+                                  controls=controls, **params)
+    price, se = pricing.asian_call(m=m, points=points, return_se=True,
+                                   controls=controls, **PARAMS)
+
+    assert np.isclose(result['price'], price)
+    assert np.isclose(result['std_error'], se)
+    assert result['beta'].shape == (2,)
@@ -0,0 +1,70 @@
+"""
+Tests for discrepancy measures.
+"""
+
+import pytest
+import numpy as np
+from scipy.stats import qmc
+from qmc_options import discrepancy, generators
+
+
+@pytest.fixture
+def random_points():
+    return np.random.default_rng(0).random((257, 4))
+
+
+@pytest.mark.parametrize("func, method", [
+    (discrepancy.l2_star_discrepancy, "L2-star"),
+    (discrepancy.centered_l2_discrepancy, "CD"),
+    (discrepancy.wraparound_l2_discrepancy, "WD"),
+])
+def test_matches_scipy(func, method, random_points):
+    """Test against scipy (L2-star as D, the others as D^2)."""
+    expected = qmc.discrepancy(random_points, method=method)
+    squared = method != "L2-star"
+
+    assert np.isclose(func(random_points, squared=squared), expected, rtol=1e-10)
+
+
+def test_blocking_does_not_change_result(random_points, monkeypatch):
+    """Test small tiles, split along rows and columns, give the same sums."""
+    expected = discrepancy.centered_l2_discrepancy(random_points)
+    wraparound = discrepancy.wraparound_l2_discrepancy(random_points)
+
+    # 16 x 62 tiles, several per block of rows
+    monkeypatch.setattr(discrepancy, "_BLOCK_ELEMENTS", 1000)
+
+    assert np.isclose(discrepancy.centered_l2_discrepancy(random_points), expected, rtol=1e-12)
+    assert np.isclose(discrepancy.wraparound_l2_discrepancy(random_points), wraparound,
+                      rtol=1e-12)
+
+
+def test_lattice_formula():
+    """Test the O(N*d) lattice formula against the pairwise sum."""
+    N, z = 1021, np.array([1, 76, 359])
+    points = generators.good_lattice_points_nd(N, 3, z)
+
+    expected = discrepancy.wraparound_l2_discrepancy(points)
+
+    assert np.isclose(discrepancy.lattice_wraparound_l2_discrepancy(N, z), expected, rtol=1e-8)
+
+    # Shift invariance
+    shifted = generators.random_shift(points, np.random.default_rng(1))
+    assert np.isclose(discrepancy.wraparound_l2_discrepancy(shifted), expected, rtol=1e-8)
+
+
+def test_qmc_beats_random():
+    """Test low-discrepancy points have smaller discrepancy than random points."""
+    N = 512
+    sobol = generators.sobol(3, N, start=0)
+    random = np.random.default_rng(2).random((N, 3))
+
+    for func in (discrepancy.l2_star_discrepancy, discrepancy.centered_l2_discrepancy,
+                 discrepancy.wraparound_l2_discrepancy):
+        assert func(sobol) < func(random)
+
+
+def test_rejects_points_outside_unit_cube():
+    """Test points outside [0, 1]^d are rejected."""
+    with pytest.raises(ValueError):
+        discrepancy.l2_star_discrepancy(np.array([[0.5, 1.5]]))
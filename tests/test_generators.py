@@ -85,3 +85,139 @@ def test_random_permutation():
     # Check values are from original set (in some order)
     for col in range(points.shape[1]):
         assert set(np.round(permuted[:, col], 5)) == set(np.round(points[:, col], 5))
+
+
+def test_radical_inverse_matches_scalar_recurrence():
+    """Test vectorized radical inverse against the scalar recurrence."""
+    def scalar_van_der_corput(base, n):
+        result, f, i = 0.0, 1.0 / base, n
+        while i > 0:
+            result += f * (i % base)
+            i //= base
+            f /= base
+        return result
+
+    bases = [7, 2, 3, 5, 2, 31]
+    indices = np.array([0, 1, 2, 3, 17, 1000, 123456, 2 ** 40 + 3])
+    values = generators.radical_inverse(indices, bases)
+
+    expected = np.array([[scalar_van_der_corput(b, int(i)) for b in bases]
+                         for i in indices])
+
+    assert values.shape == (len(indices), len(bases))
+    assert np.array_equal(values, expected)
+
+
+def test_halton_matches_van_der_corput():
+    """Test Halton columns are Van der Corput sequences starting at index 1."""
+    primes = [2, 3, 5]
+    N = 50
+    sequence = generators.halton(primes, N)
+
+    for j, p in enumerate(primes):
+        assert np.array_equal(sequence[:, j],
+                              generators.van_der_corput(p, np.arange(1, N + 1)))
+
+
+def test_halton_stream_blocks_and_skip():
+    """Test block generation and skip-ahead of the Halton stream."""
+    primes = [2, 3, 5]
+    full = generators.halton(primes, 100)
+    stream = generators.HaltonStream(primes, block_size=30)
+
+    blocks = list(stream.blocks(100))
+    assert [len(b) for b in blocks] == [30, 30, 30, 10]
+    assert np.array_equal(np.vstack(blocks), full)
+
+    stream.fast_forward(51)
+    assert np.array_equal(stream.next_block(10), full[50:60])
+
+    stream.reset().skip(90)
+    assert np.array_equal(stream.next_block(10), full[90:])
+
+    with pytest.raises(ValueError):
+        stream.skip(-1)
+
+    # The base class is abstract
+    with pytest.raises(TypeError):
+        generators.PointStream()
+
+
+def test_stream_pickle_resume():
+    """Test that a pickled stream resumes where it stopped."""
+    import pickle
+
+    stream = generators.LatticeStream(101, 3, z=[1, 40, 85], block_size=16)
+    stream.next_block()
+    restored = pickle.loads(pickle.dumps(stream))
+
+    assert np.array_equal(restored.next_block(), stream.next_block())
+
+
+def test_lattice_stream_matches_point_set():
+    """Test the lattice stream reproduces good_lattice_points_nd."""
+    N, dim = 64, 4
+    stream = generators.LatticeStream(N, dim, block_size=20)
+
+    assert np.array_equal(np.vstack(list(stream.blocks(N))),
+                          generators.good_lattice_points_nd(N, dim))
+
+
+def test_sobol_matches_reference():
+    """Test Sobol' points against the unscrambled SciPy implementation."""
+    from scipy.stats import qmc
+
+    for dim in [1, 7, 1024]:
+        points = generators.sobol(dim, 256, start=0)
+        expected = qmc.Sobol(dim, scramble=False, bits=30).random(256)
+        assert np.array_equal(points, expected)
+
+
+def test_sobol_properties():
+    """Test shape, range and net property of the Sobol' sequence."""
+    N, dim = 1024, 40
+    points = generators.sobol(dim, N, start=0)
+
+    assert points.shape == (N, dim)
+    assert np.all(points >= 0)
+    assert np.all(points < 1)
+
+    # Each coordinate of the first 2^m points is stratified in 2^m cells
+    cells = np.floor(points * N).astype(int)
+    for j in range(dim):
+        assert len(np.unique(cells[:, j])) == N
+
+    # Default start skips the origin
+    assert np.all(generators.sobol(dim, N) > 0)
+
+
+def test_sobol_stream_skip():
+    """Test the Sobol' stream reproduces arbitrary slices of the sequence."""
+    full = generators.sobol(5, 300)
+    stream = generators.SobolStream(5, block_size=64)
+
+    assert np.array_equal(np.vstack(list(stream.blocks(300))), full)
+
+    stream.fast_forward(101)
+    assert np.array_equal(stream.next_block(50), full[100:150])
+
+
+def test_lattice_sequence_embedded_lattices():
+    """Test the first 2^m points of the sequence are rank-1 lattices."""
+    dim = 6
+    z = generators.lattice.generating_vector(2 ** 20, dim, embedded=True)
+    sequence = generators.lattice_sequence(1024, dim)
+
+    for m in [3, 6, 10]:
+        N = 2 ** m
+        lattice_points = generators.good_lattice_points_nd(N, dim, z % N)
+        assert np.array_equal(np.unique(sequence[:N], axis=0),
+                              np.unique(lattice_points, axis=0))
+
+
+def test_extensible_lattice_stream():
+    """Test the extensible lattice stream against the point set."""
+    full = generators.lattice_sequence(200, 3)
+    stream = generators.ExtensibleLatticeStream(3, block_size=64)
+
+    assert np.array_equal(np.vstack(list(stream.blocks(200))), full)
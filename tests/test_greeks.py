@@ -0,0 +1,83 @@
+"""
+Tests for Greeks estimators.
+"""
+
+import pytest
+import numpy as np
+from scipy import stats
+from qmc_options import greeks, analytical
+
+
+@pytest.fixture
+def option_params():
+    """Standard option parameters for testing."""
+    return {
+        'S0': 100.0,
+        'K': 100.0,
+        'r': 0.05,
+        'delta': 0.02,
+        'sigma': 0.25,
+        'T': 1.0
+    }
+
+
+def scalar_pathwise_vega(S0, K, r, delta, sigma, T, points):
+    """Point-by-point reference of the pathwise vega estimator."""
+    vega_sum = 0.0
+    for u in points:
+        if u > 0:
+            Z = stats.norm.ppf(u)
+            ST = S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
+            if ST > K:
+                vega_sum += ST * (-sigma * T + np.sqrt(T) * Z)
+    return np.exp(-r * T) * vega_sum / len(points)
+
+
+def scalar_likelihood_gamma(S0, K, r, delta, sigma, T, points):
+    """Point-by-point reference of the likelihood-ratio gamma estimator."""
+    gamma_sum = 0.0
+    for u in points:
+        if u > 0:
+            Z = stats.norm.ppf(u)
+            ST = S0 * np.exp((r - delta - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
+            term = ((Z ** 2 - 1) / (sigma ** 2 * T) - Z / (S0 * sigma * np.sqrt(T))) / S0
+            gamma_sum += max(ST - K, 0) * term
+    return np.exp(-r * T) * gamma_sum / len(points)
+
+
+def test_vectorized_matches_scalar_loops(option_params):
+    """Test the array kernels reproduce the point-by-point estimators."""
+    points = np.random.default_rng(0).random(2000)
+    points[[3, 100]] = 0.0
+
+    assert np.isclose(greeks.pathwise_vega_european_call(points=points, **option_params),
+                      scalar_pathwise_vega(points=points, **option_params))
+    assert np.isclose(greeks.likelihood_gamma_european_call(points=points, **option_params),
+                      scalar_likelihood_gamma(points=points, **option_params))
+
+
+@pytest.mark.parametrize("estimator, exact", [
+    (greeks.pathwise_delta_european_call, analytical.call_delta),
+    (greeks.pathwise_vega_european_call, analytical.call_vega),
+    (greeks.likelihood_delta_european_call, analytical.call_delta),
+])
+def test_estimators_against_analytical(option_params, estimator, exact):
+    """Test unbiased estimators converge to the analytical Greeks."""
+    points = (np.arange(200000) + 0.5) / 200000
+
+    value = estimator(points=points, **option_params)
+
+    assert np.isclose(value, exact(**option_params), rtol=1e-2)
+
+
+def test_zero_points_are_masked(option_params):
+    """Test points equal to zero contribute nothing and raise no warnings."""
+    points = np.array([0.0, 0.3, 0.9])
+
+    with np.errstate(all="raise"):
+        for name in dir(greeks):
+            if name.endswith("_european_call"):
+                value = getattr(greeks, name)(points=points, **option_params)
+                reference = getattr(greeks, name)(points=points[1:], **option_params)
+                assert np.isfinite(value)
+                assert np.isclose(value * 3, reference * 2)
@@ -0,0 +1,87 @@
+"""
+Tests for importance sampling.
+"""
+
+import numpy as np
+from qmc_options import importance_sampling, pricing, analytical, generators
+
+
+PARAMS = {'S0': 100.0, 'r': 0.05, 'delta': 0.02, 'sigma': 0.2, 'T': 1.0}
+
+
+def test_likelihood_ratio_is_unbiased():
+    """Test the weighted mean of a function under the shift is unchanged."""
+    drift = np.array([0.5, -1.0])
+    Z = importance_sampling.shift(np.random.default_rng(0).standard_normal((200000, 2)), drift)
+    weights = importance_sampling.likelihood_ratio(Z, drift)
+
+    assert abs(np.mean(weights) - 1) < 0.02
+    assert abs(np.mean(weights * Z[:, 0] ** 2) - 1) < 0.03
+
+
+def test_optimal_drift_european():
+    """Test the drift of a deep OTM call points to the exercise region."""
+    K = 180.0
+    a = (PARAMS['r'] - PARAMS['delta'] - 0.5 * PARAMS['sigma'] ** 2) * PARAMS['T']
+    b = PARAMS['sigma'] * np.sqrt(PARAMS['T'])
+
+    def intrinsic(Z):
+        return PARAMS['S0'] * np.exp(a + b * Z[:, 0]) - K
+
+    drift = importance_sampling.optimal_drift(intrinsic, 1, scale=K)
+
+    # Beyond the strike boundary (log(K/S0) - a) / b
+    assert drift.shape == (1,)
+    assert drift[0] > (np.log(K / PARAMS['S0']) - a) / b
+
+
+def test_european_call_deep_otm():
+    """Test importance sampling against Black-Scholes for a deep OTM call."""
+    points = np.random.default_rng(1).random(10000)
+    bs_price = analytical.black_scholes_call(K=180.0, **PARAMS)
+
+    _, se = pricing.european_call_mc(K=180.0, points=points, return_se=True, **PARAMS)
+    price, is_se = pricing.european_call_mc(K=180.0, points=points, return_se=True,
+                                            drift="optimal", **PARAMS)
+
+    assert abs(price - bs_price) < 4 * is_se
+    assert is_se < se / 10
+
+    # QMC points work the same way
+    qmc_price = pricing.european_call_mc(K=180.0, points=generators.halton([2], 4096)[:, 0],
+                                         drift="optimal", **PARAMS)
+    assert abs(qmc_price - bs_price) / bs_price < 0.01
+
+    # Lattice sequences start at the origin, which must not poison the weights
+    lattice_price = pricing.european_call_mc(
+        K=180.0, points=generators.lattice_sequence(4096, 1)[:, 0], drift="optimal", **PARAMS
+    )
+    assert np.isfinite(lattice_price)
+    assert abs(lattice_price - bs_price) / bs_price < 0.01
+
+
+def test_path_pricers_deep_otm():
+    """Test importance sampling reduces the error of the path pricers."""
+    points = np.random.default_rng(2).random((10000, 12))
+    cases = [
+        (pricing.asian_call, {'K': 150.0, 'm': 12}),
+        (pricing.lookback_call, {'K': 200.0}),
+        (pricing.lookback_put, {'K': 60.0}),
+    ]
+    for pricer, extra in cases:
+        price, se = pricer(points=points, return_se=True, **extra, **PARAMS)
+        is_price, is_se = pricer(points=points, return_se=True, drift="optimal",
+                                 **extra, **PARAMS)
+        assert is_se < se / 5
+        assert abs(is_price - price) < 4 * se
+
+
+def test_explicit_drift_and_antithetic():
+    """Test a given drift and its combination with antithetic pairs."""
+    points = np.random.default_rng(3).random(20000)
+    bs_price = analytical.black_scholes_call(K=140.0, **PARAMS)
+
+    price, se = pricing.european_call_mc(K=140.0, points=points, return_se=True,
+                                         drift=[2.0], antithetic=True, **PARAMS)
+
+    assert abs(price - bs_price) < 4 * se
@@ -0,0 +1,78 @@
+"""
+Tests for the inverse normal CDF.
+"""
+
+import pytest
+import numpy as np
+from scipy import stats
+from qmc_options.inverse_normal import norm_ppf
+
+
+@pytest.fixture
+def probabilities():
+    rng = np.random.default_rng(0)
+    return np.concatenate([rng.random(50000), np.logspace(-300, -2, 500),
+                           1 - np.logspace(-15, -2, 500)])
+
+
+@pytest.mark.parametrize("method, tol", [("as241", 1e-14), ("acklam", 1.2e-9)])
+def test_matches_scipy(probabilities, method, tol):
+    """Test accuracy against scipy over the body and both tails."""
+    expected = stats.norm.ppf(probabilities)
+    result = norm_ppf(probabilities, method)
+
+    assert result.dtype == np.float64
+    assert np.max(np.abs(result - expected) / np.maximum(1, np.abs(expected))) < tol
+
+
+def test_edges_and_scalars():
+    """Test 0, 1, invalid inputs and scalar input."""
+    result = norm_ppf(np.array([0.0, 1.0, -0.5, 1.5, np.nan, 0.5]))
+
+    assert result[0] == -np.inf and result[1] == np.inf
+    assert np.all(np.isnan(result[2:5]))
+    assert result[5] == 0
+
+    value = norm_ppf(0.975)
+    assert np.ndim(value) == 0
+    assert np.isclose(value, 1.959963984540054)
+
+
+def test_float32_and_out():
+    """Test single precision and writing into a provided array."""
+    p = np.random.default_rng(1).random((300, 7))
+
+    result32 = norm_ppf(p.astype(np.float32))
+    assert result32.dtype == np.float32
+    assert np.allclose(result32, stats.norm.ppf(p), atol=1e-4)
+
+    out = np.empty_like(p)
+    assert norm_ppf(p, out=out) is out
+    assert np.allclose(out, stats.norm.ppf(p))
+
+    # In place, including a non-contiguous view
+    q = p.copy()
+    norm_ppf(q, out=q)
+    assert np.allclose(q, stats.norm.ppf(p))
+
+    q = p.copy()
+    norm_ppf(q[:, ::2], out=q[:, ::2])
+    assert np.allclose(q[:, ::2], stats.norm.ppf(p[:, ::2]))
+    assert np.array_equal(q[:, 1::2], p[:, 1::2])
+
+
+def test_chunking(monkeypatch):
+    """Test chunk boundaries do not change the result."""
+    from qmc_options import inverse_normal
+
+    p = np.random.default_rng(2).random(1000)
+    expected = norm_ppf(p)
+
+    monkeypatch.setattr(inverse_normal, "_CHUNK_ELEMENTS", 7)
+
+    assert np.array_equal(norm_ppf(p), expected)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        norm_ppf(0.5, method="fast")
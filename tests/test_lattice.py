@@ -0,0 +1,119 @@
+"""
+Tests for the construction of lattice generating vectors.
+"""
+
+import pytest
+import numpy as np
+from qmc_options import lattice, generators
+
+
+def _greedy_is_optimal(N, z, weights=None):
+    """Check every component of z minimizes the error given the previous ones."""
+    units = [c for c in range(1, N) if np.gcd(c, N) == 1]
+
+    for s in range(1, len(z)):
+        error = lattice.worst_case_error(N, z[:s + 1], weights)
+        best = min(lattice.worst_case_error(N, list(z[:s]) + [c], weights)
+                   for c in units)
+        if not np.isclose(error, best, rtol=1e-10):
+            return False
+
+    return True
+
+
+@pytest.mark.parametrize("N", [2, 31, 101, 64, 128, 100])
+def test_cbc_components_are_optimal(N):
+    """Test fast (prime, power of two) and direct CBC against brute force."""
+    z = lattice.cbc_generating_vector(N, 4)
+
+    assert len(z) == 4
+    assert z[0] == 1
+    assert _greedy_is_optimal(N, z)
+
+
+def test_cbc_weights():
+    """Test custom product weights are honoured."""
+    weights = [1.0, 0.5, 0.25]
+    z = lattice.cbc_generating_vector(127, 3, weights=weights)
+
+    assert _greedy_is_optimal(127, z, weights)
+
+
+def test_cbc_improves_default_vector():
+    """Test CBC vector beats the naive z = (1, 2, ..., dim)."""
+    N, dim = 1024, 8
+    z = lattice.cbc_generating_vector(N, dim)
+
+    assert (lattice.worst_case_error(N, z) <
+            lattice.worst_case_error(N, np.arange(1, dim + 1)))
+
+    points = generators.good_lattice_points_nd(N, dim, z)
+    assert points.shape == (N, dim)
+
+
+def test_worst_case_error_one_dimension():
+    """Test the error of the 1-D lattice against its closed form."""
+    N = 50
+    # sum_k omega(k/N) / N = 2 pi^2 B2(0) / N^2 = pi^2 / (3 N^2)
+    expected = np.sqrt(np.pi ** 2 / (3 * N ** 2))
+
+    assert np.isclose(lattice.worst_case_error(N, [1], weights=1.0), expected)
+
+
+def test_generating_vector_bundled_tables():
+    """Test bundled vectors for powers of two and Fibonacci sizes."""
+    z = lattice.generating_vector(1024, 16)
+    assert np.array_equal(z, lattice.cbc_generating_vector(1024, 16))
+
+    # Fibonacci lattice of good_lattice_points(m=12): N = 144, z = (1, 89)
+    assert np.array_equal(lattice.generating_vector(144, 2), [1, 89])
+    assert np.array_equal(generators.good_lattice_points_nd(144, 2),
+                          generators.good_lattice_points(12))
+
+
+def test_generating_vector_file_cache(lattice_cache_dir):
+    """Test lazy population and reuse of the on-disk cache."""
+    N, dim = 97, 5
+    lattice._memory_table.clear()
+
+    z = lattice.generating_vector(N, dim, weights=0.5)
+    files = list(lattice_cache_dir.iterdir())
+    assert len(files) == 1
+
+    # A fresh process (empty memory table) reads the file instead of searching
+    lattice._memory_table.clear()
+    np.save(files[0], np.array([1, 2, 3, 4, 5, 6]))
+    assert np.array_equal(lattice.generating_vector(N, dim, weights=0.5), [1, 2, 3, 4, 5])
+
+    # Prefix property: a shorter request is served from the stored vector
+    assert np.array_equal(lattice.generating_vector(N, 3, weights=0.5), [1, 2, 3])
+
+    # Asking for more dimensions than stored triggers a new search
+    assert np.array_equal(lattice.generating_vector(N, 7, weights=0.5)[:dim], z)
+
+
+def test_large_composite_size_rejected(lattice_cache_dir):
+    """Test no poor default vector is returned for a large composite N."""
+    lattice._memory_table.clear()
+
+    with pytest.raises(ValueError, match="prime or a power of two"):
+        lattice.generating_vector(30000, 4, weights=0.5)
+
+
+def test_weight_profiles():
+    """Test weight specifications map to distinct table keys."""
+    profiles = {lattice.weight_profile(None), lattice.weight_profile(0.5),
+                lattice.weight_profile([1.0, 0.5]), lattice.weight_profile([1.0, 0.25])}
+    assert len(profiles) == 4
+
+
+def test_embedded_vector_good_for_all_sizes():
+    """Test the embedded vector is close to optimal at every size 2^m."""
+    m_max, dim = 10, 6
+    z = lattice.embedded_generating_vector(m_max, dim)
+
+    for m in range(4, m_max + 1):
+        N = 2 ** m
+        embedded_error = lattice.worst_case_error(N, z % N)
+        best_error = lattice.worst_case_error(N, lattice.cbc_generating_vector(N, dim))
+        assert embedded_error < 1.5 * best_error
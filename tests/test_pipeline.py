@@ -0,0 +1,81 @@
+"""
+Tests for the chunked pricing pipeline.
+"""
+
+import pytest
+import numpy as np
+from qmc_options import pipeline, pricing, generators
+
+
+PARAMS = {'S0': 100.0, 'r': 0.05, 'delta': 0.02, 'sigma': 0.25, 'T': 1.0}
+
+
+def asian_payoff(S):
+    return np.maximum(np.mean(S[:, 1:], axis=1) - 100.0, 0)
+
+
+def test_running_stats():
+    """Test chunked mean and variance equal the full-sample values."""
+    samples = np.random.default_rng(0).standard_normal(1000) * 3 + 10
+    stats = pipeline.RunningStats()
+    for chunk in np.array_split(samples, [1, 7, 300, 301, 999]):
+        stats.update(chunk)
+
+    assert stats.count == 1000
+    assert np.isclose(stats.mean, np.mean(samples))
+    assert np.isclose(stats.variance, np.var(samples, ddof=1))
+    assert np.isclose(stats.std_error, np.std(samples, ddof=1) / np.sqrt(1000))
+
+
+def test_running_stats_along_axis():
+    """Test several statistics tracked at once along the last axis."""
+    samples = np.random.default_rng(1).standard_normal((3, 500)) * [[1], [2], [5]]
+    stats = pipeline.RunningStats()
+    for chunk in np.array_split(samples, [10, 250], axis=1):
+        stats.update(chunk, axis=-1)
+
+    assert np.allclose(stats.mean, samples.mean(axis=1))
+    assert np.allclose(stats.variance, samples.var(axis=1, ddof=1))
+
+
+@pytest.mark.parametrize("construction", ["standard", "bridge"])
+def test_matches_asian_call(construction):
+    """Test chunked pricing equals the in-memory Asian pricer."""
+    m, N = 12, 5000
+    points = generators.sobol(m, N)
+
+    expected = pricing.asian_call(K=100.0, m=m, points=points, construction=construction,
+                                  **PARAMS)
+
+    from_array = pipeline.price_paths(asian_payoff, points, N, chunk_size=777,
+                                      construction=construction, **PARAMS)
+    from_stream = pipeline.price_paths(asian_payoff, generators.SobolStream(m), N,
+                                       chunk_size=1000, construction=construction, **PARAMS)
+
+    assert np.isclose(from_array['price'], expected)
+    assert np.isclose(from_stream['price'], expected)
+    assert from_array['paths'] == N and from_array['chunk_size'] == 777
+
+
+def test_memory_budget_bounds_chunk_size():
+    """Test the default chunk size follows the memory budget."""
+    m = 252
+    budget = 1 << 20
+
+    result = pipeline.price_paths(asian_payoff, generators.HaltonStream([2, 3, 5]), 2000,
+                                  m=3, memory_budget=budget, **PARAMS)
+    assert result['chunk_size'] == min(2000, pipeline.max_chunk_size(3, budget))
+
+    chunk = pipeline.max_chunk_size(m, budget)
+    assert 2 * 8 * (3 * m + 1) * chunk <= budget
+
+
+def test_optimal_chunk_size():
+    """Test the tuner reports throughput for candidates within the budget."""
+    budget = 4 << 20
+    best, throughput = pipeline.optimal_chunk_size(16, budget, trial_paths=4096,
+                                                   rng=np.random.default_rng(1))
+
+    assert best in throughput
+    assert all(c <= pipeline.max_chunk_size(16, budget) for c in throughput)
+    assert all(t > 0 for t in throughput.values())
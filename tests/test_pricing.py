@@ -4,7 +4,7 @@ Tests for option pricing functions.
 
 import pytest
 import numpy as np
-from qmc_options import pricing, analytical, generators
+from qmc_options import pricing, analytical, generators, simulation
 
 
 @pytest.fixture
@@ -68,6 +68,179 @@ def test_spread_option_zero_strike():
     assert rel_error < 0.10  # Within 10%
 
 
+def test_antithetic_pricers(option_params):
+    """Antithetic pairs stay unbiased and reduce the standard error."""
+    rng = np.random.default_rng(7)
+    points = rng.random(20000)
+
+    bs_price = analytical.black_scholes_call(**option_params)
+    price, se = pricing.european_call_mc(points=points, return_se=True, **option_params)
+    anti_price, anti_se = pricing.european_call_mc(points=points[:10000], antithetic=True,
+                                                   return_se=True, **option_params)
+
+    assert abs(anti_price - bs_price) < 3 * anti_se
+    assert 0 < anti_se < se
+
+    # The mirrored sample of u is 1 - u
+    mirrored = np.concatenate([points[:10000], 1 - points[:10000]])
+    assert np.isclose(anti_price, pricing.european_call_mc(points=mirrored, **option_params))
+
+    paths = rng.random((10000, 12))
+    for pricer in (pricing.lookback_call, pricing.lookback_put):
+        _, se = pricer(points=paths, return_se=True, **option_params)
+        _, anti_se = pricer(points=paths[:5000], antithetic=True, return_se=True,
+                            **option_params)
+        assert 0 < anti_se < se
+
+    _, se = pricing.asian_call(m=12, points=paths, return_se=True, **option_params)
+    _, anti_se = pricing.asian_call(m=12, points=paths[:5000], antithetic=True,
+                                    return_se=True, **option_params)
+    assert 0 < anti_se < se
+
+
+def test_spread_option_antithetic():
+    """Antithetic spread option against Margrabe."""
+    params = dict(w1=1.0, w2=1.0, r=0.05, K=0.0, S10=100, S20=110,
+                  delta1=0.05, delta2=0.05, sigma1=0.3, sigma2=0.2, rho12=0.8, T=1.0)
+    margrabe_price = analytical.margrabe_formula(
+        S10=100, S20=110, delta1=0.05, delta2=0.05,
+        sigma1=0.3, sigma2=0.2, rho12=0.8, T=1.0
+    )
+
+    points = np.random.default_rng(3).random((5000, 2))
+    price, se = pricing.spread_option(points=points, antithetic=True, return_se=True, **params)
+
+    assert se > 0
+    assert abs(price - margrabe_price) < 4 * se
+
+
+def test_spread_option_ladder():
+    """Test a batch over strikes and correlations equals single contracts."""
+    params = dict(w1=1.0, w2=1.0, r=0.05, S10=100, S20=110, delta1=0.05, delta2=0.05,
+                  sigma1=0.3, sigma2=0.2, T=1.0)
+    points = generators.good_lattice_points_nd(4000, 2)
+    strikes = np.array([0.0, 5.0, 10.0, 20.0])
+    correlations = np.array([-0.5, 0.3, 0.8])
+
+    prices, errors = pricing.spread_option(points=points, K=strikes,
+                                           rho12=correlations[:, None],
+                                           return_se=True, **params)
+
+    assert prices.shape == errors.shape == (3, 4)
+    for i, rho12 in enumerate(correlations):
+        for j, K in enumerate(strikes):
+            single = pricing.spread_option(points=points, K=K, rho12=rho12, **params)
+            assert np.isclose(prices[i, j], single)
+
+    # Prices decrease with the strike and with the correlation
+    assert np.all(np.diff(prices, axis=1) < 0)
+    assert np.all(np.diff(prices, axis=0) < 0)
+
+
+@pytest.mark.parametrize("rho12", [-0.99, -0.5, 0.0, 0.8, 0.99])
+def test_spread_option_quadrature_margrabe(rho12):
+    """Test the quadrature reaches 10 digits against Margrabe for K=0."""
+    price, error = pricing.spread_option_quadrature(
+        w1=1.0, w2=1.0, r=0.05, K=0.0, S10=100, S20=110, delta1=0.05, delta2=0.05,
+        sigma1=0.3, sigma2=0.2, rho12=rho12, T=1.0
+    )
+    margrabe_price = analytical.margrabe_formula(
+        S10=100, S20=110, delta1=0.05, delta2=0.05,
+        sigma1=0.3, sigma2=0.2, rho12=rho12, T=1.0
+    )
+
+    assert abs(price - margrabe_price) < 1e-9
+    assert error < 1e-9
+
+
+def test_spread_option_quadrature_strikes():
+    """Test the quadrature ladder against QMC for nonzero strikes."""
+    params = dict(w1=1.0, w2=1.0, r=0.05, S10=100, S20=110, delta1=0.05, delta2=0.05,
+                  sigma1=0.3, sigma2=0.2, rho12=0.5, T=1.0)
+    strikes = np.array([-5.0, 5.0, 20.0])
+
+    prices, errors = pricing.spread_option_quadrature(K=strikes, **params)
+    qmc = pricing.spread_option(points=generators.good_lattice_points_nd(2 ** 14, 2),
+                                K=strikes, **params)
+
+    assert prices.shape == errors.shape == (3,)
+    assert np.all(errors < 1e-9)
+    assert np.allclose(prices, qmc, rtol=1e-3)
+
+    # A negative strike with perfect correlation is a forward contract
+    forward, _ = pricing.spread_option_quadrature(
+        w1=1.0, w2=1.0, r=0.05, K=-200.0, S10=100, S20=110, delta1=0.05,
+        delta2=0.05, sigma1=0.3, sigma2=0.3, rho12=1.0, T=1.0
+    )
+    assert np.isclose(forward, 110 * np.exp(-0.05) - 100 * np.exp(-0.05) + 200 * np.exp(-0.05))
+
+
+def test_spread_option_negative_strike():
+    """Test strikes below -w1*S1 are exercised and match the quadrature."""
+    params = dict(w1=1.0, w2=1.0, r=0.05, S10=100, S20=110, delta1=0.05, delta2=0.05,
+                  sigma1=0.3, sigma2=0.2, rho12=0.5, T=1.0)
+    strikes = np.array([-300.0, -60.0])
+
+    exact, _ = pricing.spread_option_quadrature(K=strikes, **params)
+    price, se = pricing.spread_option(points=np.random.default_rng(7).random((20000, 2)),
+                                      K=strikes, return_se=True, **params)
+    qmc = pricing.spread_option(points=generators.good_lattice_points_nd(2 ** 14, 2),
+                                K=strikes, **params)
+
+    assert np.all(np.isfinite(price))
+    assert np.all(np.abs(price - exact) < 4 * se)
+    assert np.allclose(qmc, exact, rtol=1e-3)
+
+
+def test_spread_approximations_accuracy():
+    """Test Kirk and Bjerksund-Stensland against the quadrature for K != 0."""
+    params = dict(S10=100, S20=110, r=0.05, delta1=0.05, delta2=0.05,
+                  sigma1=0.3, sigma2=0.2, rho12=0.5, T=1.0)
+    strikes = np.array([-5.0, 5.0, 20.0])
+
+    exact, _ = pricing.spread_option_quadrature(w1=1.0, w2=1.0, K=strikes, **params)
+    kirk = analytical.kirk_spread(K=strikes, **params)
+    bjerksund = analytical.bjerksund_stensland_spread(K=strikes, **params)
+
+    assert np.allclose(kirk, exact, rtol=1e-2)
+    assert np.allclose(bjerksund, exact, rtol=1e-3)
+
+
+def test_spread_option_kirk_control():
+    """Test the Kirk control variate cuts the error and stays unbiased."""
+    params = dict(w1=1.0, w2=np.array([[1.0], [1.5]]), r=0.05, S10=100, S20=110,
+                  delta1=0.05, delta2=0.05, sigma1=0.3, sigma2=0.2, rho12=0.5, T=1.0)
+    strikes = np.array([-5.0, 5.0, 20.0, 40.0])
+    points = np.random.default_rng(5).random((20000, 2))
+
+    exact, _ = pricing.spread_option_quadrature(K=strikes, **params)
+    plain, plain_se = pricing.spread_option(points=points, K=strikes, return_se=True,
+                                            **params)
+    price, se = pricing.spread_option(points=points, K=strikes, return_se=True,
+                                      control="kirk", **params)
+
+    assert price.shape == se.shape == (2, 4)
+    assert np.all(se < plain_se / 4)
+    assert np.all(np.abs(price - exact) < 4 * se)
+
+    # Antithetic pairs combine with the control
+    price, se = pricing.spread_option(points=points, K=5.0, w1=1.0, w2=1.0, r=0.05,
+                                      S10=100, S20=110, delta1=0.05, delta2=0.05,
+                                      sigma1=0.3, sigma2=0.2, rho12=0.5, T=1.0,
+                                      antithetic=True, return_se=True, control="kirk")
+    assert abs(price - exact[0, 1]) < 4 * se
+
+    # Strikes that make w1*S1 + K negative on some paths
+    strikes = np.array([-60.0, -20.0])
+    exact, _ = pricing.spread_option_quadrature(K=strikes, **params)
+    price, se = pricing.spread_option(points=points, K=strikes, return_se=True,
+                                      control="kirk", **params)
+    assert np.all(np.abs(price - exact) < 4 * se)
+
+    with pytest.raises(ValueError):
+        pricing.spread_option(points=points, K=5.0, control="margrabe", **params)
+
+
 def test_asian_call(option_params):
     """Test Asian call option pricing."""
     # Generate QMC points
@@ -87,6 +260,42 @@ def test_asian_call(option_params):
     assert price > 0
 
 
+def test_asian_call_path_constructions(option_params):
+    """Test the bridge and PCA constructions price the same Asian option."""
+    m = 16
+    points = generators.sobol(m, 4095)
+
+    standard = pricing.asian_call(m=m, points=points, **option_params)
+
+    for construction in ("bridge", "pca", "pca_fft"):
+        price = pricing.asian_call(m=m, points=points, construction=construction,
+                                   **option_params)
+        assert abs(price - standard) < 0.05 * standard
+
+
+def test_basket_call(option_params):
+    """Test basket calls against Black-Scholes in degenerate cases."""
+    bs_price = analytical.black_scholes_call(**option_params)
+    params = {k: option_params[k] for k in ('S0', 'K', 'r', 'delta', 'sigma', 'T')}
+
+    # One asset
+    price = pricing.basket_call(corr=np.eye(1), weights=[1.0],
+                                points=generators.sobol(1, 4095), **params)
+    assert abs(price - bs_price) / bs_price < 0.01
+
+    # Perfectly correlated identical assets (singular matrix)
+    price = pricing.basket_call(corr=np.ones((3, 3)), weights=[0.2, 0.3, 0.5],
+                                points=generators.sobol(3, 4095),
+                                factorization="eigen", **params)
+    assert abs(price - bs_price) / bs_price < 0.01
+
+    # Diversification lowers the price
+    corr = 0.5 * np.eye(3) + 0.5
+    price = pricing.basket_call(corr=corr, weights=np.ones(3) / 3, m=2,
+                                points=generators.sobol(6, 4095), **params)
+    assert 0 < price < bs_price
+
+
 def test_lookback_call(option_params):
     """Test lookback call option pricing."""
     # Generate QMC points
@@ -120,6 +329,93 @@ def test_lookback_put(option_params):
     assert price > 0
 
 
+def test_lookback_options_one_pass(option_params):
+    """Test the chunked one-pass lookbacks against the single pricers."""
+    points = generators.halton([2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37], 3000)
+
+    prices = pricing.lookback_options(points=points, chunk_size=700, **option_params)
+
+    assert np.isclose(prices['fixed_call'], pricing.lookback_call(points=points, **option_params))
+    assert np.isclose(prices['fixed_put'], pricing.lookback_put(points=points, **option_params))
+
+    # Floating strikes together pay max S - min S
+    params = {key: value for key, value in option_params.items() if key != 'K'}
+    paths = simulation.gbm_paths(Z=simulation.qmc_to_normal(points), **params)
+    range_price = np.exp(-option_params['r']) * np.mean(paths.max(axis=1) - paths.min(axis=1))
+    assert prices['floating_call'] > 0 and prices['floating_put'] > 0
+    assert np.isclose(prices['floating_call'] + prices['floating_put'], range_price)
+
+    # A point stream gives the same prices as its point array
+    stream = generators.HaltonStream([2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37])
+    streamed = pricing.lookback_options(points=stream, N=3000, return_se=True, **option_params)
+    for name, price in prices.items():
+        assert np.isclose(streamed[name][0], price)
+        assert streamed[name][1] > 0
+
+
+def test_lookback_continuity_correction(option_params):
+    """Test the BGK shift removes most of the discrete-monitoring bias."""
+    params = {key: value for key, value in option_params.items() if key != 'K'}
+    exact = analytical.floating_lookback_call(**params)
+    points = np.random.default_rng(5).random((40000, 12))
+
+    discrete = pricing.lookback_options(points=points, **option_params)['floating_call']
+    corrected = pricing.lookback_options(points=points, correction="bgk",
+                                         **option_params)['floating_call']
+
+    assert abs(corrected - exact) < abs(discrete - exact) / 3
+
+    # The single pricers apply the same shift
+    fixed = pricing.lookback_options(points=points, correction="bgk", **option_params)
+    assert np.isclose(fixed['fixed_call'],
+                      pricing.lookback_call(points=points, correction="bgk", **option_params))
+
+    with pytest.raises(ValueError):
+        pricing.lookback_put(points=points, correction="bridge", **option_params)
+
+
+def test_barrier_call_continuous(option_params):
+    """Test the corrected barrier prices against the continuous formula."""
+    exact = analytical.down_and_out_call(H=90.0, **option_params)
+    points = np.random.default_rng(6).random((40000, 12))
+
+    discrete = pricing.barrier_call(points=points, lower=90.0, **option_params)
+    bgk = pricing.barrier_call(points=points, lower=90.0, correction="bgk", **option_params)
+    bridge, se = pricing.barrier_call(points=points, lower=90.0, correction="bridge",
+                                      return_se=True, **option_params)
+
+    assert discrete - exact > 5 * se
+    assert abs(bgk - exact) < 4 * se
+    assert abs(bridge - exact) < 4 * se
+
+
+def test_barrier_knock_in_out_parity(option_params):
+    """Test knock-in plus knock-out is the vanilla option on the same paths."""
+    points = np.random.default_rng(7).random((5000, 12))
+    params = {key: value for key, value in option_params.items() if key != 'K'}
+    paths = simulation.gbm_paths(Z=simulation.qmc_to_normal(points), **params)
+    vanilla = np.exp(-option_params['r']) * np.mean(np.maximum(option_params['K'] - paths[:, -1], 0))
+
+    for correction in (None, "bgk", "bridge"):
+        kwargs = dict(points=points, lower=80.0, upper=125.0, correction=correction)
+        knock_out = pricing.barrier_put(**kwargs, **option_params)
+        knock_in = pricing.barrier_put(knock="in", **kwargs, **option_params)
+        assert np.isclose(knock_in + knock_out, vanilla)
+
+
+def test_double_barrier_bridge_grid_independent(option_params):
+    """Test the bridge correction gives the same price on coarse and fine grids."""
+    prices = []
+    for m in (4, 52):
+        points = np.random.default_rng(m).random((40000, m))
+        prices.append(pricing.barrier_call(points=points, lower=80.0, upper=130.0,
+                                           correction="bridge", return_se=True,
+                                           **option_params))
+
+    (coarse, se_coarse), (fine, se_fine) = prices
+    assert abs(coarse - fine) < 4 * np.hypot(se_coarse, se_fine)
+
+
 def test_mc_qmc_comparison_european():
     """Compare MC and QMC for European option."""
     params = {
@@ -152,3 +448,48 @@ def test_mc_qmc_comparison_european():
     # (though not guaranteed for single run)
     assert qmc_error < 0.10
     assert mc_error < 0.10
+
+
+def test_price_stream_matches_full_point_set(option_params):
+    """Test block-wise pricing from a stream against the full point set."""
+    primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+    N = 500
+    points = generators.halton(primes, N)
+
+    full_price = pricing.asian_call(m=12, points=points, **option_params)
+
+    stream = generators.HaltonStream(primes, block_size=128)
+    stream_price = pricing.price_stream(pricing.asian_call, stream, N,
+                                        m=12, **option_params)
+
+    assert np.isclose(stream_price, full_price, rtol=1e-12)
+    assert stream.index == N + 1
+
+
+def test_asian_call_sobol_points(option_params):
+    """Test Asian call priced with Sobol' points is consistent with Halton."""
+    m = 12
+    sobol_price = pricing.asian_call(m=m, points=generators.sobol(m, 1023),
+                                     **option_params)
+    halton_price = pricing.asian_call(
+        m=m, points=generators.halton([2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37], 1023),
+        **option_params)
+
+    assert abs(sobol_price - halton_price) / halton_price < 0.05
+
+
+def test_sequential_convergence_reuses_points(option_params):
+    """Test incremental refinement equals pricing each prefix from scratch."""
+    m = 8
+    sizes = [64, 128, 256]
+    stream = generators.ExtensibleLatticeStream(m, block_size=50)
+
+    prices = pricing.sequential_convergence(pricing.asian_call, stream, sizes,
+                                            m=m, **option_params)
+
+    for N, price in zip(sizes, prices):
+        points = generators.lattice_sequence(N, m)
+        expected = pricing.asian_call(m=m, points=points, **option_params)
+        assert np.isclose(price, expected, rtol=1e-12)
+
+    assert stream.index == sizes[-1]
@@ -0,0 +1,81 @@
+"""
+Tests for randomized quasi-Monte Carlo.
+"""
+
+import pytest
+import numpy as np
+from qmc_options import rqmc, generators, pricing, analytical
+
+
+METHODS = ["shift", "digital_shift", "linear", "nested"]
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_randomize_shape_and_range(method):
+    """Test replicates have the expected shape and stay in [0, 1)."""
+    points = generators.sobol(4, 128, start=0)
+    copies = rqmc.randomize(points, 5, method, np.random.default_rng(0))
+
+    assert copies.shape == (5, 128, 4)
+    assert np.all(copies >= 0)
+    assert np.all(copies < 1)
+
+    # Replicates are independent randomizations
+    assert not np.allclose(copies[0], copies[1])
+
+
+@pytest.mark.parametrize("method", METHODS[1:])
+def test_randomize_preserves_stratification(method):
+    """Test digital methods keep one point per elementary cell in base 3."""
+    N = 3 ** 5
+    points = generators.radical_inverse(np.arange(N), [2, 3])
+    copies = rqmc.randomize(points, 4, method, np.random.default_rng(1), bases=[2, 3])
+
+    for r in range(4):
+        cells = np.floor(copies[r, :, 1] * N).astype(int)
+        assert len(np.unique(cells)) == N
+
+
+@pytest.mark.parametrize("method", METHODS[1:])
+def test_randomize_composite_base(method):
+    """Test digital methods stay bijective on the digits of a composite base."""
+    N = 4 ** 4
+    points = generators.radical_inverse(np.arange(N), [4])
+    copies = rqmc.randomize(points, 8, method, np.random.default_rng(2), bases=4)
+
+    for r in range(8):
+        cells = np.floor(copies[r, :, 0] * N).astype(int)
+        assert len(np.unique(cells)) == N
+
+
+def test_randomize_reproducible():
+    """Test the generator fully determines the randomization."""
+    points = generators.halton([2, 3, 5], 64)
+    a = rqmc.randomize(points, 3, "nested", np.random.default_rng(7), bases=[2, 3, 5])
+    b = rqmc.randomize(points, 3, "nested", np.random.default_rng(7), bases=[2, 3, 5])
+
+    assert np.array_equal(a, b)
+
+
+def test_randomize_unknown_method():
+    """Test an unknown randomization is rejected."""
+    with pytest.raises(ValueError):
+        rqmc.randomize(np.zeros((4, 2)), 2, "permutation")
+
+
+@pytest.mark.parametrize("method", ["shift", "nested"])
+def test_rqmc_price_confidence_interval(method):
+    """Test RQMC European call estimate and error bar."""
+    params = {'S0': 100.0, 'K': 100.0, 'r': 0.05, 'delta': 0.02,
+              'sigma': 0.2, 'T': 1.0}
+    points = generators.sobol(1, 1023)[:, 0]
+
+    result = rqmc.rqmc_price(pricing.european_call_mc, points, 16,
+                             method=method, rng=np.random.default_rng(3), **params)
+
+    bs_price = analytical.black_scholes_call(**params)
+
+    assert len(result['replicates']) == 16
+    assert result['std_error'] > 0
+    assert result['ci'][0] < result['price'] < result['ci'][1]
+    assert abs(result['price'] - bs_price) < 5 * result['std_error'] + 1e-3
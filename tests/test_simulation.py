@@ -52,6 +52,81 @@ def test_gbm_euler():
     assert len(path) == 252
 
 
+def test_gbm_euler_leaves_global_state():
+    """Test the Euler path uses its own generator."""
+    state = np.random.get_state()[1].copy()
+
+    a = simulation.gbm_euler(100, 1.0, 50, 0.05, 0.02, 0.2, seed=7)
+    b = simulation.gbm_euler(100, 1.0, 50, 0.05, 0.02, 0.2, rng=np.random.default_rng(7))
+
+    assert np.array_equal(a, b)
+    assert np.array_equal(np.random.get_state()[1], state)
+
+
+def test_euler_and_milstein_converge_to_exact_gbm():
+    """Test both schemes against the exact GBM on the same normals."""
+    r, delta, sigma, T, m = 0.05, 0.02, 0.3, 1.0, 64
+    Z = np.random.default_rng(0).standard_normal((2000, m))
+
+    exact = simulation.gbm_paths(100.0, r, delta, sigma, T, Z)
+
+    def drift(t, x):
+        return (r - delta) * x
+
+    def diffusion(t, x):
+        return sigma * x
+
+    euler = simulation.euler_maruyama(100.0, drift, diffusion, T, m, Z=Z)
+    milstein = simulation.milstein(100.0, drift, diffusion, lambda t, x: sigma, T, m, Z=Z)
+
+    assert euler.shape == milstein.shape == (2000, m + 1)
+    assert np.all(euler[:, 0] == 100.0)
+
+    euler_error = np.mean(np.abs(euler[:, -1] - exact[:, -1]))
+    milstein_error = np.mean(np.abs(milstein[:, -1] - exact[:, -1]))
+    assert milstein_error < 0.2 * euler_error < 0.5
+
+
+def test_euler_generic_dynamics():
+    """Test an Ornstein-Uhlenbeck process driven by a Generator."""
+    kappa, theta, vol, T = 2.0, 1.0, 0.5, 3.0
+
+    paths = simulation.euler_maruyama(np.zeros(20000), lambda t, x: kappa * (theta - x),
+                                      lambda t, x: vol, T, 300,
+                                      rng=np.random.default_rng(1))
+
+    mean = theta * (1 - np.exp(-kappa * T))
+    var = vol ** 2 / (2 * kappa) * (1 - np.exp(-2 * kappa * T))
+
+    assert abs(np.mean(paths[:, -1]) - mean) < 0.02
+    assert abs(np.var(paths[:, -1]) - var) < 0.01
+
+    with pytest.raises(ValueError):
+        simulation.euler_maruyama(0.0, lambda t, x: x, lambda t, x: x, 1.0, 10)
+
+
+def test_scheme_blocks_and_out(monkeypatch):
+    """Test the blocked stepping into out matches a plain loop over the dates."""
+    r, sigma, T, m = 0.05, 0.3, 1.0, 23
+    Z = np.random.default_rng(2).standard_normal((100, m))
+    dt = T / m
+
+    expected = np.empty((100, m + 1))
+    expected[:, 0] = 100.0
+    for k in range(m):
+        x = expected[:, k]
+        expected[:, k + 1] = x + r * x * dt + sigma * x * np.sqrt(dt) * Z[:, k]
+
+    # Blocks of 5 dates, the last one partial
+    monkeypatch.setattr(simulation, "_SCHEME_BLOCK", 5)
+    out = np.empty((100, m + 1))
+    paths = simulation.euler_maruyama(100.0, lambda t, x: r * x, lambda t, x: sigma * x,
+                                      T, m, Z=Z, out=out)
+
+    assert paths is out
+    assert np.allclose(out, expected, rtol=1e-13)
+
+
 def test_gbm_exact():
     """Test GBM using exact solution."""
     path = simulation.gbm_exact(
@@ -70,6 +145,89 @@ def test_gbm_exact():
     assert len(path) == 253
 
 
+def test_gbm_paths():
+    """Test batched GBM paths against the single-path exact solution."""
+    Z = np.random.default_rng(0).standard_normal((50, 12))
+    params = dict(S0=100, r=0.05, delta=0.02, sigma=0.2, T=1.0)
+
+    paths = simulation.gbm_paths(Z=Z, **params)
+
+    assert paths.shape == (50, 13)
+    assert np.allclose(paths[:, 0], 100)
+    for i in (0, 17, 49):
+        expected = simulation.gbm_exact(S0=100, T=1.0, n=12, r=0.05, delta=0.02,
+                                        sigma=0.2, Z=Z[i])
+        assert np.allclose(paths[i], expected)
+
+    # Log-prices and a caller-provided buffer
+    out = np.empty((50, 13))
+    log_paths = simulation.gbm_paths(Z=Z, log=True, out=out, **params)
+    assert log_paths is out
+    assert np.allclose(np.exp(log_paths), paths)
+
+    with pytest.raises(ValueError):
+        simulation.gbm_paths(Z=Z, out=np.empty((50, 12)), **params)
+
+
+@pytest.mark.parametrize("construction", ["pca", "pca_fft"])
+@pytest.mark.parametrize("m", [1, 4, 12, 33])
+def test_pca_covariance(m, construction):
+    """Test PCA paths are exact and ordered by decreasing variance."""
+    T = 0.5
+    A = simulation.brownian_motion(np.eye(m), T, construction=construction)[:, 1:]
+    t = np.arange(1, m + 1) * T / m
+
+    assert np.allclose(A.T @ A, np.minimum.outer(t, t))
+
+    # Variance carried by each coordinate is the eigenvalue, decreasing
+    variances = np.sum(A ** 2, axis=1)
+    assert np.all(np.diff(variances) <= 1e-12)
+
+
+def test_pca_fft_matches_dense():
+    """Test the transform-based PCA equals the cached eigendecomposition."""
+    Z = np.random.default_rng(2).standard_normal((10, 50))
+
+    dense = simulation.brownian_motion(Z, 2.0, construction="pca")
+    fast = simulation.brownian_motion(Z, 2.0, construction="pca_fft")
+
+    assert np.allclose(dense, fast, atol=1e-10)
+
+
+@pytest.mark.parametrize("m", [1, 5, 12, 16])
+def test_brownian_bridge_covariance(m):
+    """Test the bridge is an exact Brownian motion: Cov(W_s, W_t) = min(s, t)."""
+    T = 2.0
+    # The construction is linear in Z, so unit vectors give its matrix
+    A = simulation.brownian_motion(np.eye(m), T, construction="bridge")[:, 1:]
+    t = np.arange(1, m + 1) * T / m
+
+    assert np.allclose(A.T @ A, np.minimum.outer(t, t))
+
+    # The first coordinate alone drives the terminal value
+    assert np.isclose(A[0, -1], np.sqrt(T))
+    assert np.allclose(A[1:, -1], 0)
+
+
+def test_gbm_paths_bridge():
+    """Test bridge paths have the same terminal law as standard paths."""
+    Z = np.random.default_rng(1).standard_normal((4, 8))
+    params = dict(S0=100, r=0.05, delta=0.02, sigma=0.2, T=1.0)
+
+    bridge = simulation.gbm_paths(Z=Z, construction="bridge", **params)
+    standard = simulation.gbm_paths(Z=Z, **params)
+
+    assert bridge.shape == (4, 9)
+    assert np.allclose(bridge[:, 0], 100)
+    # Terminal value uses Z[:, 0] only: same as a one-step standard path
+    assert np.allclose(bridge[:, -1],
+                       simulation.gbm_paths(Z=Z[:, :1], **params)[:, -1])
+    assert not np.allclose(bridge, standard)
+
+    with pytest.raises(ValueError):
+        simulation.brownian_motion(Z, construction="spiral")
+
+
 def test_generate_correlated_normals():
     """Test generation of correlated normal variables."""
     N = 10000
@@ -137,3 +295,53 @@ def test_standard_error_single_sample():
     samples = np.array([1.0])
     se = simulation.standard_error(samples)
     assert se == 0.0
+
+
+def test_correlation_factor_cached():
+    """Test factors reproduce the matrix and are cached by contents."""
+    corr = np.array([[1.0, 0.3, 0.1], [0.3, 1.0, -0.2], [0.1, -0.2, 1.0]])
+
+    for method in ("cholesky", "eigen"):
+        L = simulation.correlation_factor(corr, method)
+        assert np.allclose(L @ L.T, corr)
+        assert not L.flags.writeable
+        assert simulation.correlation_factor(corr.copy(), method) is L
+
+    # Singular matrices need the eigen factor
+    ones = np.ones((2, 2))
+    with pytest.raises(ValueError):
+        simulation.correlation_factor(ones)
+    assert np.allclose(simulation.correlation_factor(ones, "eigen"), [[1, 0], [1, 0]])
+
+    with pytest.raises(ValueError):
+        simulation.correlation_factor(np.array([[1.0, 0.5], [0.2, 1.0]]))
+
+
+@pytest.mark.parametrize("construction", ["standard", "bridge", "pca"])
+def test_multi_asset_paths_covariance(construction):
+    """Test Cov(W_j(s), W_l(t)) = corr_jl * min(s, t) for the log-price paths."""
+    d, m, T = 3, 4, 2.0
+    corr = np.array([[1.0, 0.6, -0.3], [0.6, 1.0, 0.2], [-0.3, 0.2, 1.0]])
+    t = np.arange(1, m + 1) * T / m
+
+    # Unit volatility and no drift other than -t/2: log S = W - t/2
+    log_paths = simulation.multi_asset_paths(1.0, 0.0, 0.0, 1.0, corr, T, np.eye(m * d),
+                                             m=m, log=True, construction=construction)
+    A = (log_paths + 0.5 * t).reshape(m * d, d * m)
+
+    assert log_paths.shape == (m * d, d, m)
+    assert np.allclose(A.T @ A, np.kron(corr, np.minimum.outer(t, t)))
+
+
+def test_multi_asset_paths_single_asset():
+    """Test one asset reduces to gbm_paths."""
+    Z = np.random.default_rng(3).standard_normal((20, 6))
+    params = dict(S0=100, r=0.05, delta=0.02, sigma=0.2, T=1.0)
+
+    paths = simulation.multi_asset_paths(corr=np.eye(1), Z=Z, m=6, **params)
+
+    assert paths.shape == (20, 1, 6)
+    assert np.allclose(paths[:, 0, :], simulation.gbm_paths(Z=Z, **params)[:, 1:])
+
+    with pytest.raises(ValueError):
+        simulation.multi_asset_paths(corr=np.eye(2), Z=Z, m=6, **params)